@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:22
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0005_alter_grade_options_rename_comments_grade_comment_and_more'),
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trimester',
+            name='closed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='trimester',
+            name='is_closed',
+            field=models.BooleanField(default=False, help_text='Closed trimesters are read-only and served from snapshots'),
+        ),
+        migrations.CreateModel(
+            name='TrimesterCourseSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('average_grade', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('student_count', models.PositiveIntegerField(default=0)),
+                ('grade_count', models.PositiveIntegerField(default=0)),
+                ('assessment_count', models.PositiveIntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trimester_snapshots', to='academic.course')),
+                ('trimester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_snapshots', to='academic.trimester')),
+            ],
+            options={
+                'verbose_name': 'Trimester Course Snapshot',
+                'verbose_name_plural': 'Trimester Course Snapshots',
+                'ordering': ['trimester', 'course'],
+                'unique_together': {('trimester', 'course')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TrimesterStudentSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('average_grade', models.DecimalField(decimal_places=2, help_text='Mean of every grade recorded in the trimester', max_digits=5)),
+                ('subject_average', models.DecimalField(decimal_places=2, help_text='Mean of the per-subject averages, as shown on bulletins', max_digits=5)),
+                ('grade_count', models.PositiveIntegerField(default=0)),
+                ('assessment_count', models.PositiveIntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_snapshots', to='academic.course')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trimester_snapshots', to='authentication.student')),
+                ('trimester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_snapshots', to='academic.trimester')),
+            ],
+            options={
+                'verbose_name': 'Trimester Student Snapshot',
+                'verbose_name_plural': 'Trimester Student Snapshots',
+                'ordering': ['trimester', 'student'],
+                'unique_together': {('trimester', 'student', 'course')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TrimesterStudentSubjectSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('average_grade', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('min_grade', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('max_grade', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('grade_count', models.PositiveIntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_subject_snapshots', to='academic.course')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trimester_subject_snapshots', to='authentication.student')),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_subject_snapshots', to='academic.subject')),
+                ('trimester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_subject_snapshots', to='academic.trimester')),
+            ],
+            options={
+                'verbose_name': 'Trimester Student Subject Snapshot',
+                'verbose_name_plural': 'Trimester Student Subject Snapshots',
+                'ordering': ['trimester', 'student', 'subject'],
+                'unique_together': {('trimester', 'student', 'course', 'subject')},
+            },
+        ),
+    ]
@@ -8,6 +8,7 @@ from .attendance_model import Attendance
 from .participation_model import Participation
 from .trimester_model import Trimester
 from .assessment_item_model import AssessmentItem
+from .trimester_snapshot_model import TrimesterStudentSubjectSnapshot, TrimesterStudentSnapshot, TrimesterCourseSnapshot
 
 __all__ = [
     'Period',
@@ -20,4 +21,7 @@ __all__ = [
     'Participation',
     'Trimester',
     'AssessmentItem',
+    'TrimesterStudentSubjectSnapshot',
+    'TrimesterStudentSnapshot',
+    'TrimesterCourseSnapshot',
 ]
\ No newline at end of file
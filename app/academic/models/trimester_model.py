@@ -7,6 +7,8 @@ class Trimester(TimestampedModel):
     period = models.ForeignKey(Period, on_delete=models.CASCADE, related_name='trimesters')
     start_date = models.DateField()
     end_date = models.DateField()
+    is_closed = models.BooleanField(default=False, help_text="Closed trimesters are read-only and served from snapshots")
+    closed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         verbose_name = "Trimester"
@@ -0,0 +1,60 @@
+from django.db import models
+from core.models import TimestampedModel
+from .trimester_model import Trimester
+
+class TrimesterStudentSubjectSnapshot(TimestampedModel):
+    trimester = models.ForeignKey(Trimester, on_delete=models.CASCADE, related_name='student_subject_snapshots')
+    student = models.ForeignKey('authentication.Student', on_delete=models.CASCADE, related_name='trimester_subject_snapshots')
+    course = models.ForeignKey('academic.Course', on_delete=models.CASCADE, related_name='student_subject_snapshots')
+    subject = models.ForeignKey('academic.Subject', on_delete=models.CASCADE, related_name='student_subject_snapshots')
+
+    average_grade = models.DecimalField(max_digits=5, decimal_places=2)
+    min_grade = models.DecimalField(max_digits=5, decimal_places=2)
+    max_grade = models.DecimalField(max_digits=5, decimal_places=2)
+    grade_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Trimester Student Subject Snapshot"
+        verbose_name_plural = "Trimester Student Subject Snapshots"
+        unique_together = ('trimester', 'student', 'course', 'subject')
+        ordering = ['trimester', 'student', 'subject']
+
+    def __str__(self):
+        return f"{self.student} - {self.subject.name} ({self.trimester.name}): {self.average_grade}"
+
+class TrimesterStudentSnapshot(TimestampedModel):
+    trimester = models.ForeignKey(Trimester, on_delete=models.CASCADE, related_name='student_snapshots')
+    student = models.ForeignKey('authentication.Student', on_delete=models.CASCADE, related_name='trimester_snapshots')
+    course = models.ForeignKey('academic.Course', on_delete=models.CASCADE, related_name='student_snapshots')
+
+    average_grade = models.DecimalField(max_digits=5, decimal_places=2, help_text="Mean of every grade recorded in the trimester")
+    subject_average = models.DecimalField(max_digits=5, decimal_places=2, help_text="Mean of the per-subject averages, as shown on bulletins")
+    grade_count = models.PositiveIntegerField(default=0)
+    assessment_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Trimester Student Snapshot"
+        verbose_name_plural = "Trimester Student Snapshots"
+        unique_together = ('trimester', 'student', 'course')
+        ordering = ['trimester', 'student']
+
+    def __str__(self):
+        return f"{self.student} ({self.trimester.name}): {self.subject_average}"
+
+class TrimesterCourseSnapshot(TimestampedModel):
+    trimester = models.ForeignKey(Trimester, on_delete=models.CASCADE, related_name='course_snapshots')
+    course = models.ForeignKey('academic.Course', on_delete=models.CASCADE, related_name='trimester_snapshots')
+
+    average_grade = models.DecimalField(max_digits=5, decimal_places=2)
+    student_count = models.PositiveIntegerField(default=0)
+    grade_count = models.PositiveIntegerField(default=0)
+    assessment_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Trimester Course Snapshot"
+        verbose_name_plural = "Trimester Course Snapshots"
+        unique_together = ('trimester', 'course')
+        ordering = ['trimester', 'course']
+
+    def __str__(self):
+        return f"{self.course.name} ({self.trimester.name}): {self.average_grade}"
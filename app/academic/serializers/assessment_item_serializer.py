@@ -11,6 +11,14 @@ class AssessmentItemSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'assessment_type', 'date', 'max_score', 'subject', 'course', 'trimester', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
+    def validate(self, data):
+        trimester = data.get('trimester')
+        if trimester and trimester.is_closed:
+            raise serializers.ValidationError(f"Trimester {trimester.name} is closed and cannot be modified.")
+        if self.instance and self.instance.trimester.is_closed:
+            raise serializers.ValidationError(f"Trimester {self.instance.trimester.name} is closed and cannot be modified.")
+        return data
+
 class AssessmentItemDetailSerializer(AssessmentItemSerializer):
     subject = SubjectSerializer(read_only=True)
     course = CourseSerializer(read_only=True)
@@ -18,6 +18,8 @@ class CourseListSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'code', 'year', 'capacity', 'student_count', 'is_active']
     
     def get_student_count(self, obj):
+        if hasattr(obj, 'student_count'):
+            return obj.student_count
         active_period = Period.objects.filter(is_active=True).first()
         if not active_period:
             return 0
@@ -24,6 +24,15 @@ class GradeSerializer(serializers.ModelSerializer):
         student = data.get('student')
         assessment_item = data.get('assessment_item')
 
+        if self.instance and self.instance.assessment_item and self.instance.assessment_item.trimester.is_closed:
+            raise serializers.ValidationError(
+                f"Trimester {self.instance.assessment_item.trimester.name} is closed and its grades cannot be modified."
+            )
+        if assessment_item and assessment_item.trimester.is_closed:
+            raise serializers.ValidationError(
+                f"Trimester {assessment_item.trimester.name} is closed and its grades cannot be modified."
+            )
+
         if assessment_item:
             data['subject'] = assessment_item.subject
             data['period'] = assessment_item.trimester.period
@@ -15,4 +15,6 @@ class PeriodListSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'start_date', 'end_date', 'is_active', 'enrollment_count']
     
     def get_enrollment_count(self, obj):
+        if hasattr(obj, 'enrollment_count'):
+            return obj.enrollment_count
         return obj.enrollments.count()
\ No newline at end of file
@@ -10,9 +10,8 @@ class SubjectSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
     
     def get_courses(self, obj):
-        from app.academic.models import TeacherAssignment
-        course_ids = TeacherAssignment.objects.filter(subject=obj).values_list('course_id', flat=True)
-        return list(course_ids)
+        # Reads prefetched teacher_assignments when the viewset provides them.
+        return [assignment.course_id for assignment in obj.teacher_assignments.all()]
 
 class SubjectListSerializer(serializers.ModelSerializer):
     course_count = serializers.SerializerMethodField()
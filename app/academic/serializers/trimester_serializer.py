@@ -4,5 +4,5 @@ from app.academic.models import Trimester
 class TrimesterSerializer(serializers.ModelSerializer):
     class Meta:
         model = Trimester
-        fields = ['id', 'name', 'period', 'start_date', 'end_date', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
\ No newline at end of file
+        fields = ['id', 'name', 'period', 'start_date', 'end_date', 'is_closed', 'closed_at', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'is_closed', 'closed_at', 'created_at', 'updated_at']
\ No newline at end of file
@@ -0,0 +1,5 @@
+from .trimester_service import trimester_snapshot_service
+
+__all__ = [
+    'trimester_snapshot_service',
+]
@@ -0,0 +1,229 @@
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import transaction
+from django.db.models import Avg, Min, Max, Count, Sum, F, DecimalField
+from django.utils import timezone
+
+from app.academic.models import (
+    Trimester, Grade,
+    TrimesterStudentSubjectSnapshot, TrimesterStudentSnapshot, TrimesterCourseSnapshot
+)
+from core.models import LoggerService
+
+class TrimesterSnapshotService:
+    BATCH_SIZE = 1000
+
+    def _to_decimal(self, value):
+        if value is None:
+            return Decimal('0.00')
+        return Decimal(str(value)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+    def _trimester_grades(self, trimester):
+        return Grade.objects.filter(assessment_item__trimester=trimester).order_by()
+
+    def compute_student_subject_aggregates(self, trimester, course_id=None, student_id=None):
+        grades = self._trimester_grades(trimester)
+        if course_id:
+            grades = grades.filter(assessment_item__course_id=course_id)
+        if student_id:
+            grades = grades.filter(student_id=student_id)
+        rows = grades.values(
+            'student_id', 'assessment_item__course_id', 'assessment_item__subject_id'
+        ).annotate(
+            average_grade=Avg('value'),
+            min_grade=Min('value'),
+            max_grade=Max('value'),
+            grade_count=Count('id'),
+        )
+        return [
+            {
+                'student_id': row['student_id'],
+                'course_id': row['assessment_item__course_id'],
+                'subject_id': row['assessment_item__subject_id'],
+                'average_grade': self._to_decimal(row['average_grade']),
+                'min_grade': self._to_decimal(row['min_grade']),
+                'max_grade': self._to_decimal(row['max_grade']),
+                'grade_count': row['grade_count'],
+            }
+            for row in rows
+        ]
+
+    def compute_student_aggregates(self, trimester, course_id=None, student_id=None, subject_rows=None):
+        grades = self._trimester_grades(trimester)
+        if course_id:
+            grades = grades.filter(assessment_item__course_id=course_id)
+        if student_id:
+            grades = grades.filter(student_id=student_id)
+        if subject_rows is None:
+            subject_rows = self.compute_student_subject_aggregates(trimester, course_id=course_id, student_id=student_id)
+
+        subject_averages = {}
+        for row in subject_rows:
+            subject_averages.setdefault((row['student_id'], row['course_id']), []).append(row['average_grade'])
+
+        rows = grades.values('student_id', 'assessment_item__course_id').annotate(
+            average_grade=Avg('value'),
+            grade_count=Count('id'),
+            assessment_count=Count('assessment_item', distinct=True),
+        )
+        aggregates = []
+        for row in rows:
+            key = (row['student_id'], row['assessment_item__course_id'])
+            averages = subject_averages.get(key, [])
+            aggregates.append({
+                'student_id': row['student_id'],
+                'course_id': row['assessment_item__course_id'],
+                'average_grade': self._to_decimal(row['average_grade']),
+                'subject_average': self._to_decimal(sum(averages) / len(averages) if averages else None),
+                'grade_count': row['grade_count'],
+                'assessment_count': row['assessment_count'],
+            })
+        return aggregates
+
+    def compute_course_aggregates(self, trimester, course_id=None):
+        grades = self._trimester_grades(trimester)
+        if course_id:
+            grades = grades.filter(assessment_item__course_id=course_id)
+        rows = grades.values('assessment_item__course_id').annotate(
+            average_grade=Avg('value'),
+            student_count=Count('student', distinct=True),
+            grade_count=Count('id'),
+            assessment_count=Count('assessment_item', distinct=True),
+        )
+        return [
+            {
+                'course_id': row['assessment_item__course_id'],
+                'average_grade': self._to_decimal(row['average_grade']),
+                'student_count': row['student_count'],
+                'grade_count': row['grade_count'],
+                'assessment_count': row['assessment_count'],
+            }
+            for row in rows
+        ]
+
+    def _delete_snapshots(self, trimester):
+        TrimesterStudentSubjectSnapshot.objects.filter(trimester=trimester).delete()
+        TrimesterStudentSnapshot.objects.filter(trimester=trimester).delete()
+        TrimesterCourseSnapshot.objects.filter(trimester=trimester).delete()
+
+    def close_trimester(self, trimester_id, user=None):
+        with transaction.atomic():
+            trimester = Trimester.objects.select_for_update().get(pk=trimester_id)
+            if trimester.is_closed:
+                raise ValueError(f"Trimester {trimester.name} is already closed.")
+
+            self._delete_snapshots(trimester)
+
+            subject_rows = self.compute_student_subject_aggregates(trimester)
+            TrimesterStudentSubjectSnapshot.objects.bulk_create(
+                [TrimesterStudentSubjectSnapshot(trimester=trimester, **row) for row in subject_rows],
+                batch_size=self.BATCH_SIZE
+            )
+
+            student_rows = self.compute_student_aggregates(trimester, subject_rows=subject_rows)
+            TrimesterStudentSnapshot.objects.bulk_create(
+                [TrimesterStudentSnapshot(trimester=trimester, **row) for row in student_rows],
+                batch_size=self.BATCH_SIZE
+            )
+
+            course_rows = self.compute_course_aggregates(trimester)
+            TrimesterCourseSnapshot.objects.bulk_create(
+                [TrimesterCourseSnapshot(trimester=trimester, **row) for row in course_rows],
+                batch_size=self.BATCH_SIZE
+            )
+
+            trimester.is_closed = True
+            trimester.closed_at = timezone.now()
+            trimester.save(update_fields=['is_closed', 'closed_at', 'updated_at'])
+
+            LoggerService.objects.create(
+                user=user, action='TRIMESTER_CLOSED', level='INFO',
+                table_name='Trimester',
+                description=f"Trimester {trimester.name} closed with {len(student_rows)} student and {len(course_rows)} course snapshots."
+            )
+
+        return trimester, {
+            'student_subject_snapshots': len(subject_rows),
+            'student_snapshots': len(student_rows),
+            'course_snapshots': len(course_rows),
+        }
+
+    def reopen_trimester(self, trimester_id, user=None):
+        with transaction.atomic():
+            trimester = Trimester.objects.select_for_update().get(pk=trimester_id)
+            if not trimester.is_closed:
+                raise ValueError(f"Trimester {trimester.name} is not closed.")
+
+            self._delete_snapshots(trimester)
+            trimester.is_closed = False
+            trimester.closed_at = None
+            trimester.save(update_fields=['is_closed', 'closed_at', 'updated_at'])
+
+            LoggerService.objects.create(
+                user=user, action='TRIMESTER_REOPENED', level='WARNING',
+                table_name='Trimester',
+                description=f"Trimester {trimester.name} reopened and its snapshots discarded."
+            )
+        return trimester
+
+    def get_course_summaries(self, trimester, course_id=None):
+        if not trimester.is_closed:
+            return self.compute_course_aggregates(trimester, course_id=course_id)
+
+        snapshots = TrimesterCourseSnapshot.objects.filter(trimester=trimester)
+        if course_id:
+            snapshots = snapshots.filter(course_id=course_id)
+        return list(snapshots.values(
+            'course_id', 'average_grade', 'student_count', 'grade_count', 'assessment_count'
+        ))
+
+    def get_student_summaries(self, trimester, course_id=None, student_id=None):
+        if not trimester.is_closed:
+            return self.compute_student_aggregates(trimester, course_id=course_id, student_id=student_id)
+
+        snapshots = TrimesterStudentSnapshot.objects.filter(trimester=trimester)
+        if course_id:
+            snapshots = snapshots.filter(course_id=course_id)
+        if student_id:
+            snapshots = snapshots.filter(student_id=student_id)
+        return list(snapshots.values(
+            'student_id', 'course_id', 'average_grade', 'subject_average', 'grade_count', 'assessment_count'
+        ))
+
+    def get_course_averages(self, period):
+        """Average grade per course over every trimester of a period, weighted by grade count."""
+        totals = {}
+        for trimester in Trimester.objects.filter(period=period):
+            for row in self.get_course_summaries(trimester):
+                total = totals.setdefault(row['course_id'], [Decimal('0'), 0])
+                total[0] += row['average_grade'] * row['grade_count']
+                total[1] += row['grade_count']
+        return {course_id: weighted / count for course_id, (weighted, count) in totals.items() if count}
+
+    def get_overall_average(self):
+        """Average of every grade; grades of closed trimesters are counted from their course snapshots."""
+        live = Grade.objects.exclude(assessment_item__trimester__is_closed=True).aggregate(total=Sum('value'), count=Count('id'))
+        closed = TrimesterCourseSnapshot.objects.filter(trimester__is_closed=True).aggregate(
+            total=Sum(F('average_grade') * F('grade_count'), output_field=DecimalField(max_digits=20, decimal_places=2)),
+            count=Sum('grade_count'),
+        )
+        count = live['count'] + (closed['count'] or 0)
+        if not count:
+            return None
+        return (self._to_decimal(live['total']) + self._to_decimal(closed['total'])) / count
+
+    def get_student_trimester_stats(self, student_id, trimester, course_id):
+        if trimester.is_closed:
+            return TrimesterStudentSnapshot.objects.filter(
+                trimester=trimester, student_id=student_id, course_id=course_id
+            ).values('average_grade', 'grade_count', 'assessment_count').first()
+
+        stats = self._trimester_grades(trimester).filter(
+            student_id=student_id, assessment_item__course_id=course_id
+        ).aggregate(
+            average_grade=Avg('value'),
+            grade_count=Count('id'),
+            assessment_count=Count('assessment_item', distinct=True),
+        )
+        return stats if stats['grade_count'] else None
+
+trimester_snapshot_service = TrimesterSnapshotService()
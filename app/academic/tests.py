@@ -1,3 +1,79 @@
-from django.test import TestCase
+from core.testing import QueryBudgetTestCase, seed_school
 
-# Create your tests here.
+
+class AcademicQueryBudgetTests(QueryBudgetTestCase):
+    """Query budgets of the academic list and detail endpoints; list budgets hold for any page size."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = seed_school()
+
+    def setUp(self):
+        self.authenticate(self.school['admin'])
+
+    def test_courses(self):
+        self.assertListQueryBudget(3, '/api/academic/courses/')
+        self.assertQueryBudget(1, f"/api/academic/courses/{self.school['courses'][0].pk}/")
+
+    def test_teacher_assignments(self):
+        self.assertListQueryBudget(2, '/api/academic/teacher-assignments/')
+        assignment = self.school['teachers'][0].assignments.first()
+        self.assertQueryBudget(1, f'/api/academic/teacher-assignments/{assignment.pk}/')
+
+    def test_periods(self):
+        self.assertListQueryBudget(2, '/api/academic/periods/')
+        self.assertQueryBudget(1, f"/api/academic/periods/{self.school['period'].pk}/")
+
+    def test_subjects(self):
+        self.assertListQueryBudget(2, '/api/academic/subjects/')
+        self.assertQueryBudget(2, f"/api/academic/subjects/{self.school['subjects'][0].pk}/")
+
+    def test_enrollments(self):
+        self.assertListQueryBudget(2, '/api/academic/enrollments/')
+        enrollment = self.school['students'][0].enrollments.first()
+        self.assertQueryBudget(1, f'/api/academic/enrollments/{enrollment.pk}/')
+
+    def test_attendances(self):
+        self.assertListQueryBudget(2, '/api/academic/attendances/')
+        attendance = self.school['students'][0].attendances.first()
+        self.assertQueryBudget(1, f'/api/academic/attendances/{attendance.pk}/')
+
+    def test_participations(self):
+        self.assertListQueryBudget(2, '/api/academic/participations/')
+        participation = self.school['students'][0].participations.first()
+        self.assertQueryBudget(1, f'/api/academic/participations/{participation.pk}/')
+
+    def test_trimesters(self):
+        self.assertListQueryBudget(2, '/api/academic/trimesters/')
+        self.assertQueryBudget(1, f"/api/academic/trimesters/{self.school['trimester'].pk}/")
+
+    def test_assessment_items(self):
+        self.assertListQueryBudget(3, '/api/academic/assessment-items/')
+        self.assertQueryBudget(2, f"/api/academic/assessment-items/{self.school['assessment_items'][0].pk}/")
+
+    def test_grades(self):
+        self.assertListQueryBudget(6, '/api/academic/grades/')
+        grade = self.school['students'][0].grades.first()
+        self.assertQueryBudget(4, f'/api/academic/grades/{grade.pk}/')
+
+
+class AcademicScopedQueryBudgetTests(QueryBudgetTestCase):
+    """Teachers and students get filtered querysets; the filters must not add per-row queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = seed_school()
+
+    def test_teacher_lists(self):
+        self.authenticate(self.school['teachers'][0].user)
+        self.assertListQueryBudget(5, '/api/academic/enrollments/')
+        self.assertListQueryBudget(4, '/api/academic/attendances/')
+        self.assertListQueryBudget(4, '/api/academic/participations/')
+        self.assertListQueryBudget(7, '/api/academic/grades/')
+
+    def test_student_lists(self):
+        self.authenticate(self.school['students'][0].user)
+        self.assertListQueryBudget(4, '/api/academic/enrollments/')
+        self.assertListQueryBudget(5, '/api/academic/attendances/')
+        self.assertListQueryBudget(5, '/api/academic/participations/')
+        self.assertListQueryBudget(7, '/api/academic/grades/')
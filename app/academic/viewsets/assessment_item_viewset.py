@@ -1,4 +1,5 @@
 from rest_framework import viewsets, permissions
+from rest_framework.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
 from app.academic.models import AssessmentItem
@@ -8,7 +9,9 @@ from core.permissions import IsTeacherOrAdmin
 
 @extend_schema(tags=['Assessment Items'])
 class AssessmentItemViewSet(viewsets.ModelViewSet):
-    queryset = AssessmentItem.objects.select_related('subject', 'course', 'trimester__period').all()
+    queryset = AssessmentItem.objects.select_related('subject', 'course', 'trimester__period').prefetch_related(
+        'subject__teacher_assignments'
+    ).all()
     permission_classes = [IsTeacherOrAdmin]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['subject', 'course', 'trimester', 'assessment_type', 'trimester__period']
@@ -17,4 +20,9 @@ class AssessmentItemViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
             return AssessmentItemDetailSerializer
-        return AssessmentItemSerializer
\ No newline at end of file
+        return AssessmentItemSerializer
+
+    def perform_destroy(self, instance):
+        if instance.trimester.is_closed:
+            raise ValidationError(f"Trimester {instance.trimester.name} is closed and cannot be modified.")
+        instance.delete()
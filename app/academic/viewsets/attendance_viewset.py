@@ -13,7 +13,7 @@ logger = logging.getLogger(__name__)
 
 @extend_schema(tags=['Attendances'])
 class AttendanceViewSet(viewsets.ModelViewSet):
-    queryset = Attendance.objects.all().order_by('-date')
+    queryset = Attendance.objects.select_related('student__user', 'course', 'subject', 'period').order_by('-date')
     serializer_class = AttendanceSerializer
     pagination_class = CustomPagination
     
@@ -2,7 +2,8 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter
-from django.db.models import Q, Count
+from django.db.models import Q, Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from app.academic.models import Course, Enrollment, Period, TeacherAssignment
 from app.academic.serializers import CourseSerializer, CourseListSerializer
 from app.authentication.serializers import StudentListSerializer
@@ -71,7 +72,7 @@ class CourseViewSet(viewsets.ModelViewSet):
         if active is not None:
             is_active = active.lower() == 'true'
             queryset = queryset.filter(is_active=is_active)
-        queryset = queryset.annotate(student_count=Count('enrollments'))
+        queryset = queryset.annotate(student_count=self._student_count())
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -79,6 +80,21 @@ class CourseViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
+    def _student_count(self):
+        # A subquery rather than Count() so the joins of the teacher/student filters above are not reused.
+        active_period = Period.objects.filter(is_active=True).first()
+        if not active_period:
+            return Value(0, output_field=IntegerField())
+        counts = (
+            Enrollment.objects
+            .filter(course=OuterRef('pk'), status='active', period=active_period)
+            .order_by()
+            .values('course')
+            .annotate(total=Count('student', distinct=True))
+            .values('total')
+        )
+        return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
     @extend_schema(description="Get students enrolled in this course")
     @action(detail=True, methods=['get'])
     def students(self, request, pk=None):
@@ -9,7 +9,7 @@ from core.pagination import CustomPagination
 
 @extend_schema(tags=['Enrollments'])
 class EnrollmentViewSet(viewsets.ModelViewSet):
-    queryset = Enrollment.objects.all().order_by('-enrollment_date')
+    queryset = Enrollment.objects.select_related('student__user', 'course', 'subject', 'period').order_by('-enrollment_date')
     serializer_class = EnrollmentSerializer
     pagination_class = CustomPagination
     
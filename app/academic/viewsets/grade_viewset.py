@@ -1,9 +1,12 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from django.db import transaction, IntegrityError
+from django.db.models import OuterRef
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
 from app.academic.models import Grade, Period
+from app.authentication.models import Student
 from app.academic.serializers import GradeSerializer, GradeDetailSerializer
 from core.pagination import CustomPagination
 from core.permissions import IsTeacherOrAdmin, IsStudentOwnerOrTeacherOrAdmin
@@ -26,6 +29,25 @@ class GradeViewSet(viewsets.ModelViewSet):
         'value': ['exact', 'gte', 'lte'],
     }
 
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action in ['list', 'retrieve']:
+            qs = qs.prefetch_related(
+                Student.current_enrollments_prefetch('student__enrollments'),
+                'subject__teacher_assignments',
+                'assessment_item__subject__teacher_assignments',
+            )
+        user = self.request.user
+
+        if user.is_staff or user.is_superuser:
+            return qs
+
+        if hasattr(user, 'teacher_profile'):
+            teacher = user.teacher_profile
+            return qs.filter(teacher.teaches_student(period=OuterRef('period_id')))
+
+        return qs
+
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
             return GradeDetailSerializer
@@ -61,6 +83,13 @@ class GradeViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
+    def perform_destroy(self, instance):
+        if instance.assessment_item and instance.assessment_item.trimester.is_closed:
+            raise ValidationError(
+                f"Trimester {instance.assessment_item.trimester.name} is closed and its grades cannot be modified."
+            )
+        instance.delete()
+
     def create(self, request, *args, **kwargs):
         try:
             with transaction.atomic():
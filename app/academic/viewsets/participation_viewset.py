@@ -13,7 +13,7 @@ logger = logging.getLogger(__name__)
 
 @extend_schema(tags=['Participations'])
 class ParticipationViewSet(viewsets.ModelViewSet):
-    queryset = Participation.objects.all().order_by('-date')
+    queryset = Participation.objects.select_related('student__user', 'course', 'subject', 'period').order_by('-date')
     serializer_class = ParticipationSerializer
     pagination_class = CustomPagination
     
@@ -8,7 +8,7 @@ from core.pagination import CustomPagination
 
 @extend_schema(tags=['Teacher Assignments'])
 class TeacherAssignmentViewSet(viewsets.ModelViewSet):
-    queryset = TeacherAssignment.objects.all()
+    queryset = TeacherAssignment.objects.select_related('teacher__user', 'course', 'subject', 'period').all()
     serializer_class = TeacherAssignmentSerializer
     pagination_class = CustomPagination
     
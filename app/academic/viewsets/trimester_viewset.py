@@ -1,7 +1,11 @@
-from rest_framework import viewsets, permissions
-from drf_spectacular.utils import extend_schema
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from drf_spectacular.types import OpenApiTypes
 from app.academic.models import Trimester
 from app.academic.serializers import TrimesterSerializer
+from app.academic.services import trimester_snapshot_service
 from core.pagination import CustomPagination
 
 @extend_schema(tags=['Academic Trimesters'])
@@ -9,4 +13,67 @@ class TrimesterViewSet(viewsets.ModelViewSet):
     queryset = Trimester.objects.all().order_by('period__start_date', 'start_date')
     serializer_class = TrimesterSerializer
     permission_classes = [permissions.IsAdminUser]
-    pagination_class = CustomPagination
\ No newline at end of file
+    pagination_class = CustomPagination
+
+    @extend_schema(
+        request=None,
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT},
+        summary="Close a trimester and freeze its aggregates",
+        description=(
+            "Calcula y guarda los promedios por estudiante y materia, por estudiante y por curso del trimestre, "
+            "y marca el trimestre como de solo lectura. Las lecturas posteriores usan estos snapshots."
+        )
+    )
+    @action(detail=True, methods=['post'])
+    def close(self, request, pk=None):
+        trimester = self.get_object()
+        try:
+            trimester, counts = trimester_snapshot_service.close_trimester(trimester.pk, user=request.user)
+        except ValueError as ve:
+            return Response({'error': str(ve)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'trimester': TrimesterSerializer(trimester).data,
+            'snapshots': counts,
+        })
+
+    @extend_schema(
+        request=None,
+        responses={200: TrimesterSerializer, 400: OpenApiTypes.OBJECT},
+        summary="Reopen a closed trimester",
+        description="Descarta los snapshots del trimestre y vuelve a permitir cambios en sus notas y evaluaciones."
+    )
+    @action(detail=True, methods=['post'])
+    def reopen(self, request, pk=None):
+        trimester = self.get_object()
+        try:
+            trimester = trimester_snapshot_service.reopen_trimester(trimester.pk, user=request.user)
+        except ValueError as ve:
+            return Response({'error': str(ve)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(TrimesterSerializer(trimester).data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name='course_id', description='Restrict the summary to a course', required=False, type=OpenApiTypes.INT),
+            OpenApiParameter(name='include_students', description='Include per-student aggregates', required=False, type=OpenApiTypes.BOOL),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+        summary="Get aggregated results of a trimester",
+        description=(
+            "Devuelve los promedios por curso (y opcionalmente por estudiante) del trimestre. "
+            "Para trimestres cerrados se leen de los snapshots; para trimestres abiertos se calculan al vuelo."
+        )
+    )
+    @action(detail=True, methods=['get'])
+    def summary(self, request, pk=None):
+        trimester = self.get_object()
+        course_id = request.query_params.get('course_id')
+        include_students = request.query_params.get('include_students', 'false').lower() == 'true'
+
+        data = {
+            'trimester_id': trimester.pk,
+            'source': 'snapshot' if trimester.is_closed else 'live',
+            'courses': trimester_snapshot_service.get_course_summaries(trimester, course_id=course_id),
+        }
+        if include_students:
+            data['students'] = trimester_snapshot_service.get_student_summaries(trimester, course_id=course_id)
+        return Response(data)
@@ -3,7 +3,6 @@ import joblib
 import pandas as pd
 import numpy as np
 from django.core.files.base import ContentFile
-from django.db.models import Avg
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
@@ -11,8 +10,10 @@ from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
 
 from app.authentication.models import Student
-from app.academic.models import Grade, Trimester, Enrollment, Period
+from app.academic.models import Trimester, Enrollment
+from app.academic.services import trimester_snapshot_service
 from base.storage import PrivateMediaStorage
+from core import metrics
 
 class PerformancePredictionService:
     MODEL_FILENAME = 'student_performance_model.joblib'
@@ -43,20 +44,25 @@ class PerformancePredictionService:
         else:
             self.model = None
             self.scaler = None
+        self._report_model_version()
+
+    def _report_model_version(self):
+        version = 0
+        if self.model is not None:
+            try:
+                version = self.storage.get_modified_time(self.MODEL_FILENAME).timestamp()
+            except Exception:
+                pass
+        metrics.prediction_model_version.set(version)
             
     def _get_trimester_data(self, student, trimester, course):
-        grades_in_trimester = Grade.objects.filter(
-            student=student,
-            assessment_item__trimester=trimester,
-            assessment_item__course=course
-        )
-        
-        avg_grade = grades_in_trimester.aggregate(Avg('value'))['value__avg']
-        num_assessments = grades_in_trimester.values('assessment_item').distinct().count()
-        
+        stats = trimester_snapshot_service.get_student_trimester_stats(student.pk, trimester, course.pk)
+        if not stats:
+            return {'avg_grade': np.nan, 'num_assessments': 0}
+
         return {
-            'avg_grade': avg_grade if avg_grade is not None else np.nan,
-            'num_assessments': num_assessments
+            'avg_grade': stats['average_grade'] if stats['average_grade'] is not None else np.nan,
+            'num_assessments': stats['assessment_count']
         }
 
     def _prepare_training_data(self):
@@ -100,6 +106,11 @@ class PerformancePredictionService:
         y = df['target_avg_grade']
         return X, y
 
+    @metrics.track(
+        metrics.model_trainings_total,
+        metrics.model_training_duration_seconds,
+        classify=lambda value: 'success' if value.get('status') == 'success' else 'error',
+    )
     def train_performance_model(self):
         X, y = self._prepare_training_data()
 
@@ -173,6 +184,11 @@ class PerformancePredictionService:
         df_features = pd.DataFrame([last_graded_trimester_data], columns=self.FEATURE_COLUMNS)
         return df_features
 
+    @metrics.track(
+        metrics.predictions_total,
+        metrics.prediction_duration_seconds,
+        classify=lambda value: 'error' if 'error' in value else 'success',
+    )
     def predict_student_performance(self, student_id: int):
         if self.model is None or self.scaler is None:
             return {"error": "Model or preprocessor not trained/loaded. Please train the model first."}
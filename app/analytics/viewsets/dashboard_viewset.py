@@ -2,10 +2,11 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from drf_spectacular.utils import extend_schema
-from django.db.models import Count, Avg
+from django.db.models import Count
 
 from app.authentication.models import Student, Teacher
-from app.academic.models import Course, Enrollment, Grade, Period
+from app.academic.models import Course, Enrollment, Period
+from app.academic.services import trimester_snapshot_service
 
 @extend_schema(tags=['Analytics - Dashboards'])
 class DashboardViewSet(viewsets.ViewSet):
@@ -30,7 +31,7 @@ class DashboardViewSet(viewsets.ViewSet):
                 status='active'
             ).values('student').distinct().count()
 
-        overall_avg_grade = Grade.objects.aggregate(Avg('value'))['value__avg']
+        overall_avg_grade = trimester_snapshot_service.get_overall_average()
 
         stats = {
             "active_students_count": active_students_count,
@@ -51,30 +52,21 @@ class DashboardViewSet(viewsets.ViewSet):
         if not active_period:
             return Response({"message": "No active period found."}, status=status.HTTP_404_NOT_FOUND)
 
+        student_counts = dict(
+            Enrollment.objects.filter(period=active_period, status='active')
+            .values_list('course_id').annotate(total=Count('student', distinct=True)).order_by()
+        )
+        # Closed trimesters are read from their snapshots, open ones aggregated from the grades.
+        course_averages = trimester_snapshot_service.get_course_averages(active_period)
+
         courses_data = []
         courses = Course.objects.filter(is_active=True)
         for course in courses:
-            student_count = Enrollment.objects.filter(
-                course=course, 
-                period=active_period, 
-                status='active'
-            ).values('student').distinct().count()
-            
-            student_ids = Enrollment.objects.filter(
-                course=course, 
-                period=active_period, 
-                status='active'
-            ).values_list('student_id', flat=True).distinct()
-            
-            avg_grade = Grade.objects.filter(
-                student_id__in=student_ids,
-                assessment_item__trimester__period=active_period
-            ).aggregate(Avg('value'))['value__avg']
-
+            avg_grade = course_averages.get(course.id)
             courses_data.append({
                 "course_id": course.id,
                 "course_name": course.name,
-                "enrolled_students": student_count,
+                "enrolled_students": student_counts.get(course.id, 0),
                 "average_grade": round(avg_grade, 2) if avg_grade else None
             })
         
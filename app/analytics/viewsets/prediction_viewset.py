@@ -1,13 +1,12 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema
-from django.db.models import Avg
 
 from app.authentication.models import Student
-from app.academic.models import Grade, Trimester, Enrollment
+from app.academic.models import Trimester, Enrollment
 from app.analytics.services.prediction_service import performance_prediction_service
+from app.academic.services import trimester_snapshot_service
 
 @extend_schema(tags=['Analytics - AI Performance Predictions'])
 class PerformancePredictionViewSet(viewsets.ViewSet):
@@ -63,19 +62,17 @@ class PerformancePredictionViewSet(viewsets.ViewSet):
             ).distinct().order_by('-start_date')
 
             for trimester_to_check in trimesters_for_enrollment:
-                grades_in_trimester = Grade.objects.filter(
-                    student=student,
-                    assessment_item__trimester=trimester_to_check,
-                    assessment_item__course=latest_enrollment.course
+                stats = trimester_snapshot_service.get_student_trimester_stats(
+                    student.pk, trimester_to_check, latest_enrollment.course_id
                 )
-                if grades_in_trimester.exists():
-                    avg_actual_grade = grades_in_trimester.aggregate(Avg('value'))['value__avg']
+                if stats:
+                    avg_actual_grade = stats['average_grade']
                     actual_performance_summary = {
                         "trimester_name": trimester_to_check.name,
                         "period_name": trimester_to_check.period.name,
                         "course_name": latest_enrollment.course.name,
                         "actual_average_grade": round(avg_actual_grade, 2) if avg_actual_grade else None,
-                        "number_of_grades_recorded": grades_in_trimester.count()
+                        "number_of_grades_recorded": stats['grade_count']
                     }
                     break
 
@@ -18,14 +18,41 @@ class Student(TimestampedModel):
     def __str__(self):
         return f"Student: {self.user.full_name} ({self.student_id})"
     
+    @staticmethod
+    def current_enrollments_queryset():
+        """Active enrollments in the active period, newest first; the first one is the student's
+        current course. current_course, its prefetch and the list annotations all read from it."""
+        from app.academic.models import Period, Enrollment
+        active_period = Period.objects.filter(is_active=True).order_by('-start_date').values('id')[:1]
+        return Enrollment.objects.filter(
+            period_id=models.Subquery(active_period), status='active'
+        ).order_by('-enrollment_date', '-pk')
+
+    @staticmethod
+    def current_enrollments_prefetch(lookup='enrollments'):
+        """Prefetch of the current enrollments, stored as `current_enrollments`, so current_course
+        of every student in a list is resolved without a query per student."""
+        return models.Prefetch(
+            lookup,
+            queryset=Student.current_enrollments_queryset().select_related('course'),
+            to_attr='current_enrollments'
+        )
+
+    @staticmethod
+    def current_course_name_subquery(student_ref='pk'):
+        """Name of the current course of the student at `student_ref`, for annotating other models."""
+        return models.Subquery(
+            Student.current_enrollments_queryset()
+            .filter(student_id=models.OuterRef(student_ref))
+            .values('course__name')[:1]
+        )
+
     @property
     def current_course(self):
-        from app.academic.models import Period, Enrollment
-        active_period = Period.objects.filter(is_active=True).first()
-        if not active_period:
-            return None
-        active_enrollment = self.enrollments.filter(period=active_period, status='active').first()
-        return active_enrollment.course if active_enrollment else None
+        if hasattr(self, 'current_enrollments'):
+            return self.current_enrollments[0].course if self.current_enrollments else None
+        current_enrollment = Student.current_enrollments_queryset().filter(student=self).select_related('course').first()
+        return current_enrollment.course if current_enrollment else None
     
     @property
     def current_average(self):
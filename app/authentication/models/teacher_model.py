@@ -30,25 +30,22 @@ class Teacher(TimestampedModel):
     class Meta:
         ordering = ['user__first_name', 'user__last_name']
 
-    def get_taught_student_ids(self):
+    def get_taught_enrollments(self, period=None):
+        """Lazy queryset of active enrollments in the courses this teacher is assigned to, matched per period."""
         from app.academic.models import TeacherAssignment, Enrollment
-        
-        teacher_assignments = TeacherAssignment.objects.filter(
-            teacher=self
-        ).values_list('course_id', 'period_id')
-        
-        student_ids = []
-        
-        if teacher_assignments:
-            course_ids = [ta[0] for ta in teacher_assignments]
-            period_ids = [ta[1] for ta in teacher_assignments]
-            
-            enrollments = Enrollment.objects.filter(
-                course_id__in=course_ids,
-                period_id__in=period_ids,
-                status='active'
-            ).values_list('student_id', flat=True).distinct()
-            
-            student_ids = list(enrollments)
-        
-        return student_ids
\ No newline at end of file
+
+        assignments = TeacherAssignment.objects.filter(
+            teacher=self,
+            course_id=models.OuterRef('course_id'),
+            period_id=models.OuterRef('period_id')
+        )
+        enrollments = Enrollment.objects.filter(models.Exists(assignments), status='active')
+        if period is not None:
+            enrollments = enrollments.filter(period=period)
+        return enrollments
+
+    def teaches_student(self, student_ref='student_id', period=None):
+        """``Exists`` expression that is true when the outer row's student is taught by this teacher."""
+        return models.Exists(
+            self.get_taught_enrollments(period).filter(student_id=models.OuterRef(student_ref))
+        )
@@ -69,5 +69,8 @@ class StudentListSerializer(serializers.ModelSerializer):
     
     @extend_schema_field(str)
     def get_current_course_name(self, obj) -> Optional[str]:
+        # Set from Student.current_course_name_subquery() by lists that annotate it.
+        if hasattr(obj, 'current_course_name'):
+            return obj.current_course_name
         course = obj.current_course
         return course.name if course else None
\ No newline at end of file
@@ -1,3 +1,40 @@
-from django.test import TestCase
+from django.contrib.auth.models import Group, Permission
 
-# Create your tests here.
+from core.testing import QueryBudgetTestCase, seed_school
+
+
+class AuthenticationQueryBudgetTests(QueryBudgetTestCase):
+    """Query budgets of the user, role and profile endpoints; list budgets hold for any page size."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = seed_school()
+        permissions = list(Permission.objects.order_by('id')[:4])
+        for name in ('Admin', 'Teacher', 'Student'):
+            Group.objects.get_or_create(name=name)[0].permissions.set(permissions)
+        teacher_group = Group.objects.get(name='Teacher')
+        for teacher in cls.school['teachers']:
+            teacher.user.groups.add(teacher_group)
+
+    def setUp(self):
+        self.authenticate(self.school['admin'])
+
+    def test_users(self):
+        self.assertListQueryBudget(3, '/api/auth/users/')
+        self.assertQueryBudget(2, f"/api/auth/users/{self.school['teachers'][0].user_id}/")
+
+    def test_groups(self):
+        self.assertListQueryBudget(3, '/api/auth/groups/')
+        self.assertQueryBudget(2, f"/api/auth/groups/{Group.objects.get(name='Teacher').pk}/")
+
+    def test_permissions(self):
+        self.assertListQueryBudget(2, '/api/auth/permissions/')
+        self.assertQueryBudget(1, f'/api/auth/permissions/{Permission.objects.first().pk}/')
+
+    def test_students(self):
+        self.assertListQueryBudget(3, '/api/auth/students/')
+        self.assertQueryBudget(13, f"/api/auth/students/{self.school['students'][0].pk}/")
+
+    def test_teachers(self):
+        self.assertListQueryBudget(2, '/api/auth/teachers/')
+        self.assertQueryBudget(3, f"/api/auth/teachers/{self.school['teachers'][0].pk}/")
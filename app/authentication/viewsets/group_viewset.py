@@ -14,7 +14,7 @@ from core.pagination import CustomPagination
 class GroupViewSet(viewsets.ModelViewSet):
     """ViewSet for managing groups (roles)."""
     
-    queryset = Group.objects.all().order_by('name')
+    queryset = Group.objects.prefetch_related('permissions').order_by('name')
     serializer_class = GroupSerializer
     pagination_class = CustomPagination
 
@@ -67,6 +67,7 @@ class StudentViewSet(viewsets.ModelViewSet):
                     Q(student_id__icontains=search)
                 )
                         
+            queryset = queryset.prefetch_related(Student.current_enrollments_prefetch())
             page = self.paginate_queryset(queryset)
             if page is not None:
                 serializer = self.get_serializer(page, many=True)
@@ -15,7 +15,7 @@ from core.pagination import CustomPagination
 class UserViewSet(viewsets.ModelViewSet):
     """ViewSet for managing users."""
     
-    queryset = User.objects.all().order_by('-date_joined')
+    queryset = User.objects.prefetch_related('groups').order_by('-date_joined')
     serializer_class = UserSerializer
     pagination_class = CustomPagination
     
@@ -18,10 +18,10 @@ class BulletinFileInline(admin.TabularInline):
 
 @admin.register(Bulletin)
 class BulletinAdmin(admin.ModelAdmin):
-    list_display = ('student_name', 'trimester_name', 'overall_average', 'status', 'generated_at', 'file_links')
-    list_filter = ('status', 'trimester__period', 'trimester')
+    list_display = ('student_name', 'trimester_name', 'overall_average', 'status', 'is_stale', 'generated_at', 'file_links')
+    list_filter = ('status', 'is_stale', 'trimester__period', 'trimester')
     search_fields = ('student__user__first_name', 'student__user__last_name', 'student__student_id', 'trimester__name')
-    readonly_fields = ('created_at', 'updated_at', 'generated_at', 'grades_data', 'error_message')
+    readonly_fields = ('created_at', 'updated_at', 'generated_at', 'grades_data', 'error_message', 'is_stale', 'stale_since')
     inlines = [BulletinFileInline]
     
     fieldsets = (
@@ -29,7 +29,7 @@ class BulletinAdmin(admin.ModelAdmin):
             'fields': ('student', 'trimester', 'status', 'overall_average')
         }),
         ('Details (Read-Only)', {
-            'fields': ('grades_data', 'generated_at', 'error_message', 'created_at', 'updated_at'),
+            'fields': ('grades_data', 'generated_at', 'error_message', 'is_stale', 'stale_since', 'created_at', 'updated_at'),
             'classes': ('collapse',),
         }),
     )
@@ -0,0 +1,65 @@
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app.authentication.models import User, Student
+from app.academic.models import Period, Trimester
+from app.reports.models.bulletin_model import Bulletin
+from app.reports.services.pdf_service import PDFBulletinService
+
+
+class Command(BaseCommand):
+    help = 'Micro-benchmark for PDF bulletin rendering. Uses in-memory bulletins, no database access.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=200, help='Number of bulletins to render')
+        parser.add_argument('--subjects', type=int, default=10, help='Subjects per bulletin')
+        parser.add_argument('--warmup', type=int, default=5, help='Bulletins rendered before timing starts')
+
+    def _build_bulletins(self, count, subjects):
+        period = Period(id=1, name='Gestion 2025', start_date=date(2025, 2, 1), end_date=date(2025, 11, 30))
+        trimester = Trimester(id=1, name='Primer Trimestre', period=period, start_date=date(2025, 2, 1), end_date=date(2025, 5, 1))
+        grades_data = {
+            'subjects': [
+                {'subject_id': i, 'subject_name': f'Materia {i}', 'subject_average': 60 + (i * 3) % 40, 'assessments': []}
+                for i in range(subjects)
+            ]
+        }
+
+        bulletins = []
+        for i in range(count):
+            user = User(id=i + 1, first_name=f'Estudiante {i}', last_name='Benchmark', email=f'bench{i}@example.com')
+            student = Student(user=user, student_id=f'BENCH{i:05d}')
+            bulletins.append(Bulletin(
+                id=i + 1,
+                student=student,
+                trimester=trimester,
+                grades_data=grades_data,
+                overall_average=Decimal('78.50'),
+                generated_at=timezone.now(),
+            ))
+        return bulletins
+
+    def handle(self, *args, **options):
+        count = options['count']
+        bulletins = self._build_bulletins(count, options['subjects'])
+        course_names = {(bulletin.student_id, bulletin.trimester.period_id): '1ro A' for bulletin in bulletins}
+
+        service = PDFBulletinService()
+        start = time.perf_counter()
+        service.generate_many_pdf_contents(bulletins[:options['warmup']], course_names=course_names)
+        warmup_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = service.generate_many_pdf_contents(bulletins, course_names=course_names)
+        elapsed = time.perf_counter() - start
+
+        total_bytes = sum(len(content) for content, _ in results)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rendered {count} bulletins in {elapsed:.3f}s '
+            f'({count / elapsed:.1f} bulletins/s, {total_bytes / count / 1024:.1f} KB avg)'
+        ))
+        self.stdout.write(f'Warm-up including style compilation: {warmup_elapsed:.3f}s for {options["warmup"]} bulletins')
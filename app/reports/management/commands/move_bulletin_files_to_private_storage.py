@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from app.reports.models.bulletin_model import BulletinFile
+from base.storage import PublicMediaStorage
+
+
+class Command(BaseCommand):
+    help = 'Copies bulletin files uploaded to the public S3 prefix into the private bulletin storage.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--delete-source', action='store_true', help='Delete the public copy once it has been moved')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many files would be moved')
+
+    def handle(self, *args, **options):
+        source_storage = PublicMediaStorage(custom_path='bulletins')
+        moved = skipped = 0
+
+        for bulletin_file in BulletinFile.objects.exclude(file='').only('id', 'file').iterator(chunk_size=500):
+            name = bulletin_file.file.name
+            target_storage = bulletin_file.file.storage
+            if target_storage.exists(name) or not source_storage.exists(name):
+                skipped += 1
+                continue
+
+            if not options['dry_run']:
+                with source_storage.open(name, 'rb') as source:
+                    saved_name = target_storage.save(name, source)
+                if saved_name != name:
+                    BulletinFile.objects.filter(pk=bulletin_file.pk).update(file=saved_name)
+                if options['delete_source']:
+                    source_storage.delete(name)
+            moved += 1
+
+        verb = 'Would move' if options['dry_run'] else 'Moved'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {moved} bulletin files to private storage ({skipped} skipped).'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from app.reports.models.bulletin_model import Bulletin
+from app.reports.services.bulletin_service import bulletin_service
+
+
+class Command(BaseCommand):
+    help = 'Regenerates bulletins marked as stale after their underlying grades changed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--trimester', type=int, help='Only regenerate bulletins of this trimester ID')
+        parser.add_argument('--period', type=int, help='Only regenerate bulletins of this period ID')
+        parser.add_argument('--limit', type=int, help='Maximum number of bulletins to regenerate in this run')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many bulletins are stale')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            stale = Bulletin.objects.filter(is_stale=True)
+            if options['trimester']:
+                stale = stale.filter(trimester_id=options['trimester'])
+            if options['period']:
+                stale = stale.filter(trimester__period_id=options['period'])
+            self.stdout.write(self.style.NOTICE(f'{stale.count()} stale bulletins pending regeneration.'))
+            return
+
+        summary = bulletin_service.regenerate_stale_bulletins(
+            trimester_id=options['trimester'],
+            period_id=options['period'],
+            limit=options['limit'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Regenerated {summary['regenerated']} stale bulletins ({summary['failed']} failed)."
+        ))
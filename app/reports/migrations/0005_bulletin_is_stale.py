@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0004_alter_bulletinfile_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulletin',
+            name='is_stale',
+            field=models.BooleanField(db_index=True, default=False, help_text='Underlying grades changed after the snapshot was taken'),
+        ),
+        migrations.AddField(
+            model_name='bulletin',
+            name='stale_since',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
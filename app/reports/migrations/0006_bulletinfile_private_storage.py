@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:25
+
+import app.reports.models.bulletin_model
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0005_bulletin_is_stale'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='bulletinfile',
+            name='file',
+            field=models.FileField(storage=app.reports.models.bulletin_model.bulletin_file_storage, upload_to=app.reports.models.bulletin_model.bulletin_file_upload_path),
+        ),
+    ]
@@ -4,7 +4,10 @@ from core.models.base_model import TimestampedModel
 from app.authentication.models import Student
 from app.academic.models import Trimester
 import os
-from base.storage import PublicMediaStorage
+from base.storage import get_private_storage
+
+def bulletin_file_storage():
+    return get_private_storage(custom_path='bulletins')
 
 def bulletin_file_upload_path(instance, filename):
     bulletin = instance.bulletin
@@ -53,6 +56,9 @@ class Bulletin(TimestampedModel):
     generated_at = models.DateTimeField(null=True, blank=True)
     error_message = models.TextField(null=True, blank=True)
 
+    is_stale = models.BooleanField(default=False, db_index=True, help_text="Underlying grades changed after the snapshot was taken")
+    stale_since = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         verbose_name = "Student Bulletin"
         verbose_name_plural = "Student Bulletins"
@@ -76,7 +82,7 @@ class BulletinFile(TimestampedModel):
     bulletin = models.ForeignKey('Bulletin', on_delete=models.CASCADE, related_name='files')
     format = models.CharField(max_length=10, choices=FormatChoices.choices)
     file = models.FileField(
-        storage=PublicMediaStorage(custom_path='bulletins'),
+        storage=bulletin_file_storage,
         upload_to=bulletin_file_upload_path
     )
     
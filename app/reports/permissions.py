@@ -1,5 +1,4 @@
 from rest_framework import permissions
-from app.authentication.models import Student, Teacher
 
 class BulletinPermission(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -23,19 +22,8 @@ class BulletinPermission(permissions.BasePermission):
             
         if hasattr(request.user, 'teacher_profile'):
             teacher = request.user.teacher_profile
-            
-            from app.academic.models import TeacherAssignment, Enrollment
-            
-            teacher_assignments = TeacherAssignment.objects.filter(
-                teacher=teacher
-            ).values_list('course_id', 'period_id')
-            
-            student_enrollment = Enrollment.objects.filter(
-                student=obj.student,
-                period=obj.trimester.period,
-                course_id__in=[assignment[0] for assignment in teacher_assignments]
+            return teacher.get_taught_enrollments(period=obj.trimester.period_id).filter(
+                student_id=obj.student_id
             ).exists()
             
-            return student_enrollment
-            
         return False
\ No newline at end of file
@@ -1,3 +1,3 @@
 from app.reports.serializers.bulletin_serializer import (
-    BulletinSerializer, BulletinFileSerializer, BulletinGenerationRequestSerializer
+    BulletinSerializer, BulletinListSerializer, BulletinFileSerializer, BulletinGenerationRequestSerializer
 )
\ No newline at end of file
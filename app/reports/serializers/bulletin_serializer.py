@@ -2,6 +2,7 @@ from rest_framework import serializers
 from app.reports.models.bulletin_model import Bulletin, BulletinFile
 from app.authentication.serializers.student_serializer import StudentListSerializer
 from app.academic.serializers.trimester_serializer import TrimesterSerializer
+from base.storage import signed_file_url
 
 class BulletinFileSerializer(serializers.ModelSerializer):
     url = serializers.SerializerMethodField()
@@ -13,10 +14,11 @@ class BulletinFileSerializer(serializers.ModelSerializer):
     
     def get_url(self, obj):
         if obj.file:
+            url = signed_file_url(obj.file, filename=obj.file.name.split('/')[-1])
             request = self.context.get('request')
             if request:
-                return request.build_absolute_uri(obj.file.url)
-            return obj.file.url
+                return request.build_absolute_uri(url)
+            return url
         return None
 
 class BulletinSerializer(serializers.ModelSerializer):
@@ -28,15 +30,44 @@ class BulletinSerializer(serializers.ModelSerializer):
         model = Bulletin
         fields = [
             'id', 'student', 'trimester', 'overall_average', 'grades_data', 
-            'status', 'files', 'generated_at', 'created_at', 'updated_at', 
+            'status', 'is_stale', 'stale_since', 'files', 'generated_at', 'created_at', 'updated_at', 
             'error_message'
         ]
         read_only_fields = [
             'id', 'student', 'trimester', 'overall_average', 'grades_data', 
-            'status', 'files', 'generated_at', 'created_at', 'updated_at', 
+            'status', 'is_stale', 'stale_since', 'files', 'generated_at', 'created_at', 'updated_at', 
             'error_message'
         ]
 
+class BulletinListSerializer(serializers.ModelSerializer):
+    OPTIONAL_FIELDS = ['grades_data']
+
+    student = StudentListSerializer(read_only=True)
+    trimester = TrimesterSerializer(read_only=True)
+    files = BulletinFileSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Bulletin
+        fields = [
+            'id', 'student', 'trimester', 'overall_average', 'grades_data',
+            'status', 'is_stale', 'stale_since', 'files', 'generated_at', 'created_at', 'updated_at',
+            'error_message'
+        ]
+        read_only_fields = fields
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested_fields = self.context.get('requested_fields', set())
+        for field_name in self.OPTIONAL_FIELDS:
+            if field_name not in requested_fields:
+                self.fields.pop(field_name, None)
+
+    def to_representation(self, instance):
+        # The list view annotates the current course name on the bulletin; hand it to the student.
+        if hasattr(instance, 'current_course_name'):
+            instance.student.current_course_name = instance.current_course_name
+        return super().to_representation(instance)
+
 class BulletinGenerationRequestSerializer(serializers.Serializer):
     student_id = serializers.IntegerField(required=True)
     trimester_id = serializers.IntegerField(required=True)
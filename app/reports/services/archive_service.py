@@ -0,0 +1,54 @@
+import zipfile
+from app.reports.models.bulletin_model import BulletinFile
+
+class _StreamBuffer:
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+class BulletinArchiveService:
+    CHUNK_SIZE = 64 * 1024
+
+    COMPRESSION_BY_FORMAT = {
+        BulletinFile.FormatChoices.HTML: zipfile.ZIP_DEFLATED,
+        BulletinFile.FormatChoices.PDF: zipfile.ZIP_STORED,
+        BulletinFile.FormatChoices.EXCEL: zipfile.ZIP_STORED,
+    }
+
+    def stream_zip(self, bulletin_files):
+        entries = [
+            (bulletin_file.file.storage, bulletin_file.file.name, bulletin_file.format, bulletin_file.created_at)
+            for bulletin_file in bulletin_files
+            if bulletin_file.file
+        ]
+
+        buffer = _StreamBuffer()
+        with zipfile.ZipFile(buffer, mode='w') as archive:
+            for storage, name, file_format, created_at in entries:
+                info = zipfile.ZipInfo(name, date_time=created_at.timetuple()[:6])
+                info.compress_type = self.COMPRESSION_BY_FORMAT.get(file_format, zipfile.ZIP_DEFLATED)
+                with storage.open(name, 'rb') as source, archive.open(info, mode='w', force_zip64=True) as target:
+                    for chunk in source.chunks(self.CHUNK_SIZE):
+                        target.write(chunk)
+                        data = buffer.drain()
+                        if data:
+                            yield data
+                data = buffer.drain()
+                if data:
+                    yield data
+        data = buffer.drain()
+        if data:
+            yield data
+
+bulletin_archive_service = BulletinArchiveService()
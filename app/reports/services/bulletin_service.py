@@ -1,5 +1,5 @@
 from django.utils import timezone
-from django.db import transaction
+from django.db import transaction, connection
 from django.db.models import Avg
 from django.core.files.base import ContentFile
 from app.authentication.models import Student
@@ -8,11 +8,16 @@ from app.reports.models.bulletin_model import Bulletin, BulletinFile
 from app.reports.services.pdf_service import pdf_bulletin_service
 from app.reports.services.excel_service import excel_bulletin_service
 from app.reports.services.html_service import html_bulletin_service
+from core import metrics
 from core.models import LoggerService
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import logging
 
 logger = logging.getLogger(__name__)
 
+FILE_UPLOAD_WORKERS = 3
+
 class BulletinService:
 
     def _collect_student_trimester_data(self, student: Student, trimester: Trimester):
@@ -69,53 +74,95 @@ class BulletinService:
             logger.error(f"Error saving bulletin file {file_format}: {str(e)}", exc_info=True)
             raise
 
-    @transaction.atomic
-    def generate_bulletin_for_student_trimester(self, student_id: int, trimester_id: int, force_regenerate: bool = False, generating_user=None):
-        try:
-            student = Student.objects.get(pk=student_id)
-            trimester = Trimester.objects.get(pk=trimester_id)
-        except (Student.DoesNotExist, Trimester.DoesNotExist) as e:
-            raise ValueError(f"Invalid student or trimester ID: {str(e)}")
-
-        bulletin, created = Bulletin.objects.get_or_create(
-            student=student,
-            trimester=trimester,
-            defaults={'status': Bulletin.StatusChoices.PENDING}
-        )
-
-        if not created and not force_regenerate and bulletin.status == Bulletin.StatusChoices.COMPLETED:
+    def _prepare_bulletin(self, student_id: int, trimester_id: int, force_regenerate: bool, generating_user):
+        with transaction.atomic():
+            try:
+                student = Student.objects.select_related('user').get(pk=student_id)
+                trimester = Trimester.objects.select_related('period').get(pk=trimester_id)
+            except (Student.DoesNotExist, Trimester.DoesNotExist) as e:
+                raise ValueError(f"Invalid student or trimester ID: {str(e)}")
+
+            bulletin, created = Bulletin.objects.get_or_create(
+                student=student,
+                trimester=trimester,
+                defaults={'status': Bulletin.StatusChoices.PENDING}
+            )
+
+            is_up_to_date = bulletin.status == Bulletin.StatusChoices.COMPLETED and not bulletin.is_stale
+            if not created and not force_regenerate and is_up_to_date:
+                LoggerService.objects.create(
+                    user=generating_user, action='BULLETIN_REQUEST_SKIPPED', level='INFO',
+                    table_name='Bulletin',
+                    description=f"Bulletin for {student.user.get_full_name()} - {trimester.name} already exists and regeneration not forced."
+                )
+                return bulletin, False
+
+            bulletin.status = Bulletin.StatusChoices.GENERATING
+            bulletin.error_message = None
+            bulletin.is_stale = False
+            bulletin.stale_since = None
+            bulletin.save()
+
             LoggerService.objects.create(
-                user=generating_user, action='BULLETIN_REQUEST_SKIPPED', level='INFO',
+                user=generating_user, action='BULLETIN_GENERATION_STARTED', level='INFO',
                 table_name='Bulletin',
-                description=f"Bulletin for {student.user.get_full_name()} - {trimester.name} already exists and regeneration not forced."
+                description=f"Bulletin generation started for {student.user.get_full_name()} - {trimester.name}."
             )
-            return bulletin, False
-
-        bulletin.status = Bulletin.StatusChoices.GENERATING
-        bulletin.error_message = None
-        bulletin.save()
-        
-        LoggerService.objects.create(
-            user=generating_user, action='BULLETIN_GENERATION_STARTED', level='INFO',
-            table_name='Bulletin',
-            description=f"Bulletin generation started for {student.user.get_full_name()} - {trimester.name}."
-        )
 
-        try:
             collected_data = self._collect_student_trimester_data(student, trimester)
             bulletin.grades_data = collected_data
             bulletin.overall_average = collected_data.get('overall_average', 0)
             bulletin.save(update_fields=['grades_data', 'overall_average'])
 
-            html_bytes, html_filename = html_bulletin_service.generate_html_content(bulletin)
-            self._save_bulletin_file(bulletin, BulletinFile.FormatChoices.HTML, html_bytes, html_filename)
+        return bulletin, True
+
+    def _render_and_save_file(self, bulletin_instance, file_format, renderer):
+        try:
+            content_bytes, filename = renderer(bulletin_instance)
+            return self._save_bulletin_file(bulletin_instance, file_format, content_bytes, filename)
+        finally:
+            # Worker threads open their own connection; release it once the upload is done.
+            connection.close()
+
+    def _render_and_upload_files(self, bulletin):
+        course_name = pdf_bulletin_service.get_course_name(bulletin)
+        renderers = {
+            BulletinFile.FormatChoices.HTML: html_bulletin_service.generate_html_content,
+            BulletinFile.FormatChoices.PDF: partial(pdf_bulletin_service.generate_pdf_content, course_name=course_name),
+            BulletinFile.FormatChoices.EXCEL: excel_bulletin_service.generate_excel_content,
+        }
+        if connection.in_atomic_block:
+            # Worker threads use their own connections, which cannot see the caller's uncommitted
+            # bulletin (and would block on its row), so inside a transaction the files are made here.
+            return [
+                self._save_bulletin_file(bulletin, file_format, *renderer(bulletin))
+                for file_format, renderer in renderers.items()
+            ]
+        with ThreadPoolExecutor(max_workers=min(FILE_UPLOAD_WORKERS, len(renderers))) as executor:
+            futures = [
+                executor.submit(self._render_and_save_file, bulletin, file_format, renderer)
+                for file_format, renderer in renderers.items()
+            ]
+            return [future.result() for future in futures]
+
+    @metrics.track(
+        metrics.bulletin_generations_total,
+        metrics.bulletin_generation_duration_seconds,
+        classify=lambda value: 'completed' if value[1] else 'skipped',
+        error_result='failed',
+        observe_results=('completed', 'failed'),
+    )
+    def generate_bulletin_for_student_trimester(self, student_id: int, trimester_id: int, force_regenerate: bool = False, generating_user=None):
+        bulletin, should_generate = self._prepare_bulletin(student_id, trimester_id, force_regenerate, generating_user)
+        if not should_generate:
+            return bulletin, False
+
+        student = bulletin.student
+        trimester = bulletin.trimester
 
-            pdf_bytes, pdf_filename = pdf_bulletin_service.generate_pdf_content(bulletin)
-            self._save_bulletin_file(bulletin, BulletinFile.FormatChoices.PDF, pdf_bytes, pdf_filename)
+        try:
+            self._render_and_upload_files(bulletin)
 
-            excel_bytes, excel_filename = excel_bulletin_service.generate_excel_content(bulletin)
-            self._save_bulletin_file(bulletin, BulletinFile.FormatChoices.EXCEL, excel_bytes, excel_filename)
-            
             bulletin.status = Bulletin.StatusChoices.COMPLETED
             bulletin.generated_at = timezone.now()
             bulletin.save(update_fields=['status', 'generated_at'])
@@ -137,4 +184,47 @@ class BulletinService:
             )
             raise
 
+    def mark_stale(self, bulletins):
+        return bulletins.filter(is_stale=False).update(is_stale=True, stale_since=timezone.now())
+
+    def mark_stale_for_student_trimester(self, student_id, trimester_id):
+        return self.mark_stale(Bulletin.objects.filter(student_id=student_id, trimester_id=trimester_id))
+
+    def mark_stale_for_grades(self, grades):
+        affected = grades.filter(assessment_item__isnull=False).values('student_id', 'assessment_item__trimester_id')
+        marked = 0
+        for trimester_id in {row['assessment_item__trimester_id'] for row in affected}:
+            marked += self.mark_stale(Bulletin.objects.filter(
+                trimester_id=trimester_id,
+                student_id__in=grades.filter(assessment_item__trimester_id=trimester_id).values('student_id')
+            ))
+        return marked
+
+    def mark_stale_for_assessment_item(self, assessment_item, trimester_id=None):
+        return self.mark_stale(Bulletin.objects.filter(
+            trimester_id=trimester_id or assessment_item.trimester_id,
+            student_id__in=Grade.objects.filter(assessment_item=assessment_item).values('student_id')
+        ))
+
+    def regenerate_stale_bulletins(self, trimester_id=None, period_id=None, limit=None, generating_user=None):
+        stale_bulletins = Bulletin.objects.filter(is_stale=True).order_by('stale_since', 'pk')
+        if trimester_id:
+            stale_bulletins = stale_bulletins.filter(trimester_id=trimester_id)
+        if period_id:
+            stale_bulletins = stale_bulletins.filter(trimester__period_id=period_id)
+        if limit:
+            stale_bulletins = stale_bulletins[:limit]
+
+        summary = {'regenerated': 0, 'failed': 0}
+        for student_id, bulletin_trimester_id in list(stale_bulletins.values_list('student_id', 'trimester_id')):
+            try:
+                self.generate_bulletin_for_student_trimester(
+                    student_id, bulletin_trimester_id, force_regenerate=True, generating_user=generating_user
+                )
+                summary['regenerated'] += 1
+            except Exception as e:
+                logger.error(f"Error regenerating stale bulletin for student {student_id}, trimester {bulletin_trimester_id}: {str(e)}")
+                summary['failed'] += 1
+        return summary
+
 bulletin_service = BulletinService()
\ No newline at end of file
@@ -1,8 +1,12 @@
 import io
+import re
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
 from app.reports.models.bulletin_model import Bulletin
-from app.academic.models import Enrollment
+from app.academic.models import Enrollment, AssessmentItem, Grade
+from django.db.models import Value
+from django.db.models.functions import Concat
 
 class ExcelBulletinService:
     def generate_excel_content(self, bulletin: Bulletin):
@@ -105,4 +109,103 @@ class ExcelBulletinService:
         filename = f"bulletin_{bulletin.pk}.xlsx"
         return excel_buffer.getvalue(), filename
 
-excel_bulletin_service = ExcelBulletinService()
\ No newline at end of file
+excel_bulletin_service = ExcelBulletinService()
+
+class ExcelGradebookService:
+    INVALID_SHEET_CHARS = re.compile(r'[\[\]\:\*\?\/\\]')
+    MAX_SHEET_TITLE = 31
+
+    def _sheet_title(self, subject_name, used_titles):
+        base = self.INVALID_SHEET_CHARS.sub(' ', subject_name).strip() or 'Materia'
+        title = base[:self.MAX_SHEET_TITLE]
+        suffix = 2
+        while title.lower() in used_titles:
+            marker = f" ({suffix})"
+            title = f"{base[:self.MAX_SHEET_TITLE - len(marker)]}{marker}"
+            suffix += 1
+        used_titles.add(title.lower())
+        return title
+
+    def _header_row(self, ws, items):
+        header_font = Font(bold=True)
+        header_fill = PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")
+        labels = ["Código", "Estudiante"]
+        labels += [f"{item['name']} ({item['date'].strftime('%d/%m')})" if item['date'] else item['name'] for item in items]
+        labels.append("Promedio")
+
+        row = []
+        for label in labels:
+            cell = WriteOnlyCell(ws, value=label)
+            cell.font = header_font
+            cell.fill = header_fill
+            row.append(cell)
+        return row
+
+    def _student_row(self, student_code, student_name, values, item_ids):
+        scores = [values.get(item_id) for item_id in item_ids]
+        recorded = [score for score in scores if score is not None]
+        average = round(sum(recorded) / len(recorded), 2) if recorded else None
+        return [student_code, student_name, *scores, average]
+
+    def write_gradebook(self, items_by_subject, grade_rows, output):
+        """Grade rows are (subject_id, student_pk, student_code, student_name, item_id, value), ordered by subject then student."""
+        wb = Workbook(write_only=True)
+        used_titles = set()
+        sheets = {}
+
+        for subject_id, (subject_name, items) in items_by_subject.items():
+            ws = wb.create_sheet(title=self._sheet_title(subject_name, used_titles))
+            ws.column_dimensions['A'].width = 15
+            ws.column_dimensions['B'].width = 35
+            ws.freeze_panes = 'C2'
+            ws.append(self._header_row(ws, items))
+            sheets[subject_id] = (ws, [item['id'] for item in items])
+
+        current_key = None
+        current_row = None
+        for subject_id, student_pk, student_code, student_name, item_id, value in grade_rows:
+            key = (subject_id, student_pk)
+            if key != current_key:
+                if current_row is not None:
+                    ws, item_ids = sheets[current_key[0]]
+                    ws.append(self._student_row(*current_row, item_ids))
+                current_key = key
+                current_row = (student_code, student_name, {})
+            current_row[2][item_id] = float(value)
+
+        if current_row is not None:
+            ws, item_ids = sheets[current_key[0]]
+            ws.append(self._student_row(*current_row, item_ids))
+
+        if not sheets:
+            wb.create_sheet(title="Sin datos")
+
+        wb.save(output)
+        return len(sheets)
+
+    def write_class_gradebook(self, course, trimester, output):
+        items = AssessmentItem.objects.filter(
+            course=course,
+            trimester=trimester
+        ).select_related('subject').order_by('subject__name', 'subject_id', 'date', 'id')
+
+        items_by_subject = {}
+        for item in items:
+            subject_entry = items_by_subject.setdefault(item.subject_id, (item.subject.name, []))
+            subject_entry[1].append({'id': item.id, 'name': item.name, 'date': item.date})
+
+        grade_rows = Grade.objects.filter(
+            assessment_item__course=course,
+            assessment_item__trimester=trimester
+        ).order_by(
+            'assessment_item__subject__name', 'assessment_item__subject_id',
+            'student__user__last_name', 'student__user__first_name', 'student_id'
+        ).values_list(
+            'assessment_item__subject_id', 'student_id', 'student__student_id',
+            Concat('student__user__last_name', Value(', '), 'student__user__first_name'),
+            'assessment_item_id', 'value'
+        ).iterator(chunk_size=2000)
+
+        return self.write_gradebook(items_by_subject, grade_rows, output)
+
+excel_gradebook_service = ExcelGradebookService()
\ No newline at end of file
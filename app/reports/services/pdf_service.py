@@ -1,80 +1,142 @@
 import io
+import copy
+import threading
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from app.reports.models.bulletin_model import Bulletin
 from app.academic.models import Enrollment
 
 class PDFBulletinService:
-    def generate_pdf_content(self, bulletin: Bulletin):
-        student = bulletin.student
-        trimester = bulletin.trimester
-        course_name = "N/A"
-        try:
-            enrollment = Enrollment.objects.filter(
-                student=student, 
-                period=trimester.period,
-                status='active'
-            ).select_related('course').first()
-            if enrollment and enrollment.course:
-                course_name = enrollment.course.name
-        except Enrollment.DoesNotExist:
-            pass
+    def __init__(self):
+        self._styles = None
+        self._styles_lock = threading.Lock()
 
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=inch/2, leftMargin=inch/2, rightMargin=inch/2, bottomMargin=inch/2)
+    def _build_styles(self):
         styles = getSampleStyleSheet()
-        elements = []
+        compiled = {
+            'title': ParagraphStyle('Title', parent=styles['Heading1'], alignment=1, spaceAfter=0.3*inch),
+            'header': ParagraphStyle('Header', parent=styles['Heading2'], fontSize=14, alignment=1, spaceAfter=0.1*inch),
+            'subheader': ParagraphStyle('SubHeader', parent=styles['Heading3'], fontSize=12, alignment=1, spaceAfter=0.3*inch),
+            'info': ParagraphStyle('Info', parent=styles['Normal'], spaceAfter=6),
+            'overall': ParagraphStyle('Overall', parent=styles['Heading4'], alignment=2),
+            'footer': ParagraphStyle('Footer', parent=styles['Normal'], alignment=1, fontSize=9),
+            'table': TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+                ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ]),
+        }
+        compiled['title_text'] = Paragraph("Boletín de Calificaciones", compiled['title'])
+        compiled['institution_text'] = Paragraph("Institución Educativa FICCT School", compiled['header'])
+        return compiled
+
+    @property
+    def styles(self):
+        if self._styles is None:
+            with self._styles_lock:
+                if self._styles is None:
+                    self._styles = self._build_styles()
+        return self._styles
+
+    def get_course_names(self, bulletins):
+        student_ids = {bulletin.student_id for bulletin in bulletins}
+        period_ids = {bulletin.trimester.period_id for bulletin in bulletins}
+        enrollments = Enrollment.objects.filter(
+            student_id__in=student_ids,
+            period_id__in=period_ids,
+            status='active'
+        ).order_by('-enrollment_date').values_list('student_id', 'period_id', 'course__name')
+
+        course_names = {}
+        for student_id, period_id, course_name in enrollments:
+            course_names.setdefault((student_id, period_id), course_name)
+        return course_names
+
+    def get_course_name(self, bulletin: Bulletin):
+        course_names = self.get_course_names([bulletin])
+        return course_names.get((bulletin.student_id, bulletin.trimester.period_id), "N/A")
+
+    def build_bulletin_elements(self, bulletin: Bulletin, course_name):
+        styles = self.styles
+        student = bulletin.student
+        trimester = bulletin.trimester
+        elements = [
+            copy.copy(styles['title_text']),
+            copy.copy(styles['institution_text']),
+            Paragraph(f"{trimester.period.name} - {trimester.name}", styles['subheader']),
+            Paragraph(f"<b>Estudiante:</b> {student.user.get_full_name()}", styles['info']),
+            Paragraph(f"<b>ID Estudiante:</b> {student.student_id}", styles['info']),
+            Paragraph(f"<b>Curso:</b> {course_name}", styles['info']),
+            Spacer(1, 0.3*inch),
+        ]
 
-        title_style = ParagraphStyle('Title', parent=styles['Heading1'], alignment=1, spaceAfter=0.3*inch)
-        header_style = ParagraphStyle('Header', parent=styles['Heading2'], fontSize=14, alignment=1, spaceAfter=0.1*inch)
-        subheader_style = ParagraphStyle('SubHeader', parent=styles['Heading3'], fontSize=12, alignment=1, spaceAfter=0.3*inch)
-        
-        elements.append(Paragraph("Boletín de Calificaciones", title_style))
-        elements.append(Paragraph("Institución Educativa FICCT School", header_style))
-        elements.append(Paragraph(f"{trimester.period.name} - {trimester.name}", subheader_style))
-        
-        info_style = ParagraphStyle('Info', parent=styles['Normal'], spaceAfter=6)
-        elements.append(Paragraph(f"<b>Estudiante:</b> {student.user.get_full_name()}", info_style))
-        elements.append(Paragraph(f"<b>ID Estudiante:</b> {student.student_id}", info_style))
-        elements.append(Paragraph(f"<b>Curso:</b> {course_name}", info_style))
-        elements.append(Spacer(1, 0.3*inch))
-        
         data = [["Materia", "Promedio"]]
-        subjects_data = bulletin.grades_data.get('subjects', [])
-        
-        for subject in subjects_data:
+        for subject in bulletin.grades_data.get('subjects', []):
             subject_name = subject.get('subject_name', '')
             subject_average = round(float(subject.get('subject_average', 0)), 2)
             data.append([subject_name, subject_average])
-            
+
         table = Table(data, colWidths=[4*inch, 2*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
+        table.setStyle(styles['table'])
         elements.append(table)
-        
+
         elements.append(Spacer(1, 0.3*inch))
-        overall_style = ParagraphStyle('Overall', parent=styles['Heading4'], alignment=2)
-        elements.append(Paragraph(f"Promedio General: {round(float(bulletin.overall_average or 0), 2)}", overall_style))
-        
+        elements.append(Paragraph(f"Promedio General: {round(float(bulletin.overall_average or 0), 2)}", styles['overall']))
+
         elements.append(Spacer(1, 0.7*inch))
-        footer_style = ParagraphStyle('Footer', parent=styles['Normal'], alignment=1, fontSize=9)
-        elements.append(Paragraph(f"Generado el: {bulletin.generated_at.strftime('%d/%m/%Y %H:%M') if bulletin.generated_at else 'N/A'}", footer_style))
-        elements.append(Paragraph(f"© {trimester.period.start_date.year if trimester.period and trimester.period.start_date else '2025'} FICCT School. Todos los derechos reservados.", footer_style))
-        
-        doc.build(elements)
+        elements.append(Paragraph(f"Generado el: {bulletin.generated_at.strftime('%d/%m/%Y %H:%M') if bulletin.generated_at else 'N/A'}", styles['footer']))
+        elements.append(Paragraph(f"© {trimester.period.start_date.year if trimester.period and trimester.period.start_date else '2025'} FICCT School. Todos los derechos reservados.", styles['footer']))
+        return elements
+
+    def _build_document(self, output):
+        return SimpleDocTemplate(output, pagesize=letter, topMargin=inch/2, leftMargin=inch/2, rightMargin=inch/2, bottomMargin=inch/2)
+
+    def generate_pdf_content(self, bulletin: Bulletin, course_name=None):
+        if course_name is None:
+            course_name = self.get_course_name(bulletin)
+
+        buffer = io.BytesIO()
+        doc = self._build_document(buffer)
+        doc.build(self.build_bulletin_elements(bulletin, course_name))
         buffer.seek(0)
-        
+
         filename = f"bulletin_{bulletin.pk}.pdf"
         return buffer.getvalue(), filename
 
-pdf_bulletin_service = PDFBulletinService()
\ No newline at end of file
+    def generate_many_pdf_contents(self, bulletins, course_names=None):
+        bulletins = list(bulletins)
+        if course_names is None:
+            course_names = self.get_course_names(bulletins)
+
+        return [
+            self.generate_pdf_content(
+                bulletin,
+                course_name=course_names.get((bulletin.student_id, bulletin.trimester.period_id), "N/A")
+            )
+            for bulletin in bulletins
+        ]
+
+    def write_class_pdf(self, bulletins, course_name, output):
+        """Renders all bulletins into one PDF written to `output`. ReportLab lays out the whole
+        document in memory before writing it, so memory grows with the number of bulletins;
+        callers bound it by passing a slice."""
+        elements = []
+        bulletin_count = 0
+        for bulletin in bulletins:
+            if bulletin_count:
+                elements.append(PageBreak())
+            elements.extend(self.build_bulletin_elements(bulletin, course_name))
+            bulletin_count += 1
+
+        if bulletin_count:
+            self._build_document(output).build(elements)
+        return bulletin_count
+
+pdf_bulletin_service = PDFBulletinService()
@@ -0,0 +1,60 @@
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
+from django.dispatch import receiver
+from app.academic.models import Grade, AssessmentItem
+from app.reports.services.bulletin_service import bulletin_service
+
+@receiver(pre_save, sender=Grade)
+def remember_previous_grade_bulletin(sender, instance, raw=False, **kwargs):
+    instance._previous_bulletin_key = None
+    if raw or not instance.pk:
+        return
+    previous = Grade.objects.filter(pk=instance.pk).values_list('student_id', 'assessment_item__trimester_id').first()
+    if previous and previous[1]:
+        instance._previous_bulletin_key = previous
+
+def _deleted_in_cascade(origin):
+    """True when a grade is deleted because its assessment item, student, trimester or period is.
+    Those deletes either mark the bulletins once in pre_delete or delete the bulletins themselves."""
+    return origin is not None and not isinstance(origin, Grade) and getattr(origin, 'model', None) is not Grade
+
+def _grade_trimester_id(grade):
+    if Grade.assessment_item.is_cached(grade):
+        return grade.assessment_item.trimester_id
+    return AssessmentItem.objects.filter(pk=grade.assessment_item_id).values_list('trimester_id', flat=True).first()
+
+@receiver(post_save, sender=Grade)
+@receiver(post_delete, sender=Grade)
+def mark_bulletin_stale_on_grade_change(sender, instance, raw=False, origin=None, **kwargs):
+    if raw or _deleted_in_cascade(origin):
+        return
+
+    previous_key = getattr(instance, '_previous_bulletin_key', None)
+    if previous_key:
+        bulletin_service.mark_stale_for_student_trimester(*previous_key)
+
+    if instance.assessment_item_id:
+        current_key = (instance.student_id, _grade_trimester_id(instance))
+        if current_key[1] and current_key != previous_key:
+            bulletin_service.mark_stale_for_student_trimester(*current_key)
+
+@receiver(pre_save, sender=AssessmentItem)
+def remember_previous_item_trimester(sender, instance, raw=False, **kwargs):
+    instance._previous_trimester_id = None
+    if raw or not instance.pk:
+        return
+    instance._previous_trimester_id = AssessmentItem.objects.filter(pk=instance.pk).values_list('trimester_id', flat=True).first()
+
+@receiver(post_save, sender=AssessmentItem)
+def mark_bulletins_stale_on_assessment_item_change(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+
+    previous_trimester_id = getattr(instance, '_previous_trimester_id', None)
+    if previous_trimester_id and previous_trimester_id != instance.trimester_id:
+        bulletin_service.mark_stale_for_assessment_item(instance, trimester_id=previous_trimester_id)
+    bulletin_service.mark_stale_for_assessment_item(instance)
+
+@receiver(pre_delete, sender=AssessmentItem)
+def mark_bulletins_stale_on_assessment_item_delete(sender, instance, **kwargs):
+    # Runs before the cascade removes the grades, so one update covers all of them.
+    bulletin_service.mark_stale_for_assessment_item(instance)
@@ -1,3 +1,28 @@
-from django.test import TestCase
+from core.testing import QueryBudgetTestCase, seed_school
 
-# Create your tests here.
+
+class BulletinQueryBudgetTests(QueryBudgetTestCase):
+    """The bulletin list annotates the current course and defers grades_data, so it stays flat for
+    admins and teachers alike."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = seed_school()
+        cls.bulletin = cls.school['students'][0].bulletins.get()
+
+    def test_admin(self):
+        self.authenticate(self.school['admin'])
+        self.assertListQueryBudget(3, '/api/reports/bulletins/')
+        self.assertListQueryBudget(3, '/api/reports/bulletins/', {'fields': 'grades_data'})
+        self.assertQueryBudget(5, f'/api/reports/bulletins/{self.bulletin.pk}/')
+
+    def test_teacher(self):
+        self.authenticate(self.school['teachers'][0].user)
+        self.assertListQueryBudget(5, '/api/reports/bulletins/')
+        self.assertQueryBudget(8, f'/api/reports/bulletins/{self.bulletin.pk}/')
+
+    def test_student(self):
+        self.authenticate(self.school['students'][0].user)
+        # A student only has one bulletin per trimester, too few to compare page sizes.
+        self.assertQueryBudget(5, '/api/reports/bulletins/')
+        self.assertQueryBudget(7, f'/api/reports/bulletins/{self.bulletin.pk}/')
@@ -1,17 +1,31 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.text import slugify
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
+from django.db import models
 import logging
+import tempfile
 
-from app.reports.models.bulletin_model import Bulletin
-from app.reports.serializers.bulletin_serializer import BulletinSerializer, BulletinGenerationRequestSerializer
+from app.reports.models.bulletin_model import Bulletin, BulletinFile
+from app.reports.serializers.bulletin_serializer import BulletinSerializer, BulletinListSerializer, BulletinGenerationRequestSerializer
 from app.reports.services.bulletin_service import bulletin_service
+from app.reports.services.pdf_service import pdf_bulletin_service
+from app.reports.services.archive_service import bulletin_archive_service
+from app.reports.services.excel_service import excel_gradebook_service
 from app.reports.permissions import BulletinPermission
+from app.academic.models import Course, Trimester, Enrollment, TeacherAssignment
+from app.authentication.models import Student
 
 logger = logging.getLogger(__name__)
 
+CLASS_PDF_SPOOL_SIZE = 5 * 1024 * 1024
+# ReportLab holds the whole document in memory, so a class PDF holds at most this many bulletins.
+CLASS_PDF_MAX_BULLETINS = 50
+GRADEBOOK_SPOOL_SIZE = 5 * 1024 * 1024
+
 @extend_schema(tags=['Reports - Bulletins'])
 class BulletinViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Bulletin.objects.all().select_related(
@@ -33,16 +47,32 @@ class BulletinViewSet(viewsets.ReadOnlyModelViewSet):
             
         if hasattr(user, 'teacher_profile'):
             teacher = user.teacher_profile
-            student_ids = teacher.get_taught_student_ids()
-            return queryset.filter(student_id__in=student_ids)
+            return queryset.filter(teacher.teaches_student())
             
         return queryset.none()
 
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return BulletinListSerializer
+        return BulletinSerializer
+
+    def _get_requested_fields(self):
+        fields_param = self.request.query_params.get('fields', '')
+        return {field.strip() for field in fields_param.split(',') if field.strip()}
+
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
+        context['requested_fields'] = self._get_requested_fields()
         return context
 
+    def _annotate_list_queryset(self, queryset):
+        queryset = queryset.annotate(current_course_name=Student.current_course_name_subquery('student_id'))
+
+        if 'grades_data' not in self._get_requested_fields():
+            queryset = queryset.defer('grades_data')
+        return queryset
+
     @extend_schema(
         request=BulletinGenerationRequestSerializer,
         responses={201: BulletinSerializer, 200: BulletinSerializer, 400: OpenApiTypes.OBJECT, 403: OpenApiTypes.OBJECT, 500: OpenApiTypes.OBJECT},
@@ -73,8 +103,7 @@ class BulletinViewSet(viewsets.ReadOnlyModelViewSet):
         
         if hasattr(request.user, 'teacher_profile') and not request.user.is_staff:
             teacher = request.user.teacher_profile
-            student_ids = teacher.get_taught_student_ids()
-            if int(student_id) not in student_ids:
+            if not teacher.get_taught_enrollments().filter(student_id=student_id).exists():
                 return Response(
                     {"error": "You can only generate bulletins for students in your courses"},
                     status=status.HTTP_403_FORBIDDEN
@@ -102,7 +131,9 @@ class BulletinViewSet(viewsets.ReadOnlyModelViewSet):
             OpenApiParameter(name='student_id', description='Filter bulletins by student ID', required=False, type=OpenApiTypes.INT),
             OpenApiParameter(name='trimester_id', description='Filter bulletins by trimester ID', required=False, type=OpenApiTypes.INT),
             OpenApiParameter(name='period_id', description='Filter bulletins by period ID', required=False, type=OpenApiTypes.INT),
+            OpenApiParameter(name='fields', description='Comma-separated optional fields to include (grades_data)', required=False, type=OpenApiTypes.STR),
         ],
+        responses={200: BulletinListSerializer(many=True)},
         summary="List bulletins with optional filters",
         description=(
             "Lista los boletines disponibles con filtros opcionales.\n\n"
@@ -112,7 +143,8 @@ class BulletinViewSet(viewsets.ReadOnlyModelViewSet):
             "**Filtros opcionales:**\n"
             "- `student_id`: Filtrar por ID de estudiante\n"
             "- `trimester_id`: Filtrar por ID de trimestre\n"
-            "- `period_id`: Filtrar por ID de periodo académico"
+            "- `period_id`: Filtrar por ID de periodo académico\n\n"
+            "El listado no incluye `grades_data`; usa el detalle del boletín o `?fields=grades_data` para obtenerlo."
         )
     )
     def list(self, request, *args, **kwargs):
@@ -134,11 +166,210 @@ class BulletinViewSet(viewsets.ReadOnlyModelViewSet):
             
         if period_id:
             queryset = queryset.filter(trimester__period_id=period_id)
-        
+
+        queryset = self._annotate_list_queryset(queryset)
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
 
         serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+    def _get_class_request_scope(self, request):
+        if hasattr(request.user, 'student_profile') and not request.user.is_staff:
+            return None, None, Response({"error": "Students cannot download class reports"}, status=status.HTTP_403_FORBIDDEN)
+
+        course_id = request.query_params.get('course_id')
+        trimester_id = request.query_params.get('trimester_id')
+        if not course_id or not trimester_id:
+            return None, None, Response({"error": "course_id and trimester_id are required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            course = Course.objects.get(pk=course_id)
+            trimester = Trimester.objects.select_related('period').get(pk=trimester_id)
+        except (Course.DoesNotExist, Trimester.DoesNotExist, ValueError):
+            return None, None, Response({"error": "Invalid course or trimester ID"}, status=status.HTTP_404_NOT_FOUND)
+
+        if hasattr(request.user, 'teacher_profile') and not request.user.is_staff:
+            teaches_course = TeacherAssignment.objects.filter(
+                teacher=request.user.teacher_profile,
+                course=course,
+                period=trimester.period
+            ).exists()
+            if not teaches_course:
+                return None, None, Response(
+                    {"error": "You can only download reports for your courses"},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+
+        return course, trimester, None
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name='course_id', description='Course whose bulletins are printed', required=True, type=OpenApiTypes.INT),
+            OpenApiParameter(name='trimester_id', description='Trimester of the bulletins', required=True, type=OpenApiTypes.INT),
+            OpenApiParameter(name='part', description=f'Part of the class to print, {CLASS_PDF_MAX_BULLETINS} bulletins per part (default 1)', required=False, type=OpenApiTypes.INT),
+        ],
+        responses={200: OpenApiTypes.BINARY, 400: OpenApiTypes.OBJECT, 403: OpenApiTypes.OBJECT, 404: OpenApiTypes.OBJECT},
+        summary="Download a consolidated PDF with the bulletins of a whole class",
+        description=(
+            "Genera un único PDF con un boletín por página para todos los estudiantes de un curso en un trimestre.\n\n"
+            "- Se usan los snapshots `grades_data` de los boletines completados; no se recalculan notas.\n"
+            f"- Cada PDF incluye como máximo {CLASS_PDF_MAX_BULLETINS} boletines; las clases más grandes se descargan por partes "
+            "con `part`. Los encabezados `X-Total-Count` y `X-Part-Count` indican el total de boletines y de partes.\n"
+            "- Profesores solo pueden descargar cursos que tienen asignados.\n"
+            "- Estudiantes no pueden usar este endpoint."
+        )
+    )
+    @action(detail=False, methods=['get'], url_path='class-pdf')
+    def class_pdf(self, request):
+        course, trimester, error_response = self._get_class_request_scope(request)
+        if error_response:
+            return error_response
+        try:
+            part = int(request.query_params.get('part', 1))
+        except ValueError:
+            part = 0
+        if part < 1:
+            return Response({"error": "part must be a positive integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        enrolled_students = Enrollment.objects.filter(
+            course=course,
+            period=trimester.period,
+            status='active'
+        ).values('student_id')
+        bulletins = self.get_queryset().filter(
+            trimester=trimester,
+            student_id__in=enrolled_students,
+            status=Bulletin.StatusChoices.COMPLETED
+        ).prefetch_related(None).order_by('student__user__last_name', 'student__user__first_name', 'pk')
+
+        total = bulletins.count()
+        if not total:
+            return Response(
+                {"error": "No completed bulletins found for this course and trimester"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        part_count = -(-total // CLASS_PDF_MAX_BULLETINS)
+        if part > part_count:
+            return Response(
+                {"error": f"This class has {part_count} parts of {CLASS_PDF_MAX_BULLETINS} bulletins"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        offset = (part - 1) * CLASS_PDF_MAX_BULLETINS
+        output = tempfile.SpooledTemporaryFile(max_size=CLASS_PDF_SPOOL_SIZE)
+        pdf_bulletin_service.write_class_pdf(bulletins[offset:offset + CLASS_PDF_MAX_BULLETINS], course.name, output)
+        output.seek(0)
+
+        filename = f"bulletins_{slugify(course.name)}_{slugify(trimester.name)}"
+        if part_count > 1:
+            filename += f"_part{part}-of-{part_count}"
+        response = FileResponse(output, as_attachment=True, filename=f"{filename}.pdf", content_type='application/pdf')
+        response['X-Total-Count'] = total
+        response['X-Part-Count'] = part_count
+        return response
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name='course_id', description='Filter files by course ID', required=False, type=OpenApiTypes.INT),
+            OpenApiParameter(name='trimester_id', description='Filter files by trimester ID', required=False, type=OpenApiTypes.INT),
+            OpenApiParameter(name='period_id', description='Filter files by period ID', required=False, type=OpenApiTypes.INT),
+            OpenApiParameter(name='file_format', description='Filter files by format (pdf, excel, html)', required=False, type=OpenApiTypes.STR),
+        ],
+        responses={200: OpenApiTypes.BINARY, 400: OpenApiTypes.OBJECT, 404: OpenApiTypes.OBJECT},
+        summary="Download a ZIP archive with the selected bulletin files",
+        description=(
+            "Descarga un ZIP con los archivos de boletines filtrados, generado en streaming.\n\n"
+            "- Se requiere al menos un filtro: `course_id`, `trimester_id`, `period_id` o `file_format`.\n"
+            "- Los archivos se leen del almacenamiento por bloques y se envían al cliente sin armar el ZIP en memoria ni en disco.\n"
+            "- La visibilidad es la misma que en el listado de boletines."
+        )
+    )
+    @action(detail=False, methods=['get'], url_path='download-zip')
+    def download_zip(self, request):
+        course_id = request.query_params.get('course_id')
+        trimester_id = request.query_params.get('trimester_id')
+        period_id = request.query_params.get('period_id')
+        file_format = request.query_params.get('file_format')
+
+        if not any([course_id, trimester_id, period_id, file_format]):
+            return Response(
+                {"error": "At least one filter is required: course_id, trimester_id, period_id or file_format"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if file_format and file_format not in BulletinFile.FormatChoices.values:
+            return Response(
+                {"error": f"Invalid format. Must be one of: {', '.join(BulletinFile.FormatChoices.values)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        bulletins = self.get_queryset()
+        if trimester_id:
+            bulletins = bulletins.filter(trimester_id=trimester_id)
+        if period_id:
+            bulletins = bulletins.filter(trimester__period_id=period_id)
+        if course_id:
+            bulletins = bulletins.filter(
+                student_id__in=Enrollment.objects.filter(
+                    course_id=course_id,
+                    period_id=models.OuterRef('trimester__period_id'),
+                    status='active'
+                ).values('student_id')
+            )
+
+        bulletin_files = BulletinFile.objects.filter(
+            bulletin_id__in=bulletins.order_by().values('pk')
+        ).order_by('bulletin_id', 'format')
+        if file_format:
+            bulletin_files = bulletin_files.filter(format=file_format)
+
+        bulletin_files = list(bulletin_files)
+        if not bulletin_files:
+            return Response({"error": "No bulletin files match the given filters"}, status=status.HTTP_404_NOT_FOUND)
+
+        name_parts = ['bulletins']
+        for label, value in (('course', course_id), ('trimester', trimester_id), ('period', period_id), ('format', file_format)):
+            if value:
+                name_parts.append(f"{label}-{slugify(value)}")
+
+        response = StreamingHttpResponse(
+            bulletin_archive_service.stream_zip(bulletin_files),
+            content_type='application/zip'
+        )
+        response['Content-Disposition'] = f'attachment; filename="{"_".join(name_parts)}.zip"'
+        return response
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name='course_id', description='Course of the gradebook', required=True, type=OpenApiTypes.INT),
+            OpenApiParameter(name='trimester_id', description='Trimester of the gradebook', required=True, type=OpenApiTypes.INT),
+        ],
+        responses={200: OpenApiTypes.BINARY, 400: OpenApiTypes.OBJECT, 403: OpenApiTypes.OBJECT, 404: OpenApiTypes.OBJECT},
+        summary="Download the class gradebook workbook for a course and trimester",
+        description=(
+            "Genera un libro Excel con una hoja por materia, los estudiantes como filas y las evaluaciones como columnas.\n\n"
+            "- Las notas se leen con una sola consulta sobre `Grade` y se escriben en modo write-only de openpyxl.\n"
+            "- Profesores solo pueden descargar cursos que tienen asignados.\n"
+            "- Estudiantes no pueden usar este endpoint."
+        )
+    )
+    @action(detail=False, methods=['get'], url_path='class-gradebook')
+    def class_gradebook(self, request):
+        course, trimester, error_response = self._get_class_request_scope(request)
+        if error_response:
+            return error_response
+
+        output = tempfile.SpooledTemporaryFile(max_size=GRADEBOOK_SPOOL_SIZE)
+        excel_gradebook_service.write_class_gradebook(course, trimester, output)
+        output.seek(0)
+
+        filename = f"gradebook_{slugify(course.name)}_{slugify(trimester.name)}.xlsx"
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=filename,
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
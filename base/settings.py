@@ -52,6 +52,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django_filters',
     'rest_framework',
     'corsheaders',
@@ -69,6 +70,8 @@ AUTH_USER_MODEL = 'authentication.User'
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.RequestMetricsMiddleware',
+    'core.middleware.QueryInspectorMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -151,6 +154,45 @@ else:
     MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
     DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
 
+PRIVATE_MEDIA_ROOT = config('PRIVATE_MEDIA_ROOT', default=os.path.join(BASE_DIR, 'private_media'))
+SIGNED_URL_EXPIRE_SECONDS = config('SIGNED_URL_EXPIRE_SECONDS', default=300, cast=int)
+
+BACKUP_STORAGE_BACKEND = config('BACKUP_STORAGE_BACKEND', default='s3' if USE_S3 else 'local')
+BACKUP_COMPRESSION = config('BACKUP_COMPRESSION', default='gzip')
+BACKUP_PARALLEL_JOBS = config('BACKUP_PARALLEL_JOBS', default=os.cpu_count() or 2, cast=int)
+DATABASE_JOB_HEARTBEAT_SECONDS = config('DATABASE_JOB_HEARTBEAT_SECONDS', default=30, cast=int)
+DATABASE_JOB_STALE_SECONDS = config('DATABASE_JOB_STALE_SECONDS', default=600, cast=int)
+
+AUDIT_LOG_BUFFERED = config('AUDIT_LOG_BUFFERED', default='True') == 'True'
+AUDIT_LOG_BATCH_SIZE = config('AUDIT_LOG_BATCH_SIZE', default=100, cast=int)
+AUDIT_LOG_FLUSH_INTERVAL = config('AUDIT_LOG_FLUSH_INTERVAL', default=2.0, cast=float)
+AUDIT_LOG_MAX_QUEUE_SIZE = config('AUDIT_LOG_MAX_QUEUE_SIZE', default=10000, cast=int)
+LOG_RETENTION_DAYS = config('LOG_RETENTION_DAYS', default=180, cast=int)
+LOG_ARCHIVE_DELETE_BATCH_SIZE = config('LOG_ARCHIVE_DELETE_BATCH_SIZE', default=1000, cast=int)
+# How often `run_database_jobs --log-maintenance` compacts log rollups and archives old logs.
+LOG_ROLLUP_COMPACT_INTERVAL_SECONDS = config('LOG_ROLLUP_COMPACT_INTERVAL_SECONDS', default=900, cast=int)
+LOG_ARCHIVE_INTERVAL_SECONDS = config('LOG_ARCHIVE_INTERVAL_SECONDS', default=86400, cast=int)
+
+REQUEST_METRICS_ENABLED = config('REQUEST_METRICS_ENABLED', default='True') == 'True'
+REQUEST_METRICS_FLUSH_INTERVAL = config('REQUEST_METRICS_FLUSH_INTERVAL', default=300, cast=int)
+REQUEST_METRICS_RETENTION_DAYS = config('REQUEST_METRICS_RETENTION_DAYS', default=14, cast=int)
+
+QUERY_INSPECTOR_ENABLED = config('QUERY_INSPECTOR_ENABLED', default='False') == 'True'
+QUERY_INSPECTOR_ALLOW_HEADER = config('QUERY_INSPECTOR_ALLOW_HEADER', default=str(DEBUG)) == 'True'
+QUERY_INSPECTOR_REPEAT_THRESHOLD = config('QUERY_INSPECTOR_REPEAT_THRESHOLD', default=10, cast=int)
+QUERY_INSPECTOR_SLOW_MS = config('QUERY_INSPECTOR_SLOW_MS', default=200, cast=float)
+
+PROMETHEUS_METRICS_ENABLED = config('PROMETHEUS_METRICS_ENABLED', default='True') == 'True'
+# Bearer token Prometheus sends to /api/core/metrics; without it only staff sessions can read the metrics.
+METRICS_AUTH_TOKEN = config('METRICS_AUTH_TOKEN', default='')
+# Shared by all gunicorn workers so scrapes aggregate every worker; must be emptied before the server starts.
+PROMETHEUS_MULTIPROC_DIR = config('PROMETHEUS_MULTIPROC_DIR', default='')
+if PROMETHEUS_MULTIPROC_DIR:
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+    os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', PROMETHEUS_MULTIPROC_DIR)
+# Multiprocess directories of other processes (the database job worker) merged into every scrape.
+PROMETHEUS_SCRAPE_DIRS = [path.strip() for path in config('PROMETHEUS_SCRAPE_DIRS', default='').split(',') if path.strip()]
+
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
@@ -1,5 +1,13 @@
+import os
+import time
+
 from storages.backends.s3boto3 import S3Boto3Storage
 from django.conf import settings
+from django.core import signing
+from django.core.files.storage import FileSystemStorage
+from django.urls import reverse
+
+SIGNED_DOWNLOAD_SALT = 'base.storage.signed-download'
 
 class StaticStorage(S3Boto3Storage):
     location = 'public/static'
@@ -24,6 +32,7 @@ class PublicMediaStorage(S3Boto3Storage):
 class PrivateMediaStorage(S3Boto3Storage):
     location = 'private'
     file_overwrite = False
+    querystring_auth = True
     
     def __init__(self, custom_path=None, **kwargs):
         self._custom_path = custom_path
@@ -36,4 +45,54 @@ class PrivateMediaStorage(S3Boto3Storage):
         if self._custom_path and not name.startswith(self._custom_path):
             name = f"{self._custom_path}/{name}"
             
-        return name
\ No newline at end of file
+        return name
+
+    def signed_url(self, name, expire=None, filename=None):
+        parameters = None
+        if filename:
+            parameters = {'ResponseContentDisposition': f'attachment; filename="{filename}"'}
+        return self.url(name, parameters=parameters, expire=expire or settings.SIGNED_URL_EXPIRE_SECONDS)
+
+class PrivateFileSystemStorage(FileSystemStorage):
+    """Local counterpart of PrivateMediaStorage: files live outside MEDIA_ROOT and
+    are only reachable through short-lived signed download URLs."""
+
+    def __init__(self, custom_path=None, **kwargs):
+        self._custom_path = custom_path or ''
+        kwargs.setdefault('location', os.path.join(settings.PRIVATE_MEDIA_ROOT, self._custom_path))
+        super().__init__(**kwargs)
+
+    def url(self, name):
+        return self.signed_url(name)
+
+    def signed_url(self, name, expire=None, filename=None):
+        token = signing.dumps(
+            {
+                'path': self._custom_path,
+                'name': name,
+                'filename': filename,
+                'expires_at': int(time.time()) + (expire or settings.SIGNED_URL_EXPIRE_SECONDS),
+            },
+            salt=SIGNED_DOWNLOAD_SALT,
+        )
+        return reverse('signed-download', kwargs={'token': token})
+
+def get_private_storage(custom_path=None, **kwargs):
+    if settings.USE_S3:
+        return PrivateMediaStorage(custom_path=custom_path, **kwargs)
+    return PrivateFileSystemStorage(custom_path=custom_path, **kwargs)
+
+def signed_file_url(field_file, expire=None, filename=None):
+    storage = field_file.storage
+    if hasattr(storage, 'signed_url'):
+        return storage.signed_url(field_file.name, expire=expire, filename=filename)
+    return field_file.url
+
+def load_signed_download(token):
+    """Returns (storage, name, filename) for a token issued by PrivateFileSystemStorage.
+    Raises signing.BadSignature when the token is tampered with or expired."""
+    payload = signing.loads(token, salt=SIGNED_DOWNLOAD_SALT)
+    if payload['expires_at'] < time.time():
+        raise signing.SignatureExpired('Download link has expired.')
+    storage = PrivateFileSystemStorage(custom_path=payload['path'])
+    return storage, payload['name'], payload['filename']
@@ -1,4 +1,29 @@
 from django.contrib import admin
-from .models import LoggerService
+from .models import LoggerService, DatabaseJob, LogHourlyRollup, RequestMetric, QueryOffender
 
 admin.site.register(LoggerService)
+
+@admin.register(DatabaseJob)
+class DatabaseJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'job_type', 'status', 'bytes_processed', 'duration_seconds', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('job_type', 'status')
+    readonly_fields = ('started_at', 'finished_at', 'log_tail')
+
+@admin.register(LogHourlyRollup)
+class LogHourlyRollupAdmin(admin.ModelAdmin):
+    list_display = ('bucket', 'action', 'table_name', 'level', 'count')
+    list_filter = ('action', 'level')
+    date_hierarchy = 'bucket'
+
+@admin.register(RequestMetric)
+class RequestMetricAdmin(admin.ModelAdmin):
+    list_display = ('period_start', 'method', 'view_name', 'count', 'error_count', 'duration_max_ms')
+    list_filter = ('method',)
+    search_fields = ('view_name',)
+
+@admin.register(QueryOffender)
+class QueryOffenderAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'view_name', 'location', 'occurrences', 'max_repeat', 'total_time_ms', 'last_seen')
+    list_filter = ('kind',)
+    search_fields = ('view_name', 'location', 'sql')
+    readonly_fields = ('first_seen',)
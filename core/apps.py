@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.conf import settings
+
+        if getattr(settings, 'REQUEST_METRICS_ENABLED', False):
+            from core.services.request_metrics_service import install_serializer_timing
+            install_serializer_timing()
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.log_archive_service import log_archive_service, LogArchiveError
+
+
+class Command(BaseCommand):
+    help = (
+        'Archives activity logs older than the retention period to compressed NDJSON files, one per month, '
+        'and deletes the archived rows in small batches. run_database_jobs --log-maintenance runs it daily.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=None, help='Retention period in days, defaults to LOG_RETENTION_DAYS')
+        parser.add_argument('--batch-size', type=int, default=None, help='Rows per DELETE, defaults to LOG_ARCHIVE_DELETE_BATCH_SIZE')
+        parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between delete batches')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows each month would archive')
+
+    def handle(self, *args, **options):
+        try:
+            summary = log_archive_service.archive(
+                retention_days=options['older_than_days'],
+                batch_size=options['batch_size'],
+                pause=options['pause'],
+                dry_run=options['dry_run'],
+            )
+        except LogArchiveError as e:
+            raise CommandError(str(e))
+
+        if not summary:
+            self.stdout.write('No logs older than the retention period.')
+            return
+
+        for item in summary:
+            if options['dry_run']:
+                self.stdout.write(f"{item['month']}: {item['rows']} rows would be archived")
+            else:
+                self.stdout.write(
+                    f"{item['month']}: {item['rows']} rows -> {item['filename']} "
+                    f"({item['size_bytes'] / 1024:.1f} KB), {item['deleted']} deleted in {item['duration_seconds']}s"
+                )
+        if not options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"Archived {sum(item['rows'] for item in summary)} log rows."))
@@ -0,0 +1,275 @@
+import itertools
+import tempfile
+from contextlib import contextmanager
+
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from app.academic.models import (
+    AssessmentItem, Attendance, Course, Enrollment, Grade, Participation, Period, Subject, Trimester,
+)
+from app.academic.services import trimester_snapshot_service
+from app.analytics.services.prediction_service import performance_prediction_service
+from app.authentication.models import Student, Teacher, User
+from app.reports.models import Bulletin, BulletinFile
+from app.reports.services.bulletin_service import bulletin_service
+from core.services.audit_log_writer import audit_log_writer
+from core.services.benchmark_service import benchmark_service, BenchmarkError
+from core.services.synthetic_school_service import synthetic_school_service, SyntheticSchoolError
+
+GROUPS = ['lists', 'dashboards', 'snapshots', 'bulletins', 'training', 'prediction']
+# Closing trimesters is permanent and regenerating bulletins replaces their files (with ones in the
+# temporary directory, deleted at the end), so these only run on a generated or disposable database.
+WRITING_GROUPS = ['snapshots', 'bulletins', 'training']
+
+LIST_ENDPOINTS = [
+    ('courses', '/api/academic/courses/'),
+    ('subjects', '/api/academic/subjects/'),
+    ('teacher assignments', '/api/academic/teacher-assignments/'),
+    ('enrollments', '/api/academic/enrollments/'),
+    ('attendances', '/api/academic/attendances/'),
+    ('participations', '/api/academic/participations/'),
+    ('assessment items', '/api/academic/assessment-items/'),
+    ('grades', '/api/academic/grades/'),
+    ('students', '/api/auth/students/'),
+    ('teachers', '/api/auth/teachers/'),
+    ('users', '/api/auth/users/'),
+    ('bulletins', '/api/reports/bulletins/'),
+    ('logs', '/api/core/logs/'),
+]
+
+DASHBOARD_ENDPOINTS = [
+    ('general stats', '/api/analytics/dashboards/general-stats/'),
+    ('course performance', '/api/analytics/dashboards/course-performance/'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks list views, dashboards, trimester closing, bulletin generation, model training and '
+        'prediction, optionally on a synthetic school generated first into an empty database. Writes a JSON '
+        'report to compare between commits and prints it as markdown. Files are written to a temporary '
+        'directory, never to the configured storage. Closing trimesters, generating bulletins and training '
+        'change the database, so they only run with --generate or --allow-writes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--generate', action='store_true', help='Generate a synthetic school first (database must be empty)')
+        parser.add_argument('--students', type=int, default=500)
+        parser.add_argument('--courses', type=int, default=10)
+        parser.add_argument('--subjects', type=int, default=8)
+        parser.add_argument('--periods', type=int, default=2, help='School years; the last one is the active period')
+        parser.add_argument('--trimesters', type=int, default=3, help='Trimesters per period')
+        parser.add_argument('--grades-per-trimester', type=int, default=4, help='Assessment items per subject, course and trimester')
+        parser.add_argument('--attendance-days', type=int, default=10, help='Days with attendance and participation per period')
+        parser.add_argument('--teachers', type=int, default=None, help='Defaults to courses * subjects / 4')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--allow-writes', action='store_true',
+            help=f"Run {', '.join(WRITING_GROUPS)} on an existing database; they close trimesters for good and "
+                 "leave regenerated bulletins without files"
+        )
+        parser.add_argument(
+            '--groups', default=None,
+            help=f"Comma-separated subset of {', '.join(GROUPS)}; defaults to all that may run"
+        )
+        parser.add_argument('--iterations', type=int, default=5, help='Timed calls per list and dashboard case')
+        parser.add_argument('--warmup', type=int, default=1, help='Untimed calls before each list and dashboard case')
+        parser.add_argument('--page-size', type=int, default=None, help='page_size of list requests, defaults to the API default')
+        parser.add_argument('--bulletins', type=int, default=10, help='Bulletins generated, one per student')
+        parser.add_argument('--training-runs', type=int, default=1)
+        parser.add_argument('--predictions', type=int, default=20, help='Predictions made, one per student')
+        parser.add_argument('--output', help='Path of the JSON report')
+        parser.add_argument('--markdown', help='Path of the markdown report')
+        parser.add_argument('--compare', help='JSON report of a previous run to compare against')
+
+    def handle(self, *args, **options):
+        for option in ('iterations', 'bulletins', 'training_runs', 'predictions'):
+            if options[option] < 1:
+                raise CommandError(f"--{option.replace('_', '-')} must be at least 1")
+        if options['warmup'] < 0:
+            raise CommandError('--warmup must not be negative')
+
+        self.allow_writes = options['generate'] or options['allow_writes']
+        if options['groups']:
+            groups = [group.strip() for group in options['groups'].split(',') if group.strip()]
+            unknown = set(groups) - set(GROUPS)
+            if unknown:
+                raise CommandError(f"Unknown groups: {', '.join(sorted(unknown))}")
+            writing = [group for group in groups if group in WRITING_GROUPS]
+            if writing and not self.allow_writes:
+                raise CommandError(
+                    f"{', '.join(writing)} change the database; pass --generate on an empty database or --allow-writes"
+                )
+        else:
+            groups = [group for group in GROUPS if self.allow_writes or group not in WRITING_GROUPS]
+            if not self.allow_writes:
+                self.stdout.write(f"Skipping {', '.join(WRITING_GROUPS)}: they change the database (see --allow-writes)")
+        try:
+            baseline = benchmark_service.load_report(options['compare']) if options['compare'] else None
+        except (OSError, ValueError, BenchmarkError) as e:
+            raise CommandError(f"Could not read {options['compare']}: {e}")
+
+        generation = None
+        if options['generate']:
+            try:
+                generation = synthetic_school_service.generate(
+                    students=options['students'], courses=options['courses'], subjects=options['subjects'],
+                    periods=options['periods'], trimesters=options['trimesters'],
+                    grades_per_trimester=options['grades_per_trimester'], attendance_days=options['attendance_days'],
+                    teachers=options['teachers'], seed=options['seed'], log=self.stdout.write,
+                )
+            except SyntheticSchoolError as e:
+                raise CommandError(str(e))
+        elif not Student.objects.exists():
+            raise CommandError('There are no students to benchmark; pass --generate on an empty database')
+
+        with override_settings(REQUEST_METRICS_ENABLED=False, QUERY_INSPECTOR_ENABLED=False), self._temporary_storage():
+            cases = []
+            for group in groups:
+                self.stdout.write(f"Running {group}...")
+                cases.extend(getattr(self, f"_run_{group}")(options))
+        audit_log_writer.flush()
+
+        report = benchmark_service.build_report(
+            cases, self._dataset(), {key: options[key] for key in ('iterations', 'warmup', 'page_size', 'seed')},
+            generation=generation,
+        )
+        markdown = benchmark_service.render_markdown(report, baseline=baseline)
+        if options['output']:
+            benchmark_service.write_report(report, options['output'])
+        if options['markdown']:
+            with open(options['markdown'], 'w', encoding='utf-8') as markdown_file:
+                markdown_file.write(markdown)
+
+        self.stdout.write(markdown)
+        failed = [case['name'] for case in cases if 'error' in case]
+        if failed:
+            self.stdout.write(self.style.WARNING(f"{len(failed)} cases failed: {', '.join(failed)}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Benchmarked {len(cases)} cases."))
+
+    @contextmanager
+    def _temporary_storage(self):
+        """Bulletin files and trained models go to a temporary directory for the duration of the run."""
+        file_field = BulletinFile._meta.get_field('file')
+        original_file_storage = file_field.storage
+        original_model_storage = performance_prediction_service.storage
+        with tempfile.TemporaryDirectory(prefix='benchmark-') as directory:
+            file_field.storage = FileSystemStorage(location=f"{directory}/bulletins")
+            performance_prediction_service.storage = FileSystemStorage(location=f"{directory}/ml_models")
+            try:
+                yield
+            finally:
+                file_field.storage = original_file_storage
+                performance_prediction_service.storage = original_model_storage
+                performance_prediction_service._load_model_and_scaler()
+
+    def _dataset(self):
+        return {
+            'students': Student.objects.count(),
+            'teachers': Teacher.objects.count(),
+            'courses': Course.objects.count(),
+            'subjects': Subject.objects.count(),
+            'periods': Period.objects.count(),
+            'trimesters': Trimester.objects.count(),
+            'enrollments': Enrollment.objects.count(),
+            'assessment items': AssessmentItem.objects.count(),
+            'grades': Grade.objects.count(),
+            'attendances': Attendance.objects.count(),
+            'participations': Participation.objects.count(),
+            'bulletins': Bulletin.objects.count(),
+        }
+
+    def _admin(self):
+        admin = User.objects.filter(is_superuser=True, is_active=True).order_by('pk').first()
+        if admin is None:
+            if not self.allow_writes:
+                raise CommandError('There is no active superuser to request the API as; create one or pass --allow-writes')
+            # No password: the account can only be used through force_authenticate.
+            admin = User.objects.create_superuser(
+                email=f"benchmark@{synthetic_school_service.EMAIL_DOMAIN}", first_name='Benchmark', last_name='Admin'
+            )
+        return admin
+
+    def _sample_students(self, count):
+        active_period = Period.objects.filter(is_active=True).first()
+        students = Student.objects.order_by('pk')
+        if active_period:
+            students = students.filter(enrollments__period=active_period).distinct()
+        return list(students.values_list('pk', flat=True)[:count])
+
+    def _measure_get(self, name, group, path, options):
+        client = APIClient()
+        client.force_authenticate(self._admin())
+        params = {'page_size': options['page_size']} if options['page_size'] else {}
+
+        def get():
+            response = client.get(path, params)
+            if response.status_code != 200:
+                raise BenchmarkError(f"GET {path} returned {response.status_code}")
+
+        return benchmark_service.measure(name, group, get, iterations=options['iterations'], warmup=options['warmup'])
+
+    def _run_lists(self, options):
+        return [self._measure_get(name, 'lists', path, options) for name, path in LIST_ENDPOINTS]
+
+    def _run_dashboards(self, options):
+        return [self._measure_get(name, 'dashboards', path, options) for name, path in DASHBOARD_ENDPOINTS]
+
+    def _run_snapshots(self, options):
+        """Closes the open trimesters of past periods, as the end of each trimester would."""
+        trimester_ids = list(
+            Trimester.objects.filter(is_closed=False, period__is_active=False).order_by('start_date').values_list('pk', flat=True)
+        )
+        if not trimester_ids:
+            self.stdout.write('  no open trimesters in past periods, skipped')
+            return []
+        pending = iter(trimester_ids)
+        return [benchmark_service.measure(
+            'close trimester', 'snapshots', lambda: trimester_snapshot_service.close_trimester(next(pending)),
+            iterations=len(trimester_ids), warmup=0,
+        )]
+
+    def _run_bulletins(self, options):
+        trimester = Trimester.objects.filter(period__is_active=True).order_by('start_date').first()
+        student_ids = self._sample_students(options['bulletins'])
+        if trimester is None or not student_ids:
+            self.stdout.write('  no active period with enrolled students, skipped')
+            return []
+        pending = iter(student_ids)
+        return [benchmark_service.measure(
+            'generate bulletin', 'bulletins',
+            lambda: bulletin_service.generate_bulletin_for_student_trimester(next(pending), trimester.pk, force_regenerate=True),
+            iterations=len(student_ids), warmup=0,
+        )]
+
+    def _run_training(self, options):
+        def train():
+            result = performance_prediction_service.train_performance_model()
+            if result.get('status') != 'success':
+                raise BenchmarkError(result.get('message'))
+
+        return [benchmark_service.measure('train model', 'training', train, iterations=options['training_runs'], warmup=0)]
+
+    def _run_prediction(self, options):
+        student_ids = self._sample_students(options['predictions'])
+        if not student_ids:
+            self.stdout.write('  no enrolled students, skipped')
+            return []
+        if performance_prediction_service.model is None:
+            if not self.allow_writes:
+                self.stdout.write('  no model loaded and training is not allowed, skipped')
+                return []
+            self.stdout.write('  no model loaded, training one first (not timed)')
+            performance_prediction_service.train_performance_model()
+        pending = itertools.cycle(student_ids)
+
+        def predict():
+            result = performance_prediction_service.predict_student_performance(next(pending))
+            if 'error' in result:
+                raise BenchmarkError(result['error'])
+
+        return [benchmark_service.measure('predict', 'prediction', predict, iterations=len(student_ids), warmup=1)]
@@ -0,0 +1,37 @@
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from core.models import LogHourlyRollup
+from core.services.log_rollup_service import log_rollup_service
+
+
+class Command(BaseCommand):
+    help = (
+        'Updates the hourly log rollups used by the log statistics endpoint. run_database_jobs --log-maintenance '
+        'runs it periodically; run it by hand to backfill the rollups of a large log table before deploying.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Recompute rollups from this date (YYYY-MM-DD) instead of the newest rollup')
+        parser.add_argument('--full', action='store_true', help='Drop every rollup and rebuild them from the log table (counts of archived logs are lost)')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            day = parse_date(options['since'])
+            if day is None:
+                raise CommandError(f"Invalid date '{options['since']}'. Use YYYY-MM-DD")
+            since = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+        if options['full']:
+            LogHourlyRollup.objects.all().delete()
+
+        started = time.monotonic()
+        written = log_rollup_service.compact(since=since)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} rollup rows in {time.monotonic() - started:.2f}s."
+        ))
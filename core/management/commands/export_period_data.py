@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.logical_export_service import logical_export_service, LogicalExportError
+
+
+class Command(BaseCommand):
+    help = 'Exports academic data of one period (grades, attendance, participation, enrollments, bulletins) as compressed NDJSON or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--period', type=int, required=True, help='Period ID to export')
+        parser.add_argument('--output', required=True, help='Directory where one .gz file per model is written')
+        parser.add_argument(
+            '--models',
+            default=','.join(logical_export_service.MODELS),
+            help=f"Comma separated models to export ({', '.join(logical_export_service.MODELS)})"
+        )
+        parser.add_argument('--format', dest='file_format', choices=logical_export_service.FORMATS, default='ndjson')
+
+    def handle(self, *args, **options):
+        keys = [key.strip() for key in options['models'].split(',') if key.strip()]
+        try:
+            summary = logical_export_service.export_period(
+                options['period'], options['output'], keys=keys, file_format=options['file_format']
+            )
+        except LogicalExportError as e:
+            raise CommandError(str(e))
+
+        for item in summary:
+            self.stdout.write(
+                f"{item['model']}: {item['rows']} rows, {item['size_bytes'] / 1024:.1f} KB "
+                f"in {item['duration_seconds']}s -> {item['path']}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Exported {sum(item['rows'] for item in summary)} rows."))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.logical_export_service import logical_export_service, LogicalExportError
+
+
+class Command(BaseCommand):
+    help = (
+        'Restores files written by export_period_data, upserting rows by primary key (or by natural key when '
+        'the row exists under another id) in batches. Grades of closed trimesters are refused; reopen those '
+        'trimesters first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='+', help='Exported .ndjson.gz or .csv.gz files')
+        parser.add_argument('--period', type=int, help='Period ID the files belong to (required with --replace)')
+        parser.add_argument('--replace', action='store_true', help="Delete the period's existing rows before importing (bulletins are kept)")
+
+    def handle(self, *args, **options):
+        total = 0
+        for path in options['files']:
+            try:
+                result = logical_export_service.import_file(path, period_id=options['period'], replace=options['replace'])
+            except LogicalExportError as e:
+                raise CommandError(str(e))
+            total += result['rows']
+            self.stdout.write(f"{result['model']}: {result['rows']} rows in {result['duration_seconds']}s from {result['path']}")
+            if result['matched_by_key']:
+                self.stdout.write(f"  {result['matched_by_key']} rows matched existing rows by natural key and updated them")
+            if options['replace'] and not result['replaced']:
+                self.stdout.write(f"  existing {result['model']} rows were kept; their generated files are not part of the export")
+        self.stdout.write(self.style.SUCCESS(f"Imported {total} rows."))
@@ -0,0 +1,86 @@
+import signal
+import time
+import logging
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.services import database_job_service
+from core.services.log_archive_service import log_archive_service
+from core.services.log_rollup_service import log_rollup_service
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs queued database backup and restore jobs outside the web workers. With --log-maintenance it also '
+        'compacts the log rollups every LOG_ROLLUP_COMPACT_INTERVAL_SECONDS and archives old logs every '
+        'LOG_ARCHIVE_INTERVAL_SECONDS, between jobs; the first compaction backfills every hour not rolled up yet.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run the pending jobs and exit instead of polling')
+        parser.add_argument('--poll-interval', type=float, default=5.0, help='Seconds to wait between polls when the queue is empty')
+        parser.add_argument(
+            '--log-maintenance', action='store_true',
+            help='Also compact log rollups and archive old logs on a schedule; enable it on one worker only'
+        )
+
+    def handle(self, *args, **options):
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        self._last_runs = {}
+        self.stdout.write(self.style.NOTICE('Waiting for database jobs...'))
+        while not self._stopping:
+            close_old_connections()
+            if options['log_maintenance']:
+                self._run_log_maintenance()
+            job = database_job_service.claim_next_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f'Running {job}')
+            try:
+                job = database_job_service.run_job(job)
+            except Exception as e:
+                # One broken job must not stop the queue; a job left RUNNING is failed once its heartbeat goes stale.
+                logger.error(f"Database job #{job.pk} crashed the worker loop: {str(e)}", exc_info=True)
+                self.stdout.write(self.style.ERROR(f'{job} crashed: {e}'))
+                continue
+            style = self.style.SUCCESS if job.status == job.StatusChoices.COMPLETED else self.style.ERROR
+            self.stdout.write(style(f'{job} finished in {job.duration_seconds}s'))
+
+        self.stdout.write(self.style.NOTICE('Database job worker stopped.'))
+
+    def _is_due(self, task, interval):
+        now = time.monotonic()
+        if task in self._last_runs and now - self._last_runs[task] < interval:
+            return False
+        self._last_runs[task] = now
+        return True
+
+    def _run_log_maintenance(self):
+        # A failure is retried at the next interval; it must not stop the job queue.
+        if self._is_due('compact', settings.LOG_ROLLUP_COMPACT_INTERVAL_SECONDS):
+            try:
+                written = log_rollup_service.compact()
+                self.stdout.write(f'Compacted log rollups: {written} rows written')
+            except Exception as e:
+                logger.error(f"Log rollup compaction failed: {str(e)}", exc_info=True)
+        if self._is_due('archive', settings.LOG_ARCHIVE_INTERVAL_SECONDS):
+            try:
+                summary = log_archive_service.archive()
+                self.stdout.write(f'Archived {sum(item["rows"] for item in summary)} log rows')
+            except Exception as e:
+                logger.error(f"Log archiving failed: {str(e)}", exc_info=True)
+
+    def _request_stop(self, signum, frame):
+        # Let the current job finish; the loop exits before claiming the next one.
+        self._stopping = True
@@ -0,0 +1,202 @@
+"""Prometheus metrics of the API.
+
+Counters and histograms are recorded with prometheus_client. When PROMETHEUS_MULTIPROC_DIR is set
+(one directory shared by all gunicorn workers, emptied before the server starts) every worker writes
+its values to memory-mapped files there and a scrape of any worker aggregates all of them, together
+with the directories listed in PROMETHEUS_SCRAPE_DIRS (e.g. the one of the database job worker).
+Gauges about shared state (database connections, queued bulletins and jobs) are computed at scrape time.
+"""
+import glob
+import logging
+import os
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import Count
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+JOB_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+http_requests_total = Counter(
+    'http_requests_total', 'HTTP requests by resolved view, method and status code',
+    ['view', 'method', 'status']
+)
+http_request_duration_seconds = Histogram(
+    'http_request_duration_seconds', 'Time spent handling HTTP requests',
+    ['view', 'method'], buckets=LATENCY_BUCKETS
+)
+
+bulletin_generations_total = Counter(
+    'bulletin_generations_total', 'Bulletin generation attempts by result (completed, failed, skipped)',
+    ['result']
+)
+bulletin_generation_duration_seconds = Histogram(
+    'bulletin_generation_duration_seconds', 'Time to collect, render and upload one bulletin',
+    buckets=JOB_BUCKETS
+)
+
+predictions_total = Counter(
+    'prediction_requests_total', 'Performance predictions by result (success, error)',
+    ['result']
+)
+prediction_duration_seconds = Histogram(
+    'prediction_duration_seconds', 'Time to build features and predict for one student',
+    buckets=LATENCY_BUCKETS
+)
+model_trainings_total = Counter(
+    'prediction_model_trainings_total', 'Performance model training runs by result (success, error)',
+    ['result']
+)
+model_training_duration_seconds = Histogram(
+    'prediction_model_training_duration_seconds', 'Duration of performance model training runs',
+    buckets=JOB_BUCKETS
+)
+prediction_model_version = Gauge(
+    'prediction_model_version_timestamp_seconds',
+    'Last-modified time of the loaded performance model file, 0 when no model is loaded',
+    multiprocess_mode='max'
+)
+
+database_operations_total = Counter(
+    'database_backup_operations_total', 'Database backups and restores by operation and result',
+    ['operation', 'result']
+)
+database_operation_duration_seconds = Histogram(
+    'database_backup_operation_duration_seconds', 'Duration of database backups and restores',
+    ['operation'], buckets=JOB_BUCKETS
+)
+database_operation_bytes_total = Counter(
+    'database_backup_bytes_total', 'Bytes dumped by backups or read by restores',
+    ['operation']
+)
+
+
+def track(counter, histogram, classify=None, error_result='error', observe_results=None, **labels):
+    """Decorator counting calls in `counter` by result and observing their duration in `histogram`.
+
+    The result label is 'success', classify(return value) when given, or error_result when the call
+    raises. With observe_results, only calls with one of those results are timed.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                value = func(*args, **kwargs)
+            except Exception:
+                result = error_result
+                raise
+            else:
+                result = classify(value) if classify else 'success'
+                return value
+            finally:
+                counter.labels(**labels, result=result).inc()
+                if observe_results is None or result in observe_results:
+                    (histogram.labels(**labels) if labels else histogram).observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+class AppStateCollector:
+    """Gauges read from the database when scraped, so they are the same whichever worker answers.
+    When the database cannot be read these gauges are left out, and the counters are still served."""
+
+    def collect(self):
+        for gauges in (self._database_connections, self._bulletin_queue, self._database_job_queue):
+            try:
+                families = list(gauges())
+            except DatabaseError:
+                logger.warning('Skipping %s metrics: the database could not be read', gauges.__name__.lstrip('_'), exc_info=True)
+                continue
+            yield from families
+
+    def _database_connections(self):
+        if connection.vendor != 'postgresql':
+            return
+        connections = GaugeMetricFamily(
+            'database_connections', 'Server connections to the application database by state', labels=['state']
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COALESCE(state, 'unknown'), COUNT(*) FROM pg_stat_activity "
+                "WHERE datname = current_database() GROUP BY 1"
+            )
+            for state, count in cursor.fetchall():
+                connections.add_metric([state], count)
+            cursor.execute("SELECT setting::int FROM pg_settings WHERE name = 'max_connections'")
+            max_connections = cursor.fetchone()[0]
+        yield connections
+        yield GaugeMetricFamily('database_connections_max', 'max_connections of the database server', value=max_connections)
+
+    def _bulletin_queue(self):
+        from app.reports.models import Bulletin
+
+        queue = GaugeMetricFamily(
+            'bulletin_queue_depth', 'Bulletins waiting for generation: pending, generating, or stale',
+            labels=['state']
+        )
+        counts = dict(
+            Bulletin.objects.filter(status__in=[Bulletin.StatusChoices.PENDING, Bulletin.StatusChoices.GENERATING])
+            .values_list('status').annotate(total=Count('id')).order_by()
+        )
+        queue.add_metric(['pending'], counts.get(Bulletin.StatusChoices.PENDING, 0))
+        queue.add_metric(['generating'], counts.get(Bulletin.StatusChoices.GENERATING, 0))
+        queue.add_metric(['stale'], Bulletin.objects.filter(is_stale=True).count())
+        yield queue
+
+    def _database_job_queue(self):
+        from core.models import DatabaseJob
+
+        jobs = GaugeMetricFamily('database_jobs', 'Queued and running backup/restore jobs', labels=['status'])
+        counts = dict(
+            DatabaseJob.objects.filter(status__in=[DatabaseJob.StatusChoices.PENDING, DatabaseJob.StatusChoices.RUNNING])
+            .values_list('status').annotate(total=Count('id')).order_by()
+        )
+        for status in (DatabaseJob.StatusChoices.PENDING, DatabaseJob.StatusChoices.RUNNING):
+            jobs.add_metric([status], counts.get(status, 0))
+        yield jobs
+
+
+class MultiProcessFilesCollector:
+    """Like prometheus_client's MultiProcessCollector, but merges the files of several directories so
+    processes outside gunicorn (the database job worker) are reported in the same series."""
+
+    def __init__(self, paths):
+        self.paths = paths
+
+    def collect(self):
+        files = []
+        for path in self.paths:
+            files.extend(glob.glob(os.path.join(path, '*.db')))
+        return MultiProcessCollector.merge(files, accumulate=True)
+
+
+def get_scrape_dirs():
+    paths = [os.environ.get('PROMETHEUS_MULTIPROC_DIR', '')]
+    paths.extend(getattr(settings, 'PROMETHEUS_SCRAPE_DIRS', []))
+    return [path for path in dict.fromkeys(paths) if path]
+
+
+class _ScrapeRegistry:
+    def __init__(self, *collectors):
+        self.collectors = collectors
+
+    def collect(self):
+        for collector in self.collectors:
+            yield from collector.collect()
+
+
+def render_metrics():
+    """Returns (body, content type) of the Prometheus text exposition for all workers."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = MultiProcessFilesCollector(get_scrape_dirs())
+    else:
+        registry = REGISTRY
+    return generate_latest(_ScrapeRegistry(registry, AppStateCollector())), CONTENT_TYPE_LATEST
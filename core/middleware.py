@@ -1,5 +1,9 @@
+import time
+from contextlib import ExitStack
 from threading import local
 
+from django.db import connections
+
 _thread_local = local()
 
 class RequestMiddleware:
@@ -15,4 +19,87 @@ class RequestMiddleware:
         return response
 
 def get_current_request():
-    return getattr(_thread_local, 'request', None)
\ No newline at end of file
+    return getattr(_thread_local, 'request', None)
+
+class RequestMetricsMiddleware:
+    """Records wall time, database queries, serializer time and response size of every request
+    and aggregates them per resolved view name (see RequestMetricsService). Request counts and
+    latencies are also exported to Prometheus (see core.metrics)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from django.conf import settings
+        from core.services.request_metrics_service import request_metrics_service
+
+        collect_table = request_metrics_service.enabled
+        collect_prometheus = getattr(settings, 'PROMETHEUS_METRICS_ENABLED', False)
+        if not collect_table and not collect_prometheus:
+            return self.get_response(request)
+
+        stats = request_metrics_service.start_request() if collect_table else None
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                if stats is not None:
+                    for connection in connections.all():
+                        stack.enter_context(connection.execute_wrapper(stats.query_wrapper))
+                response = self.get_response(request)
+        finally:
+            if stats is not None:
+                request_metrics_service.finish_request()
+        duration = time.perf_counter() - started
+
+        # Unresolved URLs (404s for unknown paths) are not recorded so scanners cannot flood the table.
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return response
+
+        if collect_prometheus:
+            from core import metrics
+            metrics.http_requests_total.labels(match.view_name, request.method, str(response.status_code)).inc()
+            metrics.http_request_duration_seconds.labels(match.view_name, request.method).observe(duration)
+
+        if stats is not None:
+            if response.streaming:
+                response_bytes = int(response.get('Content-Length') or 0)
+            else:
+                response_bytes = len(response.content)
+            request_metrics_service.record(
+                match.view_name,
+                request.method,
+                response.status_code,
+                stats,
+                duration,
+                response_bytes,
+            )
+            request_metrics_service.maybe_flush()
+        return response
+
+class QueryInspectorMiddleware:
+    """Fingerprints the SQL of a request and reports repeated (N+1) and slow queries with the code
+    location that issued them. Runs when QUERY_INSPECTOR_ENABLED is set, or for requests sending
+    `X-Inspect-Queries: 1` when QUERY_INSPECTOR_ALLOW_HEADER is set."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from core.services.query_inspector_service import query_inspector_service
+
+        if not query_inspector_service.is_enabled(request):
+            return self.get_response(request)
+
+        inspection = query_inspector_service.start()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(inspection.query_wrapper))
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        if match is not None:
+            issues = query_inspector_service.report(match.view_name, inspection)
+            response['X-Query-Count'] = str(inspection.query_count)
+            response['X-Query-Issues'] = str(len(issues))
+        return response
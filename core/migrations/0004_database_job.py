@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:32
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_alter_loggerservice_options_loggerservice_ip_address'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatabaseJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job_type', models.CharField(choices=[('backup', 'Backup'), ('restore', 'Restore')], max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20)),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('bytes_processed', models.BigIntegerField(default=0)),
+                ('duration_seconds', models.FloatField(blank=True, null=True)),
+                ('log_tail', models.TextField(blank=True, default='')),
+                ('error_message', models.TextField(blank=True, null=True)),
+                ('worker', models.CharField(blank=True, max_length=255, null=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='database_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Database Job',
+                'verbose_name_plural': 'Database Jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
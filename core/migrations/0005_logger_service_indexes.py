@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_database_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='loggerservice',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': 'Logger Service', 'verbose_name_plural': 'Logger Services'},
+        ),
+        migrations.AddIndex(
+            model_name='loggerservice',
+            index=models.Index(fields=['-created_at', '-id'], name='core_log_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loggerservice',
+            index=models.Index(fields=['action', '-created_at'], name='core_log_action_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loggerservice',
+            index=models.Index(fields=['table_name', '-created_at'], name='core_log_table_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loggerservice',
+            index=models.Index(fields=['level', '-created_at'], name='core_log_level_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loggerservice',
+            index=models.Index(fields=['user', '-created_at'], name='core_log_user_created_idx'),
+        ),
+    ]
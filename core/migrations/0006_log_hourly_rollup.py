@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_logger_service_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogHourlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField(help_text='Start of the hour')),
+                ('action', models.CharField(max_length=50)),
+                ('table_name', models.CharField(max_length=100)),
+                ('level', models.CharField(max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Log Hourly Rollup',
+                'verbose_name_plural': 'Log Hourly Rollups',
+                'ordering': ['-bucket'],
+                'constraints': [models.UniqueConstraint(fields=('bucket', 'action', 'table_name', 'level'), name='core_log_rollup_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:41
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_log_hourly_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='loggerservice',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('description', 'action', 'table_name', config='simple'), name='core_log_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loggerservice',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['description'], name='core_log_description_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
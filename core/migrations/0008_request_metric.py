@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_logger_service_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_start', models.DateTimeField()),
+                ('period_end', models.DateTimeField()),
+                ('view_name', models.CharField(max_length=255)),
+                ('method', models.CharField(max_length=10)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('error_count', models.PositiveIntegerField(default=0)),
+                ('duration_total_ms', models.FloatField(default=0)),
+                ('duration_max_ms', models.FloatField(default=0)),
+                ('db_queries_total', models.PositiveIntegerField(default=0)),
+                ('db_time_total_ms', models.FloatField(default=0)),
+                ('serializer_time_total_ms', models.FloatField(default=0)),
+                ('response_bytes_total', models.BigIntegerField(default=0)),
+                ('duration_histogram', models.JSONField(default=list, help_text='Request counts per duration bucket, see RequestMetricsService.BUCKET_BOUNDS_MS')),
+            ],
+            options={
+                'verbose_name': 'Request Metric',
+                'verbose_name_plural': 'Request Metrics',
+                'ordering': ['-period_start'],
+                'indexes': [models.Index(fields=['period_start'], name='core_reqmetric_period_idx'), models.Index(fields=['view_name', 'method', 'period_start'], name='core_reqmetric_view_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_request_metric'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueryOffender',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('n_plus_one', 'Repeated query (N+1)'), ('slow', 'Slow query')], max_length=20)),
+                ('fingerprint', models.CharField(max_length=40)),
+                ('view_name', models.CharField(max_length=255)),
+                ('sql', models.TextField(help_text='Normalized SQL with literals replaced by placeholders')),
+                ('location', models.CharField(blank=True, default='', max_length=500)),
+                ('stack', models.TextField(blank=True, default='')),
+                ('occurrences', models.PositiveIntegerField(default=0, help_text='Requests in which the query was flagged')),
+                ('total_queries', models.PositiveBigIntegerField(default=0)),
+                ('max_repeat', models.PositiveIntegerField(default=0, help_text='Most executions of the query in a single request')),
+                ('total_time_ms', models.FloatField(default=0)),
+                ('max_time_ms', models.FloatField(default=0)),
+                ('first_seen', models.DateTimeField(auto_now_add=True)),
+                ('last_seen', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Query Offender',
+                'verbose_name_plural': 'Query Offenders',
+                'ordering': ['-last_seen'],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'fingerprint', 'view_name'), name='core_query_offender_unique')],
+            },
+        ),
+    ]
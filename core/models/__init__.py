@@ -1,2 +1,6 @@
 from core.models.base_model import TimestampedModel
-from core.models.logger_service_model import LoggerService
\ No newline at end of file
+from core.models.logger_service_model import LoggerService
+from core.models.database_job_model import DatabaseJob
+from core.models.log_rollup_model import LogHourlyRollup
+from core.models.request_metric_model import RequestMetric
+from core.models.query_offender_model import QueryOffender
\ No newline at end of file
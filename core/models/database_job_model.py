@@ -0,0 +1,43 @@
+from django.db import models
+from django.utils import timezone
+from base.settings import AUTH_USER_MODEL
+from core.models.base_model import TimestampedModel
+
+class DatabaseJob(TimestampedModel):
+    LOG_TAIL_LINES = 50
+
+    class JobTypeChoices(models.TextChoices):
+        BACKUP = 'backup', 'Backup'
+        RESTORE = 'restore', 'Restore'
+
+    class StatusChoices(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+        FAILED = 'failed', 'Failed'
+
+    job_type = models.CharField(max_length=20, choices=JobTypeChoices.choices)
+    status = models.CharField(max_length=20, choices=StatusChoices.choices, default=StatusChoices.PENDING, db_index=True)
+    params = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    bytes_processed = models.BigIntegerField(default=0)
+    duration_seconds = models.FloatField(null=True, blank=True)
+    log_tail = models.TextField(blank=True, default='')
+    error_message = models.TextField(null=True, blank=True)
+    worker = models.CharField(max_length=255, null=True, blank=True)
+    created_by = models.ForeignKey(AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name='database_jobs')
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Database Job'
+        verbose_name_plural = 'Database Jobs'
+
+    def __str__(self):
+        return f"{self.get_job_type_display()} job #{self.pk} ({self.get_status_display()})"
+
+    def append_log(self, message):
+        lines = self.log_tail.splitlines() if self.log_tail else []
+        lines.append(f"[{timezone.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}")
+        self.log_tail = '\n'.join(lines[-self.LOG_TAIL_LINES:])
@@ -0,0 +1,20 @@
+from django.db import models
+
+class LogHourlyRollup(models.Model):
+    """Number of LoggerService rows per hour for each (action, table_name, level) combination."""
+    bucket = models.DateTimeField(help_text='Start of the hour')
+    action = models.CharField(max_length=50)
+    table_name = models.CharField(max_length=100)
+    level = models.CharField(max_length=20)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-bucket']
+        verbose_name = 'Log Hourly Rollup'
+        verbose_name_plural = 'Log Hourly Rollups'
+        constraints = [
+            models.UniqueConstraint(fields=['bucket', 'action', 'table_name', 'level'], name='core_log_rollup_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.bucket:%Y-%m-%d %H:00} {self.action}/{self.table_name}/{self.level}: {self.count}"
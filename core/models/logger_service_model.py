@@ -1,4 +1,6 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from base.settings import AUTH_USER_MODEL
 from core.models.base_model import TimestampedModel
 from core.middleware import get_current_request
@@ -14,8 +16,19 @@ class LoggerServiceManager(models.Manager):
                 else:
                     ip = request.META.get('REMOTE_ADDR')
                 kwargs['ip_address'] = ip
-        
-        return super().create(**kwargs)
+
+        entry = self.model(**kwargs)
+        if entry.user_id is None:
+            entry.user_id = 1
+
+        from core.services.audit_log_writer import audit_log_writer
+        if not audit_log_writer.enqueue(entry):
+            entry.save(force_insert=True, using=self.db)
+        return entry
+
+def log_search_vector():
+    """Full-text document of a log row. Queries must build it exactly like this to use the GIN index."""
+    return SearchVector('description', 'action', 'table_name', config='simple')
 
 class LoggerService(TimestampedModel):
     user = models.ForeignKey(AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
@@ -33,6 +46,15 @@ class LoggerService(TimestampedModel):
         super().save(*args, **kwargs)
         
     class Meta:
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
         verbose_name = 'Logger Service'
-        verbose_name_plural = 'Logger Services'
\ No newline at end of file
+        verbose_name_plural = 'Logger Services'
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='core_log_created_idx'),
+            models.Index(fields=['action', '-created_at'], name='core_log_action_created_idx'),
+            models.Index(fields=['table_name', '-created_at'], name='core_log_table_created_idx'),
+            models.Index(fields=['level', '-created_at'], name='core_log_level_created_idx'),
+            models.Index(fields=['user', '-created_at'], name='core_log_user_created_idx'),
+            GinIndex(log_search_vector(), name='core_log_search_idx'),
+            GinIndex(fields=['description'], name='core_log_description_trgm_idx', opclasses=['gin_trgm_ops']),
+        ]
\ No newline at end of file
@@ -0,0 +1,33 @@
+from django.db import models
+
+class QueryOffender(models.Model):
+    """A query shape flagged by the query inspector for one view: repeated per row (N+1) or slow."""
+
+    class KindChoices(models.TextChoices):
+        N_PLUS_ONE = 'n_plus_one', 'Repeated query (N+1)'
+        SLOW = 'slow', 'Slow query'
+
+    kind = models.CharField(max_length=20, choices=KindChoices.choices)
+    fingerprint = models.CharField(max_length=40)
+    view_name = models.CharField(max_length=255)
+    sql = models.TextField(help_text='Normalized SQL with literals replaced by placeholders')
+    location = models.CharField(max_length=500, blank=True, default='')
+    stack = models.TextField(blank=True, default='')
+    occurrences = models.PositiveIntegerField(default=0, help_text='Requests in which the query was flagged')
+    total_queries = models.PositiveBigIntegerField(default=0)
+    max_repeat = models.PositiveIntegerField(default=0, help_text='Most executions of the query in a single request')
+    total_time_ms = models.FloatField(default=0)
+    max_time_ms = models.FloatField(default=0)
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-last_seen']
+        verbose_name = 'Query Offender'
+        verbose_name_plural = 'Query Offenders'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'fingerprint', 'view_name'], name='core_query_offender_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} in {self.view_name} at {self.location}"
@@ -0,0 +1,29 @@
+from django.db import models
+
+class RequestMetric(models.Model):
+    """Aggregated timings of one endpoint (view name and method) over one flush period of one process."""
+    period_start = models.DateTimeField()
+    period_end = models.DateTimeField()
+    view_name = models.CharField(max_length=255)
+    method = models.CharField(max_length=10)
+    count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    duration_total_ms = models.FloatField(default=0)
+    duration_max_ms = models.FloatField(default=0)
+    db_queries_total = models.PositiveIntegerField(default=0)
+    db_time_total_ms = models.FloatField(default=0)
+    serializer_time_total_ms = models.FloatField(default=0)
+    response_bytes_total = models.BigIntegerField(default=0)
+    duration_histogram = models.JSONField(default=list, help_text='Request counts per duration bucket, see RequestMetricsService.BUCKET_BOUNDS_MS')
+
+    class Meta:
+        ordering = ['-period_start']
+        verbose_name = 'Request Metric'
+        verbose_name_plural = 'Request Metrics'
+        indexes = [
+            models.Index(fields=['period_start'], name='core_reqmetric_period_idx'),
+            models.Index(fields=['view_name', 'method', 'period_start'], name='core_reqmetric_view_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.method} {self.view_name} @ {self.period_start:%Y-%m-%d %H:%M}: {self.count} requests"
@@ -1,6 +1,10 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+import base64
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
 from django.core.paginator import InvalidPage
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
 from rest_framework.exceptions import NotFound
 
 class CustomPagination(PageNumberPagination):
@@ -46,4 +50,64 @@ class CustomPagination(PageNumberPagination):
             self.display_page_controls = True
 
         self.request = request
-        return list(self.page)
\ No newline at end of file
+        return list(self.page)
+
+
+class KeysetPagination(BasePagination):
+    """Newest-first keyset pagination on (created_at, id).
+
+    Each page is read with `WHERE (created_at, id) < (cursor)` plus LIMIT, so a deep page costs the
+    same as the first one and no COUNT(*) is run. The opaque `cursor` returned as `next_cursor`
+    points at the last row of the current page.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 200
+    max_page_size = 200
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def encode_cursor(self, instance):
+        raw = json.dumps([instance.created_at.isoformat(), instance.pk]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound('Invalid cursor')
+        if created_at is None:
+            raise NotFound('Invalid cursor')
+        return created_at, pk
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        queryset = queryset.order_by('-created_at', '-id')
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            created_at, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+        # One extra row tells whether there is a next page without counting.
+        rows = list(queryset[:self.page_size_value + 1])
+        self.has_next = len(rows) > self.page_size_value
+        self.page = rows[:self.page_size_value]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'items': data,
+            'page_size': self.page_size_value,
+            'next_cursor': self.encode_cursor(self.page[-1]) if self.has_next else None,
+            'has_next': self.has_next,
+        })
@@ -1 +1,2 @@
-from core.serializers.logger_service_serializer import LoggerServiceSerializer
\ No newline at end of file
+from core.serializers.logger_service_serializer import LoggerServiceSerializer
+from core.serializers.database_job_serializer import DatabaseJobSerializer
\ No newline at end of file
@@ -0,0 +1,32 @@
+from rest_framework import serializers
+from core.models import DatabaseJob
+from drf_spectacular.utils import extend_schema_field, OpenApiTypes
+
+class DatabaseJobSerializer(serializers.ModelSerializer):
+    created_by_email = serializers.SerializerMethodField(read_only=True)
+
+    @extend_schema_field(OpenApiTypes.STR)
+    def get_created_by_email(self, obj):
+        return obj.created_by.email if obj.created_by else None
+
+    class Meta:
+        model = DatabaseJob
+        fields = [
+            'id',
+            'job_type',
+            'status',
+            'params',
+            'result',
+            'bytes_processed',
+            'duration_seconds',
+            'log_tail',
+            'error_message',
+            'worker',
+            'created_by',
+            'created_by_email',
+            'started_at',
+            'finished_at',
+            'created_at',
+            'updated_at'
+        ]
+        read_only_fields = fields
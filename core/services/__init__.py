@@ -0,0 +1,2 @@
+from core.services.backup_service import database_backup_service, BackupError
+from core.services.database_job_service import database_job_service
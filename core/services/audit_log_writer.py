@@ -0,0 +1,123 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLogWriter:
+    """Buffers LoggerService rows in-process and writes them with bulk_create from a
+    background thread, either when a batch fills up or after the flush interval."""
+
+    def __init__(self):
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._atexit_registered = False
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'AUDIT_LOG_BUFFERED', False)
+
+    @property
+    def batch_size(self):
+        return getattr(settings, 'AUDIT_LOG_BATCH_SIZE', 100)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, 'AUDIT_LOG_FLUSH_INTERVAL', 2.0)
+
+    def enqueue(self, entry):
+        """Queues an unsaved LoggerService instance. Returns False when the caller must write it synchronously."""
+        # Inside a transaction the row must commit or roll back with it, and may reference rows
+        # the writer thread cannot see yet.
+        if not self.enabled or connection.in_atomic_block:
+            return False
+        try:
+            self._ensure_started()
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            return False
+        except RuntimeError:
+            logger.exception('Could not start the audit log writer thread')
+            return False
+        return True
+
+    def _ensure_started(self):
+        if self._is_running():
+            return
+        with self._start_lock:
+            if self._is_running():
+                return
+            # A forked worker inherits the queue object but not the thread; start over in this process.
+            self._queue = queue.Queue(maxsize=getattr(settings, 'AUDIT_LOG_MAX_QUEUE_SIZE', 10000))
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.flush)
+                self._atexit_registered = True
+
+    def _is_running(self):
+        return self._thread is not None and self._pid == os.getpid() and self._thread.is_alive()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write(self, batch):
+        from core.models import LoggerService
+
+        with self._write_lock:
+            close_old_connections()
+            try:
+                LoggerService.objects.bulk_create(batch)
+            except Exception:
+                logger.exception('Bulk write of %s audit log entries failed, retrying one by one', len(batch))
+                for entry in batch:
+                    try:
+                        entry.save(force_insert=True)
+                    except Exception:
+                        logger.exception('Dropping audit log entry: %s %s', entry.action, entry.description)
+
+    def flush(self, timeout=10.0):
+        """Writes everything still queued from the calling thread and waits for the batch the
+        writer thread may be holding. Runs at interpreter exit."""
+        if self._queue is None or self._pid != os.getpid():
+            return
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and self._thread.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+audit_log_writer = AuditLogWriter()
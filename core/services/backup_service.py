@@ -0,0 +1,405 @@
+import os
+import time
+import uuid
+import zlib
+import shutil
+import tarfile
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+from django.conf import settings
+
+from core import metrics
+from core.models import DatabaseJob
+from core.services.backup_storage import get_backup_storage
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class BackupError(Exception):
+    pass
+
+
+class DatabaseBackupService:
+    CHUNK_SIZE = 1024 * 1024
+    COMPRESSION_EXTENSIONS = {
+        'gzip': '.gz',
+        'zstd': '.zst',
+        'none': '',
+    }
+    FORMAT_EXTENSIONS = {
+        'plain': '.sql',
+        'custom': '.dump',
+        'directory': '.tar',
+    }
+    BACKUP_EXTENSIONS = ('.sql', '.sql.gz', '.sql.zst', '.dump', '.tar')
+
+    @property
+    def storage(self):
+        return get_backup_storage()
+
+    def _get_db_settings(self):
+        db_settings = settings.DATABASES['default']
+        return {
+            'name': db_settings['NAME'],
+            'user': db_settings['USER'],
+            'password': db_settings['PASSWORD'],
+            'host': db_settings['HOST'],
+            'port': db_settings['PORT'],
+        }
+
+    def _get_env(self, db_settings):
+        env = os.environ.copy()
+        if db_settings['password']:
+            env['PGPASSWORD'] = db_settings['password']
+        return env
+
+    def _get_connection_string(self, db_settings):
+        return f"postgresql://{db_settings['user']}:{db_settings['password']}@{db_settings['host']}:{db_settings['port']}/{db_settings['name']}?sslmode=require"
+
+    def find_pg_binary(self, binary_name):
+        pg_binary = shutil.which(binary_name)
+        if pg_binary:
+            return pg_binary
+
+        if platform.system() == 'Windows':
+            possible_paths = []
+            for version in range(10, 21):
+                possible_paths.append(f"C:\\Program Files\\PostgreSQL\\{version}\\bin\\{binary_name}.exe")
+            for major in range(10, 21):
+                for minor in range(0, 11):
+                    possible_paths.append(f"C:\\Program Files\\PostgreSQL\\{major}.{minor}\\bin\\{binary_name}.exe")
+            possible_paths.extend([
+                f"C:\\Program Files\\PostgreSQL\\bin\\{binary_name}.exe",
+                f"C:\\PostgreSQL\\bin\\{binary_name}.exe",
+                f"C:\\Program Files (x86)\\PostgreSQL\\bin\\{binary_name}.exe",
+                f"C:\\Program Files\\EnterpriseDB\\PostgreSQL\\bin\\{binary_name}.exe"
+            ])
+            for path in possible_paths:
+                if os.path.isfile(path):
+                    return path
+            return None
+        else:
+            return None
+
+    def is_backup_filename(self, filename):
+        return bool(filename) and '/' not in filename and filename.endswith(self.BACKUP_EXTENSIONS)
+
+    def _get_compressor(self, compression):
+        if compression == 'gzip':
+            return zlib.compressobj(6, zlib.DEFLATED, 31)
+        if compression == 'zstd':
+            if zstandard is None:
+                raise BackupError("zstd compression requires the 'zstandard' package")
+            return zstandard.ZstdCompressor(level=3, threads=-1).compressobj()
+        if compression == 'none':
+            return None
+        raise BackupError(f"Unsupported compression: {compression}. Use one of: {', '.join(self.COMPRESSION_EXTENSIONS)}")
+
+    def _get_decompressor(self, filename):
+        if filename.endswith('.gz'):
+            return zlib.decompressobj(31)
+        if filename.endswith('.zst'):
+            if zstandard is None:
+                raise BackupError("Restoring a zstd backup requires the 'zstandard' package")
+            return zstandard.ZstdDecompressor().decompressobj()
+        return None
+
+    def _read_chunks(self, fileobj):
+        return iter(lambda: fileobj.read(self.CHUNK_SIZE), b'')
+
+    def _iter_sql_chunks(self, fileobj, filename):
+        decompressor = self._get_decompressor(filename)
+        for chunk in self._read_chunks(fileobj):
+            data = decompressor.decompress(chunk) if decompressor else chunk
+            if data:
+                yield data
+        flush = getattr(decompressor, 'flush', None)
+        if flush:
+            data = flush()
+            if data:
+                yield data
+
+    def _read_stderr(self, stderr_file):
+        stderr_file.seek(0)
+        return stderr_file.read().decode('utf-8', errors='replace')[-4000:]
+
+    def _new_backup_filename(self, backup_format, compression):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        extension = self.FORMAT_EXTENSIONS[backup_format]
+        if backup_format == 'plain':
+            extension += self.COMPRESSION_EXTENSIONS[compression]
+        return f"backup_{timestamp}_{uuid.uuid4().hex[:8]}{extension}"
+
+    def get_backup_format(self, filename):
+        """Reads the format recorded in the backup metadata, falling back to the file
+        extension for backups created before formats were recorded."""
+        backup_format = self.storage.get_metadata(filename).get('format')
+        if backup_format in self.FORMAT_EXTENSIONS:
+            return backup_format
+        if filename.endswith('.dump'):
+            return 'custom'
+        if filename.endswith('.tar'):
+            return 'directory'
+        return 'plain'
+
+    def _get_jobs(self, jobs):
+        return max(1, int(jobs or settings.BACKUP_PARALLEL_JOBS))
+
+    def list_backups(self):
+        backups = [backup for backup in self.storage.list() if self.is_backup_filename(backup['filename'])]
+        return sorted(backups, key=lambda backup: backup['last_modified'], reverse=True)
+
+    @metrics.track(metrics.database_operations_total, metrics.database_operation_duration_seconds, operation='backup')
+    def create_backup(self, compression=None, backup_format='plain', jobs=None, on_progress=None):
+        """Dumps the database into the backup storage.
+
+        plain: pg_dump stdout is compressed on the fly and streamed to storage.
+        custom: pg_dump's own compressed archive is streamed to storage as is.
+        directory: pg_dump runs with --jobs into a temporary directory that is streamed to storage as a tar.
+
+        on_progress, when given, is called with the number of bytes dumped so far.
+        """
+        if backup_format not in self.FORMAT_EXTENSIONS:
+            raise BackupError(f"Unsupported backup format: {backup_format}. Use one of: {', '.join(self.FORMAT_EXTENSIONS)}")
+        compression = (compression or settings.BACKUP_COMPRESSION) if backup_format == 'plain' else 'none'
+        compressor = self._get_compressor(compression)
+
+        pg_dump_path = self.find_pg_binary('pg_dump')
+        if not pg_dump_path:
+            raise BackupError('PostgreSQL pg_dump utility not found')
+
+        db_settings = self._get_db_settings()
+        cmd = [
+            pg_dump_path,
+            '-d', self._get_connection_string(db_settings),
+            f'--format={backup_format}',
+            '--no-owner',
+            '--no-acl',
+            # Job rows describe this server's queue; restoring them would resurrect pending jobs.
+            f'--exclude-table-data={DatabaseJob._meta.db_table}'
+        ]
+
+        filename = self._new_backup_filename(backup_format, compression)
+        metadata = {'format': backup_format, 'compression': compression}
+        started = time.monotonic()
+
+        storage = self.storage
+        writer = storage.open_write(filename, metadata=metadata)
+        try:
+            if backup_format == 'directory':
+                raw_bytes = self._dump_directory(cmd, db_settings, writer, self._get_jobs(jobs), on_progress)
+            else:
+                raw_bytes = self._dump_stream(cmd, db_settings, writer, compressor, on_progress)
+            writer.close()
+        except BaseException:
+            writer.abort()
+            raise
+
+        metrics.database_operation_bytes_total.labels('backup').inc(raw_bytes)
+        return {
+            'filename': filename,
+            'format': backup_format,
+            'compression': compression,
+            'size_bytes': storage.size(filename),
+            'raw_bytes': raw_bytes,
+            'duration_seconds': round(time.monotonic() - started, 2),
+        }
+
+    def _dump_stream(self, cmd, db_settings, writer, compressor, on_progress=None):
+        raw_bytes = 0
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(cmd, env=self._get_env(db_settings), stdout=subprocess.PIPE, stderr=stderr_file)
+            try:
+                for chunk in self._read_chunks(process.stdout):
+                    raw_bytes += len(chunk)
+                    data = compressor.compress(chunk) if compressor else chunk
+                    if data:
+                        writer.write(data)
+                    if on_progress:
+                        on_progress(raw_bytes)
+                if compressor:
+                    writer.write(compressor.flush())
+
+                if process.wait() != 0:
+                    raise BackupError(f"pg_dump failed: {self._read_stderr(stderr_file)}")
+            except BaseException:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+                raise
+            finally:
+                process.stdout.close()
+        return raw_bytes
+
+    def _dump_directory(self, cmd, db_settings, writer, jobs, on_progress=None):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dump_dir = os.path.join(temp_dir, 'dump')
+            process = subprocess.run(
+                cmd + ['--jobs', str(jobs), '--file', dump_dir],
+                env=self._get_env(db_settings),
+                capture_output=True,
+                text=True,
+                check=False
+            )
+            if process.returncode != 0:
+                raise BackupError(f"pg_dump failed: {process.stderr[-4000:]}")
+
+            raw_bytes = sum(entry.stat().st_size for entry in os.scandir(dump_dir) if entry.is_file())
+            if on_progress:
+                on_progress(raw_bytes)
+            with tarfile.open(fileobj=writer, mode='w|') as archive:
+                archive.add(dump_dir, arcname='dump')
+        return raw_bytes
+
+    def _run_psql(self, sql_chunks, on_progress=None):
+        psql_path = self.find_pg_binary('psql')
+        if not psql_path:
+            raise BackupError('PostgreSQL psql utility not found')
+
+        db_settings = self._get_db_settings()
+        cmd = [
+            psql_path,
+            '-d', self._get_connection_string(db_settings),
+            '-f', '-',
+            '--single-transaction'
+        ]
+
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(
+                cmd,
+                env=self._get_env(db_settings),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=stderr_file
+            )
+            try:
+                processed = 0
+                for chunk in sql_chunks:
+                    process.stdin.write(chunk)
+                    processed += len(chunk)
+                    if on_progress:
+                        on_progress(processed)
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+            except BaseException:
+                process.kill()
+                process.wait()
+                raise
+
+            if process.wait() != 0:
+                raise BackupError(f"psql restore failed: {self._read_stderr(stderr_file)}")
+        return processed
+
+    def _run_pg_restore(self, filename, backup_format, jobs, on_progress=None):
+        pg_restore_path = self.find_pg_binary('pg_restore')
+        if not pg_restore_path:
+            raise BackupError('PostgreSQL pg_restore utility not found')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Parallel restore needs a seekable archive, so the backup is staged on local disk first.
+            source = self.storage.open_read(filename)
+            try:
+                if backup_format == 'custom':
+                    target = os.path.join(temp_dir, 'backup.dump')
+                    processed = 0
+                    with open(target, 'wb') as target_file:
+                        for chunk in self._read_chunks(source):
+                            target_file.write(chunk)
+                            processed += len(chunk)
+                            if on_progress:
+                                on_progress(processed)
+                else:
+                    target = os.path.join(temp_dir, 'dump')
+                    with tarfile.open(fileobj=source, mode='r|') as archive:
+                        archive.extractall(temp_dir, filter='data')
+                    processed = sum(
+                        os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(target) for name in names
+                    )
+            finally:
+                source.close()
+
+            db_settings = self._get_db_settings()
+            process = subprocess.run(
+                [
+                    pg_restore_path,
+                    '-d', self._get_connection_string(db_settings),
+                    '--jobs', str(jobs),
+                    '--no-owner',
+                    '--no-acl',
+                    '--clean',
+                    '--if-exists',
+                    target
+                ],
+                env=self._get_env(db_settings),
+                capture_output=True,
+                text=True,
+                check=False
+            )
+            if process.returncode != 0:
+                raise BackupError(f"pg_restore failed: {process.stderr[-4000:]}")
+        return processed
+
+    @metrics.track(metrics.database_operations_total, metrics.database_operation_duration_seconds, operation='restore')
+    def restore_backup(self, filename, jobs=None, on_progress=None):
+        """Restores a stored backup with the tool matching its recorded format: plain dumps are
+        decompressed on the fly into psql, custom and directory archives go through pg_restore --jobs."""
+        if not self.is_backup_filename(filename):
+            raise BackupError(f"Invalid backup file name: {filename}")
+
+        started = time.monotonic()
+        backup_format = self.get_backup_format(filename)
+        jobs = self._get_jobs(jobs) if backup_format != 'plain' else 1
+        if backup_format == 'plain':
+            source = self.storage.open_read(filename)
+            try:
+                bytes_read = self._run_psql(self._iter_sql_chunks(source, filename), on_progress)
+            finally:
+                source.close()
+        else:
+            bytes_read = self._run_pg_restore(filename, backup_format, jobs, on_progress)
+        metrics.database_operation_bytes_total.labels('restore').inc(bytes_read)
+
+        return {
+            'filename': filename,
+            'format': backup_format,
+            'jobs': jobs,
+            'bytes_read': bytes_read,
+            'duration_seconds': round(time.monotonic() - started, 2),
+        }
+
+    def store_uploaded_backup(self, uploaded_file):
+        """Streams an uploaded backup into the backup storage so a restore job can pick it up.
+        Returns the stored file name."""
+        if not self.is_backup_filename(uploaded_file.name):
+            raise BackupError(f"Invalid backup file format. Must be one of: {', '.join(self.BACKUP_EXTENSIONS)}")
+
+        if uploaded_file.name.endswith('.dump'):
+            backup_format, compression = 'custom', 'none'
+        elif uploaded_file.name.endswith('.tar'):
+            backup_format, compression = 'directory', 'none'
+        else:
+            backup_format = 'plain'
+            compression = next(
+                (name for name, extension in self.COMPRESSION_EXTENSIONS.items() if extension and uploaded_file.name.endswith(extension)),
+                'none'
+            )
+
+        filename = self._new_backup_filename(backup_format, compression)
+        writer = self.storage.open_write(filename, metadata={'format': backup_format, 'compression': compression, 'source': 'upload'})
+        try:
+            for chunk in self._read_chunks(uploaded_file):
+                writer.write(chunk)
+            writer.close()
+        except BaseException:
+            writer.abort()
+            raise
+        return filename
+
+database_backup_service = DatabaseBackupService()
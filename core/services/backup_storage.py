@@ -0,0 +1,231 @@
+import os
+import json
+import boto3
+from datetime import datetime, timezone
+
+from django.conf import settings
+from base.storage import PrivateFileSystemStorage
+
+
+class S3MultipartWriter:
+    """File-like writer that uploads to S3 in fixed-size parts, so only one part is held in memory."""
+
+    def __init__(self, client, bucket, key, part_size, metadata=None):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.metadata = {name: str(value) for name, value in (metadata or {}).items()}
+        self._buffer = bytearray()
+        self._parts = []
+        self._upload_id = None
+
+    def write(self, data):
+        self._buffer.extend(data)
+        while len(self._buffer) >= self.part_size:
+            self._upload_part(bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+        return len(data)
+
+    def _upload_part(self, data):
+        if self._upload_id is None:
+            self._upload_id = self.client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, Metadata=self.metadata
+            )['UploadId']
+        part_number = len(self._parts) + 1
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=data
+        )
+        self._parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+
+    def close(self):
+        if self._upload_id is None:
+            self.client.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer), Metadata=self.metadata)
+        else:
+            if self._buffer:
+                self._upload_part(bytes(self._buffer))
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={'Parts': self._parts}
+            )
+        self._buffer = bytearray()
+
+    def abort(self):
+        if self._upload_id is not None:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self._upload_id)
+        self._buffer = bytearray()
+
+
+class S3BackupStorage:
+    part_size = 8 * 1024 * 1024
+
+    def __init__(self, location='database_backups'):
+        self.prefix = f"{location}/"
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = boto3.client(
+                's3',
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                region_name=settings.AWS_S3_REGION_NAME
+            )
+        return self._client
+
+    @property
+    def bucket(self):
+        return settings.AWS_STORAGE_BUCKET_NAME
+
+    def _key(self, filename):
+        return f"{self.prefix}{filename}"
+
+    def list(self):
+        backups = []
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for obj in page.get('Contents', []):
+                filename = obj['Key'][len(self.prefix):]
+                if filename:
+                    backups.append({'filename': filename, 'size': obj['Size'], 'last_modified': obj['LastModified']})
+        return backups
+
+    def exists(self, filename):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(filename))
+        except Exception:
+            return False
+        return True
+
+    def size(self, filename):
+        return self.client.head_object(Bucket=self.bucket, Key=self._key(filename))['ContentLength']
+
+    def get_metadata(self, filename):
+        return self.client.head_object(Bucket=self.bucket, Key=self._key(filename)).get('Metadata', {})
+
+    def delete(self, filename):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(filename))
+
+    def open_read(self, filename, start=None, end=None):
+        params = {'Bucket': self.bucket, 'Key': self._key(filename)}
+        if start is not None:
+            params['Range'] = f"bytes={start}-{'' if end is None else end}"
+        return self.client.get_object(**params)['Body']
+
+    def open_write(self, filename, metadata=None):
+        return S3MultipartWriter(self.client, self.bucket, self._key(filename), self.part_size, metadata=metadata)
+
+    def download_url(self, filename, expire):
+        return self.client.generate_presigned_url(
+            'get_object',
+            Params={
+                'Bucket': self.bucket,
+                'Key': self._key(filename),
+                'ResponseContentDisposition': f'attachment; filename="{filename}"',
+            },
+            ExpiresIn=expire
+        )
+
+
+def _metadata_path(path):
+    return os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.json")
+
+
+class _LocalFileWriter:
+    """Writes to a hidden temporary file and renames it into place on close.
+    Metadata is kept in a hidden JSON sidecar next to the backup."""
+
+    def __init__(self, path, metadata=None):
+        self.path = path
+        self.metadata = {name: str(value) for name, value in (metadata or {}).items()}
+        self._temp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.part")
+        self._file = open(self._temp_path, 'wb')
+
+    def write(self, data):
+        return self._file.write(data)
+
+    def close(self):
+        self._file.close()
+        if self.metadata:
+            with open(_metadata_path(self.path), 'w') as metadata_file:
+                json.dump(self.metadata, metadata_file)
+        os.replace(self._temp_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        if os.path.exists(self._temp_path):
+            os.unlink(self._temp_path)
+
+
+class LocalBackupStorage:
+    """Keeps backups in a local directory, for deployments and tests without S3."""
+
+    def __init__(self, location='database_backups'):
+        self.storage = PrivateFileSystemStorage(custom_path=location)
+
+    def _path(self, filename):
+        return self.storage.path(filename)
+
+    def list(self):
+        if not os.path.isdir(self.storage.location):
+            return []
+        backups = []
+        with os.scandir(self.storage.location) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith('.'):
+                    stat = entry.stat()
+                    backups.append({
+                        'filename': entry.name,
+                        'size': stat.st_size,
+                        'last_modified': datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+                    })
+        return backups
+
+    def exists(self, filename):
+        return os.path.isfile(self._path(filename))
+
+    def size(self, filename):
+        return os.path.getsize(self._path(filename))
+
+    def get_metadata(self, filename):
+        metadata_path = _metadata_path(self._path(filename))
+        if not os.path.isfile(metadata_path):
+            return {}
+        with open(metadata_path) as metadata_file:
+            return json.load(metadata_file)
+
+    def delete(self, filename):
+        path = self._path(filename)
+        os.unlink(path)
+        if os.path.isfile(_metadata_path(path)):
+            os.unlink(_metadata_path(path))
+
+    def open_read(self, filename, start=None, end=None):
+        source = open(self._path(filename), 'rb')
+        if start:
+            source.seek(start)
+        return source
+
+    def open_write(self, filename, metadata=None):
+        os.makedirs(self.storage.location, exist_ok=True)
+        return _LocalFileWriter(self._path(filename), metadata=metadata)
+
+    def download_url(self, filename, expire):
+        return self.storage.signed_url(filename, expire=expire, filename=filename)
+
+
+def get_backup_storage(location='database_backups'):
+    """Returns the configured backend for files under `location` (database backups, log archives)."""
+    backend = getattr(settings, 'BACKUP_STORAGE_BACKEND', None) or ('s3' if settings.USE_S3 else 'local')
+    if backend == 's3':
+        return S3BackupStorage(location)
+    if backend == 'local':
+        return LocalBackupStorage(location)
+    raise ValueError(f"Unknown backup storage backend: {backend}")
@@ -0,0 +1,163 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+
+import django
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+class QueryCounter:
+    """Execute wrapper counting queries; unlike CaptureQueriesContext it keeps no SQL, so it has no cap."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class BenchmarkService:
+    """Times benchmark cases and renders reports that can be compared between commits.
+
+    A case is a callable run `warmup` times untimed, then `iterations` times while its wall time
+    and the queries on the default connection are recorded. A failing case is reported with its
+    error instead of aborting the run. Reports are JSON; the markdown rendering puts the median,
+    p95 and query count of every case in one table, with the change against a baseline report.
+    """
+    REPORT_VERSION = 1
+
+    def measure(self, name, group, func, iterations=5, warmup=1):
+        if iterations < 1:
+            raise BenchmarkError(f"{name}: a case needs at least one timed iteration")
+        durations = []
+        query_counts = []
+        try:
+            for _ in range(warmup):
+                func()
+            for _ in range(iterations):
+                counter = QueryCounter()
+                with connection.execute_wrapper(counter):
+                    started = time.perf_counter()
+                    func()
+                    durations.append((time.perf_counter() - started) * 1000)
+                query_counts.append(counter.count)
+        except Exception as error:
+            return {'name': name, 'group': group, 'iterations': len(durations), 'error': f"{type(error).__name__}: {error}"}
+
+        ordered = sorted(durations)
+        return {
+            'name': name,
+            'group': group,
+            'iterations': iterations,
+            'median_ms': round(statistics.median(ordered), 2),
+            'p95_ms': round(self.percentile(ordered, 95), 2),
+            'min_ms': round(ordered[0], 2),
+            'max_ms': round(ordered[-1], 2),
+            'mean_ms': round(statistics.fmean(ordered), 2),
+            'queries': int(statistics.median(query_counts)),
+        }
+
+    def percentile(self, ordered, percentile):
+        """Nearest-rank percentile of an already sorted list."""
+        rank = max(1, -(-len(ordered) * percentile // 100))
+        return ordered[int(rank) - 1]
+
+    def git_commit(self):
+        try:
+            result = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, timeout=5, check=True
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return result.stdout.strip() or None
+
+    def build_report(self, cases, dataset, options, generation=None):
+        return {
+            'version': self.REPORT_VERSION,
+            'created_at': timezone.now().isoformat(),
+            'commit': self.git_commit(),
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'machine': platform.machine(),
+            },
+            'dataset': dataset,
+            'generation': generation,
+            'options': options,
+            'cases': cases,
+        }
+
+    def load_report(self, path):
+        with open(path, encoding='utf-8') as report_file:
+            report = json.load(report_file)
+        if report.get('version') != self.REPORT_VERSION or 'cases' not in report:
+            raise BenchmarkError(f"{path} is not a benchmark report of version {self.REPORT_VERSION}")
+        return report
+
+    def write_report(self, report, path):
+        with open(path, 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=2)
+            report_file.write('\n')
+
+    def _change(self, current, previous):
+        if current is None or not previous:
+            return ''
+        return f"{(current - previous) / previous * 100:+.1f}%"
+
+    def render_markdown(self, report, baseline=None):
+        lines = [
+            f"# Benchmark {report.get('commit') or 'unknown commit'}",
+            '',
+            f"- Date: {report['created_at']}",
+            f"- Environment: Python {report['environment']['python']}, Django {report['environment']['django']}, "
+            f"{report['environment']['database']}",
+            '- Dataset: ' + ', '.join(f"{count} {name}" for name, count in report['dataset'].items()),
+        ]
+        if report.get('generation'):
+            lines.append(f"- Generated in {report['generation']['seconds']}s")
+        if baseline:
+            lines.append(f"- Baseline: {baseline.get('commit') or 'unknown commit'} ({baseline['created_at']})")
+        lines.extend(['', 'Times are wall-clock milliseconds per call; queries are counted on the main connection.', ''])
+
+        header = '| Group | Case | Median ms | p95 ms | Min ms | Queries |'
+        rule = '|---|---|---:|---:|---:|---:|'
+        previous_cases = {}
+        if baseline:
+            header += ' Baseline median ms | Change | Baseline queries |'
+            rule += '---:|---:|---:|'
+            previous_cases = {case['name']: case for case in baseline['cases']}
+        lines.extend([header, rule])
+
+        for case in report['cases']:
+            if 'error' in case:
+                row = f"| {case['group']} | {case['name']} | error: {case['error'][:80]} | | | |"
+                if baseline:
+                    row += ' | | |'
+                lines.append(row)
+                continue
+            row = (
+                f"| {case['group']} | {case['name']} | {case['median_ms']:.1f} | {case['p95_ms']:.1f} | "
+                f"{case['min_ms']:.1f} | {case['queries']} |"
+            )
+            if baseline:
+                previous = previous_cases.get(case['name'], {})
+                previous_median = previous.get('median_ms')
+                row += (
+                    f" {'' if previous_median is None else f'{previous_median:.1f}'} | "
+                    f"{self._change(case['median_ms'], previous_median)} | {previous.get('queries', '')} |"
+                )
+            lines.append(row)
+        return '\n'.join(lines) + '\n'
+
+benchmark_service = BenchmarkService()
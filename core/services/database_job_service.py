@@ -0,0 +1,211 @@
+import os
+import time
+import socket
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.color import no_style
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction, IntegrityError
+from django.utils import timezone
+
+from core.models import DatabaseJob, LoggerService
+from core.services.backup_service import database_backup_service
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseJobService:
+    """Queue of backup and restore jobs run by the run_database_jobs worker.
+
+    While a job runs, the worker touches its updated_at every DATABASE_JOB_HEARTBEAT_SECONDS.
+    A RUNNING job without a heartbeat for DATABASE_JOB_STALE_SECONDS lost its worker (OOM kill,
+    container restart) and is marked failed; it is not retried, since a half-applied restore
+    must not be replayed unattended.
+    """
+    PROGRESS_INTERVAL_SECONDS = 2.0
+
+    def enqueue_backup(self, user, compression=None, backup_format='plain', jobs=None):
+        job = DatabaseJob(
+            job_type=DatabaseJob.JobTypeChoices.BACKUP,
+            params={'compression': compression, 'backup_format': backup_format, 'jobs': jobs},
+            created_by=user,
+        )
+        job.append_log(f"Backup queued (format={backup_format}, compression={compression or 'default'})")
+        job.save()
+        return job
+
+    def enqueue_restore(self, user, filename, jobs=None):
+        job = DatabaseJob(
+            job_type=DatabaseJob.JobTypeChoices.RESTORE,
+            params={'filename': filename, 'jobs': jobs},
+            created_by=user,
+        )
+        job.append_log(f"Restore queued from {filename}")
+        job.save()
+        return job
+
+    def fail_stale_jobs(self):
+        """Marks RUNNING jobs whose worker stopped sending heartbeats as failed. Returns how many."""
+        cutoff = timezone.now() - timedelta(seconds=settings.DATABASE_JOB_STALE_SECONDS)
+        failed = 0
+        with transaction.atomic():
+            stale_jobs = DatabaseJob.objects.select_for_update(skip_locked=True).filter(
+                status=DatabaseJob.StatusChoices.RUNNING, updated_at__lt=cutoff
+            )
+            for job in stale_jobs:
+                message = f"Worker {job.worker} stopped responding; no heartbeat since {job.updated_at:%Y-%m-%d %H:%M:%S}"
+                job.status = DatabaseJob.StatusChoices.FAILED
+                job.error_message = message
+                job.append_log(f"Failed: {message}")
+                job.finished_at = timezone.now()
+                job.save()
+                failed += 1
+        return failed
+
+    def claim_next_job(self, worker_name=None):
+        worker_name = worker_name or f"{socket.gethostname()}:{os.getpid()}"
+        self.fail_stale_jobs()
+        with transaction.atomic():
+            job = (
+                DatabaseJob.objects.select_for_update(skip_locked=True)
+                .filter(status=DatabaseJob.StatusChoices.PENDING)
+                .order_by('created_at')
+                .first()
+            )
+            if job is None:
+                return None
+            job.status = DatabaseJob.StatusChoices.RUNNING
+            job.worker = worker_name
+            job.started_at = timezone.now()
+            job.append_log(f"Started by worker {worker_name}")
+            job.save()
+        return job
+
+    def _progress_reporter(self, job):
+        last_report = time.monotonic()
+
+        def report(bytes_processed):
+            nonlocal last_report
+            job.bytes_processed = bytes_processed
+            now = time.monotonic()
+            if now - last_report >= self.PROGRESS_INTERVAL_SECONDS:
+                last_report = now
+                DatabaseJob.objects.filter(pk=job.pk).update(bytes_processed=bytes_processed, updated_at=timezone.now())
+
+        return report
+
+    def _send_heartbeats(self, job_id, stop):
+        try:
+            while not stop.wait(settings.DATABASE_JOB_HEARTBEAT_SECONDS):
+                try:
+                    DatabaseJob.objects.filter(pk=job_id, status=DatabaseJob.StatusChoices.RUNNING).update(updated_at=timezone.now())
+                except Exception:
+                    # The table may be locked or recreated by the restore this job runs; try again later.
+                    pass
+        finally:
+            connection.close()
+
+    def _after_restore(self, job):
+        """pg_restore --clean recreated this table from the backup. Jobs the backup recorded as
+        pending or running never ran against the restored data, so they are failed rather than
+        picked up again. The job itself is saved again when it finishes."""
+        inherited = DatabaseJob.objects.filter(
+            status__in=[DatabaseJob.StatusChoices.PENDING, DatabaseJob.StatusChoices.RUNNING],
+            created_at__lt=job.started_at,
+        ).exclude(pk=job.pk)
+        count = inherited.update(
+            status=DatabaseJob.StatusChoices.FAILED,
+            error_message=f"Superseded by the restore of job #{job.pk}, which replaced this table from a backup",
+            finished_at=timezone.now(),
+        )
+        if count:
+            job.append_log(f"Marked {count} queued or running jobs from the backup as failed")
+
+    def _reset_sequence(self):
+        # The restored sequence may lie below the id of this job, which is saved again afterwards.
+        with connection.cursor() as cursor:
+            for statement in connection.ops.sequence_reset_sql(no_style(), [DatabaseJob]):
+                cursor.execute(statement)
+
+    def _save_finished_job(self, job):
+        """Saves the final state of the job. After a restore its row is re-inserted into the table
+        from the backup, where the user who queued it may not exist."""
+        if job.job_type != DatabaseJob.JobTypeChoices.RESTORE:
+            job.save()
+            return
+        self._reset_sequence()
+        try:
+            job.save()
+        except IntegrityError:
+            if job.created_by_id is None or get_user_model().objects.filter(pk=job.created_by_id).exists():
+                raise
+            job.created_by = None
+            job.append_log('The user who queued this job is not in the restored backup')
+            job.save()
+
+    def run_job(self, job):
+        started = time.monotonic()
+        on_progress = self._progress_reporter(job)
+        params = job.params or {}
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(target=self._send_heartbeats, args=(job.pk, stop_heartbeat), daemon=True)
+        heartbeat.start()
+        try:
+            if job.job_type == DatabaseJob.JobTypeChoices.BACKUP:
+                result = database_backup_service.create_backup(
+                    compression=params.get('compression'),
+                    backup_format=params.get('backup_format') or 'plain',
+                    jobs=params.get('jobs'),
+                    on_progress=on_progress,
+                )
+                job.append_log(
+                    f"Backup {result['filename']} completed: {result['raw_bytes']} bytes dumped, {result['size_bytes']} bytes stored"
+                )
+                log_action = 'BACKUP'
+                log_description = f"Created database backup: {result['filename']} (job #{job.pk})"
+            else:
+                result = database_backup_service.restore_backup(
+                    params['filename'],
+                    jobs=params.get('jobs'),
+                    on_progress=on_progress,
+                )
+                self._after_restore(job)
+                job.append_log(f"Restore from {result['filename']} completed ({result['format']} format, {result['jobs']} jobs)")
+                log_action = 'RESTORE'
+                log_description = f"Restored database from backup: {result['filename']} (job #{job.pk})"
+
+            job.status = DatabaseJob.StatusChoices.COMPLETED
+            job.result = result
+        except Exception as e:
+            job.status = DatabaseJob.StatusChoices.FAILED
+            job.error_message = str(e)
+            job.append_log(f"Failed: {str(e)}")
+            log_action = 'ERROR'
+            log_description = f"{job.get_job_type_display()} job #{job.pk} error: {str(e)}"
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+
+        job.duration_seconds = round(time.monotonic() - started, 2)
+        job.finished_at = timezone.now()
+        try:
+            self._save_finished_job(job)
+        except Exception as e:
+            logger.error(f"Could not save the final state of {job}: {str(e)}", exc_info=True)
+
+        try:
+            LoggerService.objects.create(
+                user=job.created_by,
+                action=log_action,
+                table_name='Database',
+                description=log_description
+            )
+        except Exception:
+            pass
+
+        return job
+
+database_job_service = DatabaseJobService()
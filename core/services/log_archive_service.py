@@ -0,0 +1,166 @@
+import re
+import json
+import time
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Min
+from django.utils import timezone
+
+from core.models import LoggerService
+from core.services.backup_storage import get_backup_storage
+from core.services.log_rollup_service import log_rollup_service
+
+
+class LogArchiveError(Exception):
+    pass
+
+
+class LogArchiveService:
+    """Moves LoggerService rows older than the retention period out of the hot table.
+
+    Rows are processed one calendar month at a time: each month is streamed through a server-side
+    cursor into a gzip-compressed NDJSON file in the backup storage, and only after the upload
+    completed are its rows deleted, in small batches so no long lock is held on the log table.
+    Only whole months that lie before the cutoff are archived. The hourly rollups are brought up to
+    the cutoff first, so the log statistics keep counting the archived rows.
+    """
+    LOCATION = 'log_archives'
+    READ_CHUNK_SIZE = 2000
+    WRITE_BUFFER_SIZE = 1024 * 1024
+    FILENAME_PATTERN = re.compile(r'^logs_\d{4}-\d{2}(_part\d+)?\.ndjson\.gz$')
+    FIELDS = ['id', 'user_id', 'action', 'table_name', 'description', 'level', 'ip_address', 'created_at', 'updated_at']
+
+    @property
+    def storage(self):
+        return get_backup_storage(self.LOCATION)
+
+    def is_archive_filename(self, filename):
+        return bool(filename and self.FILENAME_PATTERN.match(filename))
+
+    def list_archives(self):
+        archives = [archive for archive in self.storage.list() if self.is_archive_filename(archive['filename'])]
+        archives.sort(key=lambda archive: archive['filename'])
+        return archives
+
+    def month_start(self, value):
+        value = timezone.localtime(value)
+        return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    def next_month(self, value):
+        return self.month_start(value.replace(day=28) + timedelta(days=4))
+
+    def get_cutoff(self, retention_days=None):
+        """First instant that is kept: the start of the month containing now - retention_days."""
+        if retention_days is None:
+            retention_days = settings.LOG_RETENTION_DAYS
+        if retention_days < 1:
+            raise LogArchiveError('The retention period must be at least one day')
+        return self.month_start(timezone.now() - timedelta(days=retention_days))
+
+    def get_months(self, cutoff):
+        oldest = LoggerService.objects.filter(created_at__lt=cutoff).aggregate(oldest=Min('created_at'))['oldest']
+        months = []
+        if oldest is None:
+            return months
+        month = self.month_start(oldest)
+        while month < cutoff:
+            months.append(month)
+            month = self.next_month(month)
+        return months
+
+    def _month_queryset(self, month):
+        return LoggerService.objects.filter(created_at__gte=month, created_at__lt=self.next_month(month))
+
+    def _archive_filename(self, month):
+        storage = self.storage
+        filename = f"logs_{month:%Y-%m}.ndjson.gz"
+        part = 2
+        # A month can be archived more than once, e.g. after rows were imported late.
+        while storage.exists(filename):
+            filename = f"logs_{month:%Y-%m}_part{part}.ndjson.gz"
+            part += 1
+        return filename
+
+    def _encode_row(self, row):
+        values = dict(zip(self.FIELDS, row))
+        values['created_at'] = values['created_at'].isoformat()
+        values['updated_at'] = values['updated_at'].isoformat()
+        return json.dumps(values, ensure_ascii=False)
+
+    def archive_month(self, month, batch_size=None, pause=0.0):
+        """Writes one month of logs to an archive file, then deletes those rows in batches."""
+        batch_size = batch_size or settings.LOG_ARCHIVE_DELETE_BATCH_SIZE
+        queryset = self._month_queryset(month)
+        if not queryset.exists():
+            return None
+
+        started = time.monotonic()
+        filename = self._archive_filename(month)
+        writer = self.storage.open_write(filename, metadata={'month': f"{month:%Y-%m}"})
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        rows = 0
+        last_id = None
+        buffer = []
+        buffered = 0
+        try:
+            for row in queryset.order_by('id').values_list(*self.FIELDS).iterator(chunk_size=self.READ_CHUNK_SIZE):
+                line = self._encode_row(row) + '\n'
+                buffer.append(line)
+                buffered += len(line)
+                rows += 1
+                last_id = row[0]
+                if buffered >= self.WRITE_BUFFER_SIZE:
+                    writer.write(compressor.compress(''.join(buffer).encode('utf-8')))
+                    buffer = []
+                    buffered = 0
+            if buffer:
+                writer.write(compressor.compress(''.join(buffer).encode('utf-8')))
+            writer.write(compressor.flush())
+        except Exception:
+            writer.abort()
+            raise
+        writer.close()
+
+        deleted = self._delete_archived(queryset, last_id, batch_size, pause)
+        return {
+            'month': f"{month:%Y-%m}",
+            'filename': filename,
+            'rows': rows,
+            'deleted': deleted,
+            'size_bytes': self.storage.size(filename),
+            'duration_seconds': round(time.monotonic() - started, 2),
+        }
+
+    def _delete_archived(self, queryset, last_id, batch_size, pause):
+        # Only rows that went into the archive are deleted; each batch commits on its own.
+        deleted = 0
+        archived = queryset.filter(id__lte=last_id).order_by('id')
+        while True:
+            ids = list(archived.values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            count, _ = LoggerService.objects.filter(id__in=ids).delete()
+            deleted += count
+            if pause:
+                time.sleep(pause)
+        return deleted
+
+    def archive(self, retention_days=None, batch_size=None, pause=0.0, dry_run=False):
+        cutoff = self.get_cutoff(retention_days)
+        summary = []
+        if not dry_run:
+            log_rollup_service.compact_until(cutoff)
+        for month in self.get_months(cutoff):
+            if dry_run:
+                rows = self._month_queryset(month).count()
+                if rows:
+                    summary.append({'month': f"{month:%Y-%m}", 'rows': rows})
+                continue
+            result = self.archive_month(month, batch_size=batch_size, pause=pause)
+            if result:
+                summary.append(result)
+        return summary
+
+log_archive_service = LogArchiveService()
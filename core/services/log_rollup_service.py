@@ -0,0 +1,167 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Min, Max, Sum
+from django.db.models.functions import TruncHour, TruncDay
+from django.utils import timezone
+
+from core.models import LoggerService, LogHourlyRollup
+
+
+class LogRollupService:
+    """Maintains hourly LoggerService counts per action, table and level and answers the
+    log statistics from them.
+
+    Hours up to the newest compacted bucket are read from the rollups; the short tail after it
+    is aggregated live from the indexed log table, so answers stay exact between compactions.
+    Reads only ever compact a bounded step inline. The job worker compacts on a schedule
+    (run_database_jobs --log-maintenance) and backfills on its first run; until then the hours
+    the rollups do not reach are counted from the log table.
+    """
+
+    # Buffered audit writes can land a little after their created_at, so compaction always
+    # recomputes the hour before the newest rollup as well.
+    LATE_ARRIVAL_HOURS = 1
+    # Reads compact inline, at most this far, when the periodic job has not run for this long.
+    MAX_TAIL = timedelta(hours=6)
+    COMPACTION_WINDOW = timedelta(days=1)
+    INTERVALS = {'hour': TruncHour, 'day': TruncDay}
+
+    def floor_hour(self, value):
+        return value.replace(minute=0, second=0, microsecond=0)
+
+    def compact(self, since=None, until=None):
+        """Recomputes rollups from `since` (default: just before the newest rollup) up to `until`.
+        Returns the number of rollup rows written."""
+        until = until or timezone.now()
+        oldest = LoggerService.objects.aggregate(first=Min('created_at'))['first']
+        if oldest is None:
+            return 0
+        if since is None:
+            latest = LogHourlyRollup.objects.aggregate(latest=Max('bucket'))['latest']
+            since = oldest if latest is None else latest - timedelta(hours=self.LATE_ARRIVAL_HOURS)
+        # Hours before the oldest log row may have been archived; recomputing them would erase their rollups.
+        since = max(self.floor_hour(since), self.floor_hour(oldest))
+
+        written = 0
+        window_start = since
+        while window_start <= until:
+            window_end = min(window_start + self.COMPACTION_WINDOW, self.floor_hour(until) + timedelta(hours=1))
+            written += self._compact_window(window_start, window_end)
+            window_start = window_end
+        return written
+
+    def compact_until(self, until):
+        """Compacts up to `until` unless the rollups already reach it. Returns the rollup rows written."""
+        latest = LogHourlyRollup.objects.aggregate(latest=Max('bucket'))['latest']
+        if latest is not None and latest >= until:
+            return 0
+        return self.compact(until=until)
+
+    def _compact_window(self, start, end):
+        rows = (
+            LoggerService.objects
+            .filter(created_at__gte=start, created_at__lt=end)
+            .annotate(bucket=TruncHour('created_at'))
+            .values('bucket', 'action', 'table_name', 'level')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        rollups = [
+            LogHourlyRollup(
+                bucket=row['bucket'],
+                action=row['action'],
+                table_name=row['table_name'],
+                level=row['level'],
+                count=row['total'],
+            )
+            for row in rows
+        ]
+        with transaction.atomic():
+            LogHourlyRollup.objects.filter(bucket__gte=start, bucket__lt=end).delete()
+            # A concurrent compaction of the same window may have inserted first.
+            LogHourlyRollup.objects.bulk_create(
+                rollups,
+                update_conflicts=True,
+                unique_fields=['bucket', 'action', 'table_name', 'level'],
+                update_fields=['count'],
+            )
+        return len(rollups)
+
+    def _tail_start(self):
+        """Start of the hour from which counts are taken from the raw log table."""
+        latest = LogHourlyRollup.objects.aggregate(latest=Max('bucket'))['latest']
+        if latest is not None and latest < timezone.now() - self.MAX_TAIL:
+            self.compact(until=latest + self.MAX_TAIL)
+            latest = LogHourlyRollup.objects.aggregate(latest=Max('bucket'))['latest']
+        # The newest bucket is usually the current, still growing hour.
+        return latest
+
+    def _split(self, tail_start, start, end):
+        """Rollup and raw log querysets that together cover [start, end) at hour granularity."""
+        rollups = LogHourlyRollup.objects.all()
+        raw = LoggerService.objects.all()
+        if tail_start is None:
+            rollups = rollups.none()
+        else:
+            rollups = rollups.filter(bucket__lt=tail_start)
+            raw = raw.filter(created_at__gte=tail_start)
+        if start is not None:
+            rollups = rollups.filter(bucket__gte=self.floor_hour(start))
+            raw = raw.filter(created_at__gte=self.floor_hour(start))
+        if end is not None:
+            rollups = rollups.filter(bucket__lt=end)
+            raw = raw.filter(created_at__lt=end)
+        return rollups, raw
+
+    def _grouped(self, rollups, raw, field):
+        counts = Counter()
+        for row in rollups.values(field).annotate(total=Sum('count')).order_by():
+            counts[row[field]] += row['total']
+        for row in raw.values(field).annotate(total=Count('id')).order_by():
+            counts[row[field]] += row['total']
+        return [{field: key, 'count': value} for key, value in counts.most_common()]
+
+    def get_statistics(self, start=None, end=None):
+        tail_start = self._tail_start()
+        rollups, raw = self._split(tail_start, start, end)
+        by_level = self._grouped(rollups, raw, 'level')
+
+        # The last 24 hours are counted exactly: the partial first hour comes from the log table.
+        recent_start = timezone.now() - timedelta(hours=24)
+        first_full_hour = self.floor_hour(recent_start) + timedelta(hours=1)
+        recent_rollups, recent_raw = self._split(tail_start, first_full_hour, None)
+        recent = (
+            (recent_rollups.aggregate(total=Sum('count'))['total'] or 0)
+            + recent_raw.count()
+            + LoggerService.objects.filter(created_at__gte=recent_start, created_at__lt=first_full_hour).count()
+        )
+
+        return {
+            'total_logs': sum(item['count'] for item in by_level),
+            'recent_logs': recent,
+            'by_action': self._grouped(rollups, raw, 'action'),
+            'by_table': self._grouped(rollups, raw, 'table_name'),
+            'by_level': by_level,
+        }
+
+    def get_histogram(self, start, end, interval='hour', action=None, table_name=None, level=None):
+        if interval not in self.INTERVALS:
+            raise ValueError(f"Unsupported interval '{interval}'. Use one of: {', '.join(self.INTERVALS)}")
+        filters = {
+            name: value for name, value in (('action', action), ('table_name', table_name), ('level', level)) if value
+        }
+        rollups, raw = self._split(self._tail_start(), start, end)
+        rollups = rollups.filter(**filters)
+        raw = raw.filter(**filters)
+        trunc = self.INTERVALS[interval]
+
+        counts = Counter()
+        for row in rollups.annotate(period=trunc('bucket')).values('period').annotate(total=Sum('count')).order_by():
+            counts[row['period']] += row['total']
+        for row in raw.annotate(period=trunc('created_at')).values('period').annotate(total=Count('id')).order_by():
+            counts[row['period']] += row['total']
+        return [{'bucket': period, 'count': counts[period]} for period in sorted(counts)]
+
+log_rollup_service = LogRollupService()
@@ -0,0 +1,50 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connection
+from django.db.models import Q
+
+from core.models.logger_service_model import log_search_vector
+
+
+class LogSearchService:
+    """Searches log descriptions, actions and table names.
+
+    On PostgreSQL every word is matched as a prefix against the GIN-indexed tsvector and results
+    are ranked with ts_rank. When that finds nothing (a fragment from the middle of a word, a
+    typo) the trigram index on description is used instead, ranked by word similarity.
+    """
+    WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+    def build_query(self, term):
+        words = self.WORD_PATTERN.findall(term)
+        if not words:
+            return None
+        # Words are \w+ only, so they are safe to use in a raw tsquery.
+        return SearchQuery(' & '.join(f"{word}:*" for word in words), config='simple', search_type='raw')
+
+    def search(self, queryset, term):
+        term = (term or '').strip()
+        if not term:
+            return queryset
+
+        if connection.vendor != 'postgresql':
+            return queryset.filter(
+                Q(description__icontains=term) | Q(action__icontains=term) | Q(table_name__icontains=term)
+            )
+
+        query = self.build_query(term)
+        if query is not None:
+            vector = log_search_vector()
+            matches = queryset.alias(search_document=vector).filter(search_document=query)
+            if matches.exists():
+                return matches.annotate(search_rank=SearchRank(vector, query)).order_by('-search_rank', '-created_at', '-id')
+
+        return (
+            queryset
+            .filter(description__trigram_word_similar=term)
+            .annotate(search_rank=TrigramWordSimilarity(term, 'description'))
+            .order_by('-search_rank', '-created_at', '-id')
+        )
+
+log_search_service = LogSearchService()
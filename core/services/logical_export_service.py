@@ -0,0 +1,292 @@
+import csv
+import gzip
+import io
+import json
+import os
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+
+
+class LogicalExportError(Exception):
+    pass
+
+
+class LogicalExportService:
+    """Exports and re-imports the rows of selected academic models for a single period.
+
+    Rows are read through server-side cursors and written as gzip-compressed NDJSON or CSV,
+    one file per model. Imports upsert by primary key in batches, so a period can be
+    restored without touching the rest of the database. A row whose natural key already exists
+    under another primary key updates that row instead. Bulk writes skip the model signals, so
+    bulletins of imported or replaced grades are marked stale explicitly. Grades of closed
+    trimesters are refused, as the API refuses them: those trimesters are served from snapshots
+    that an import would not update.
+    """
+    READ_CHUNK_SIZE = 2000
+    IMPORT_BATCH_SIZE = 1000
+    FORMATS = ('ndjson', 'csv')
+
+    # key -> (model label, lookup from the model to the period id, natural unique key)
+    MODELS = {
+        'grade': ('academic.Grade', 'period_id', ('student_id', 'assessment_item_id')),
+        'attendance': ('academic.Attendance', 'period_id', ('student_id', 'course_id', 'subject_id', 'date', 'period_id')),
+        'participation': ('academic.Participation', 'period_id', ('student_id', 'course_id', 'subject_id', 'date', 'period_id')),
+        'enrollment': ('academic.Enrollment', 'period_id', ('student_id', 'course_id', 'subject_id', 'period_id')),
+        'bulletin': ('reports.Bulletin', 'trimester__period_id', ('student_id', 'trimester_id')),
+    }
+    # Deleting bulletins would cascade to their generated files, which are not exported.
+    KEEP_ON_REPLACE = ('bulletin',)
+
+    def get_model(self, key):
+        if key not in self.MODELS:
+            raise LogicalExportError(f"Unknown model '{key}'. Use one of: {', '.join(self.MODELS)}")
+        return apps.get_model(self.MODELS[key][0])
+
+    def get_queryset(self, key, period_id):
+        model = self.get_model(key)
+        return model._default_manager.filter(**{self.MODELS[key][1]: period_id}).order_by('pk')
+
+    def _get_fields(self, model):
+        return [field for field in model._meta.concrete_fields]
+
+    def build_filename(self, key, period_id, file_format):
+        return f"{key}__period_{period_id}.{file_format}.gz"
+
+    def parse_filename(self, filename):
+        """Returns (model key, file format) from a file name produced by build_filename."""
+        base = os.path.basename(filename)
+        key = base.split('__', 1)[0]
+        file_format = 'csv' if base.endswith('.csv.gz') or base.endswith('.csv') else 'ndjson'
+        if key not in self.MODELS:
+            raise LogicalExportError(f"Cannot infer the model from file name '{base}'")
+        return key, file_format
+
+    def _encode_value(self, value):
+        if isinstance(value, Decimal):
+            return str(value)
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
+
+    def _encode_csv_value(self, field, value):
+        if value is None:
+            return ''
+        if isinstance(field, models.JSONField):
+            return json.dumps(value)
+        return self._encode_value(value)
+
+    def export_model(self, key, period_id, output, file_format='ndjson'):
+        """Writes the rows of a model for one period to a binary file object. Returns the row count."""
+        if file_format not in self.FORMATS:
+            raise LogicalExportError(f"Unsupported format '{file_format}'. Use one of: {', '.join(self.FORMATS)}")
+
+        model = self.get_model(key)
+        fields = self._get_fields(model)
+        attnames = [field.attname for field in fields]
+        rows = self.get_queryset(key, period_id).values_list(*attnames).iterator(chunk_size=self.READ_CHUNK_SIZE)
+
+        count = 0
+        with gzip.GzipFile(fileobj=output, mode='wb') as compressed:
+            text = io.TextIOWrapper(compressed, encoding='utf-8', newline='')
+            if file_format == 'csv':
+                writer = csv.writer(text)
+                writer.writerow(attnames)
+                for row in rows:
+                    writer.writerow([self._encode_csv_value(field, value) for field, value in zip(fields, row)])
+                    count += 1
+            else:
+                for row in rows:
+                    text.write(json.dumps({name: self._encode_value(value) for name, value in zip(attnames, row)}))
+                    text.write('\n')
+                    count += 1
+            text.flush()
+            text.detach()
+        return count
+
+    def export_period(self, period_id, output_dir, keys=None, file_format='ndjson'):
+        keys = keys or list(self.MODELS)
+        os.makedirs(output_dir, exist_ok=True)
+        summary = []
+        for key in keys:
+            started = time.monotonic()
+            path = os.path.join(output_dir, self.build_filename(key, period_id, file_format))
+            with open(path, 'wb') as output:
+                count = self.export_model(key, period_id, output, file_format)
+            summary.append({
+                'model': key,
+                'path': path,
+                'rows': count,
+                'size_bytes': os.path.getsize(path),
+                'duration_seconds': round(time.monotonic() - started, 2),
+            })
+        return summary
+
+    def _iter_rows(self, source, file_format, fields_by_attname):
+        text = io.TextIOWrapper(gzip.GzipFile(fileobj=source, mode='rb'), encoding='utf-8', newline='')
+        if file_format == 'csv':
+            for row in csv.DictReader(text):
+                yield {
+                    name: (json.loads(value) if isinstance(fields_by_attname[name], models.JSONField) else value)
+                    if value != '' else None
+                    for name, value in row.items()
+                }
+        else:
+            for line in text:
+                if line.strip():
+                    yield json.loads(line)
+
+    def _build_instance(self, model, fields_by_attname, row):
+        values = {}
+        for name, value in row.items():
+            field = fields_by_attname.get(name)
+            if field is None:
+                raise LogicalExportError(f"Unknown column '{name}' for {model._meta.label}")
+            values[name] = field.to_python(value) if value is not None and not isinstance(field, models.JSONField) else value
+        return model(**values)
+
+    def _match_natural_keys(self, model, batch, natural_key):
+        """Gives rows whose natural key exists under another primary key that row's key, so the upsert
+        updates it instead of failing on the unique constraint. Returns how many rows were matched."""
+        keyed = [instance for instance in batch if all(getattr(instance, name) is not None for name in natural_key)]
+        if not keyed:
+            return 0
+        filters = {f"{name}__in": {getattr(instance, name) for instance in keyed} for name in natural_key}
+        existing = {
+            tuple(row[1:]): row[0]
+            for row in model._default_manager.filter(**filters).values_list('pk', *natural_key).iterator()
+        }
+        matched = 0
+        for instance in keyed:
+            pk = existing.get(tuple(getattr(instance, name) for name in natural_key))
+            if pk is not None and pk != instance.pk:
+                instance.pk = pk
+                matched += 1
+        return matched
+
+    def _check_written(self, model, batch, written):
+        """Refuses to write one row twice in an import, which would silently overwrite an earlier row."""
+        for instance in batch:
+            if instance.pk in written:
+                raise LogicalExportError(
+                    f"{model._meta.label} id {instance.pk} is targeted by two rows of the file, by its id and by the "
+                    f"natural key of another row; the database rows have diverged from the export too far to merge"
+                )
+            written.add(instance.pk)
+
+    def _check_trimesters_open(self, trimesters):
+        closed = sorted(set(trimesters.filter(is_closed=True).values_list('name', flat=True)))
+        if closed:
+            raise LogicalExportError(
+                f"Closed trimesters are read-only: {', '.join(closed)}. Reopen them before importing their grades "
+                f"and close them again afterwards to rebuild their snapshots"
+            )
+
+    def _mark_grades_stale(self, grades):
+        from app.reports.services.bulletin_service import bulletin_service
+
+        bulletin_service.mark_stale_for_grades(grades)
+
+    def _upsert_batch(self, model, batch, update_fields, auto_fields):
+        # bulk_create runs pre_save, which overwrites auto_now/auto_now_add columns; put the exported values back.
+        original_values = [[getattr(instance, field.attname) for field in auto_fields] for instance in batch]
+        model._default_manager.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=[model._meta.pk.name],
+            update_fields=update_fields,
+        )
+        if auto_fields:
+            for instance, values in zip(batch, original_values):
+                for field, value in zip(auto_fields, values):
+                    setattr(instance, field.attname, value)
+            model._default_manager.bulk_update(batch, [field.name for field in auto_fields])
+
+    def import_model(self, key, source, file_format='ndjson', period_id=None, replace=False):
+        """Upserts rows from an exported file. With replace=True the period's existing rows are
+        deleted first, so rows that were removed after the export do not linger; bulletins are
+        never deleted. Raises LogicalExportError, importing nothing, when a grade belongs to a
+        closed trimester. Returns the number of rows, how many of them matched an existing row by
+        natural key, and whether existing rows were replaced."""
+        model = self.get_model(key)
+        natural_key = self.MODELS[key][2]
+        is_grade = key == 'grade'
+        fields = self._get_fields(model)
+        fields_by_attname = {field.attname: field for field in fields}
+        update_fields = [field.name for field in fields if not field.primary_key]
+        auto_fields = [
+            field for field in fields
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+        ]
+
+        if replace and period_id is None:
+            raise LogicalExportError('A period is required to replace existing rows')
+
+        replace = replace and key not in self.KEEP_ON_REPLACE
+        trimesters = apps.get_model('academic.Trimester')._default_manager
+        count = 0
+        matched = 0
+        written = set()
+
+        def write(batch):
+            nonlocal matched
+            matched += self._match_natural_keys(model, batch, natural_key)
+            self._check_written(model, batch, written)
+            if is_grade:
+                # Both the trimesters the grades move into and the ones the existing rows are in.
+                self._check_trimesters_open(trimesters.filter(
+                    assessment_items__pk__in={instance.assessment_item_id for instance in batch if instance.assessment_item_id}
+                ))
+                self._check_trimesters_open(trimesters.filter(assessment_items__grades__pk__in=[instance.pk for instance in batch]))
+                # Like the pre_save and post_save signals: the bulletins of the old and the new values.
+                self._mark_grades_stale(model._default_manager.filter(pk__in=[instance.pk for instance in batch]))
+            self._upsert_batch(model, batch, update_fields, auto_fields)
+            if is_grade:
+                self._mark_grades_stale(model._default_manager.filter(pk__in=[instance.pk for instance in batch]))
+
+        with transaction.atomic():
+            if replace:
+                existing = self.get_queryset(key, period_id)
+                if is_grade:
+                    self._check_trimesters_open(trimesters.filter(assessment_items__grades__in=existing))
+                    self._mark_grades_stale(existing)
+                existing.delete()
+
+            batch = []
+            for row in self._iter_rows(source, file_format, fields_by_attname):
+                batch.append(self._build_instance(model, fields_by_attname, row))
+                if len(batch) >= self.IMPORT_BATCH_SIZE:
+                    write(batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                write(batch)
+                count += len(batch)
+
+            self._reset_sequence(model)
+        return {'rows': count, 'matched_by_key': matched, 'replaced': replace}
+
+    def import_file(self, path, period_id=None, replace=False):
+        key, file_format = self.parse_filename(path)
+        started = time.monotonic()
+        with open(path, 'rb') as source:
+            result = self.import_model(key, source, file_format, period_id=period_id, replace=replace)
+        return {
+            'model': key,
+            'path': path,
+            **result,
+            'duration_seconds': round(time.monotonic() - started, 2),
+        }
+
+    def _reset_sequence(self, model):
+        statements = connection.ops.sequence_reset_sql(no_style(), [model])
+        if statements:
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+
+logical_export_service = LogicalExportService()
@@ -0,0 +1,196 @@
+import hashlib
+import logging
+import os
+import re
+import sys
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class QueryInspection:
+    """Collects every query of one request grouped by normalized SQL shape."""
+
+    def __init__(self, service):
+        self.service = service
+        self.query_count = 0
+        self.shapes = {}
+        self.slow = []
+
+    def query_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            self.query_count += 1
+            normalized = self.service.normalize(sql)
+            shape = self.shapes.get(normalized)
+            if shape is None:
+                # The first execution of a shape is where a per-row loop starts, so its stack is kept.
+                shape = self.shapes[normalized] = {'count': 0, 'time_ms': 0.0, 'max_time_ms': 0.0, 'stack': self.service.capture_stack()}
+            shape['count'] += 1
+            shape['time_ms'] += duration_ms
+            shape['max_time_ms'] = max(shape['max_time_ms'], duration_ms)
+            if duration_ms >= self.service.slow_ms:
+                self.slow.append({'sql': normalized, 'time_ms': duration_ms, 'stack': self.service.capture_stack()})
+
+    def get_issues(self):
+        issues = []
+        for normalized, shape in self.shapes.items():
+            if shape['count'] >= self.service.repeat_threshold:
+                issues.append({
+                    'kind': 'n_plus_one',
+                    'sql': normalized,
+                    'count': shape['count'],
+                    'time_ms': shape['time_ms'],
+                    'max_time_ms': shape['max_time_ms'],
+                    'stack': shape['stack'],
+                })
+        slow_by_shape = {}
+        for query in self.slow:
+            issue = slow_by_shape.get(query['sql'])
+            if issue is None:
+                issue = slow_by_shape[query['sql']] = {
+                    'kind': 'slow', 'sql': query['sql'], 'count': 0, 'time_ms': 0.0, 'max_time_ms': 0.0, 'stack': query['stack'],
+                }
+            issue['count'] += 1
+            issue['time_ms'] += query['time_ms']
+            issue['max_time_ms'] = max(issue['max_time_ms'], query['time_ms'])
+        issues.extend(slow_by_shape.values())
+        return issues
+
+
+class QueryInspectorService:
+    """Flags repeated identical-shape queries (N+1) and slow queries per request, logs them with the
+    code location that issued them and keeps per-view totals in QueryOffender."""
+    HEADER = 'HTTP_X_INSPECT_QUERIES'
+    STACK_DEPTH = 8
+
+    STRING_PATTERN = re.compile(r"'(?:[^']|'')*'")
+    NUMBER_PATTERN = re.compile(r'\b\d+(?:\.\d+)?\b')
+    IN_LIST_PATTERN = re.compile(r'\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)', re.IGNORECASE)
+    WHITESPACE_PATTERN = re.compile(r'\s+')
+
+    def __init__(self):
+        # Frames of the instrumentation itself never point at the code that issued a query.
+        services_dir = os.path.dirname(os.path.abspath(__file__))
+        self._ignored_paths = (
+            os.path.abspath(__file__),
+            os.path.join(services_dir, 'request_metrics_service.py'),
+            os.path.join(os.path.dirname(services_dir), 'middleware.py'),
+        )
+
+    @property
+    def repeat_threshold(self):
+        return getattr(settings, 'QUERY_INSPECTOR_REPEAT_THRESHOLD', 10)
+
+    @property
+    def slow_ms(self):
+        return getattr(settings, 'QUERY_INSPECTOR_SLOW_MS', 200)
+
+    def is_enabled(self, request):
+        if getattr(settings, 'QUERY_INSPECTOR_ENABLED', False):
+            return True
+        return getattr(settings, 'QUERY_INSPECTOR_ALLOW_HEADER', False) and request.META.get(self.HEADER) == '1'
+
+    def start(self):
+        return QueryInspection(self)
+
+    def normalize(self, sql):
+        sql = self.STRING_PATTERN.sub('?', sql)
+        sql = self.NUMBER_PATTERN.sub('?', sql)
+        sql = self.IN_LIST_PATTERN.sub('IN (...)', sql)
+        return self.WHITESPACE_PATTERN.sub(' ', sql).strip()
+
+    def fingerprint(self, normalized):
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+    def capture_stack(self):
+        """Innermost frames from project code, skipping Django, libraries and this inspector."""
+        base_dir = str(settings.BASE_DIR) + os.sep
+        frames = []
+        frame = sys._getframe(1)
+        while frame is not None and len(frames) < self.STACK_DEPTH:
+            filename = frame.f_code.co_filename
+            if (
+                filename.startswith(base_dir)
+                and not filename.startswith(self._ignored_paths)
+                and 'site-packages' not in filename
+            ):
+                frames.append((os.path.relpath(filename, base_dir), frame.f_lineno, frame.f_code.co_name))
+            frame = frame.f_back
+        return frames
+
+    def format_location(self, stack):
+        if not stack:
+            return ''
+        filename, lineno, name = stack[0]
+        return f"{filename}:{lineno} in {name}"
+
+    def format_stack(self, stack):
+        return '\n'.join(f"{filename}:{lineno} in {name}" for filename, lineno, name in stack)
+
+    def report(self, view_name, inspection):
+        """Logs the issues of a finished request and adds them to the offender totals. Returns the issues."""
+        issues = inspection.get_issues()
+        for issue in issues:
+            location = self.format_location(issue['stack'])
+            if issue['kind'] == 'n_plus_one':
+                logger.warning(
+                    'Repeated query in %s: %s identical-shape queries (%.1f ms) from %s: %s',
+                    view_name, issue['count'], issue['time_ms'], location or 'unknown location', issue['sql'][:500]
+                )
+            else:
+                logger.warning(
+                    'Slow query in %s: %.1f ms from %s: %s',
+                    view_name, issue['max_time_ms'], location or 'unknown location', issue['sql'][:500]
+                )
+            try:
+                self._save(view_name, issue, location)
+            except Exception:
+                logger.exception('Could not store query inspector result')
+        return issues
+
+    def _save(self, view_name, issue, location):
+        from core.models import QueryOffender
+
+        lookup = {'kind': issue['kind'], 'fingerprint': self.fingerprint(issue['sql']), 'view_name': view_name[:255]}
+        now = timezone.now()
+        changes = {
+            'occurrences': F('occurrences') + 1,
+            'total_queries': F('total_queries') + issue['count'],
+            'max_repeat': Greatest(F('max_repeat'), issue['count']),
+            'total_time_ms': F('total_time_ms') + issue['time_ms'],
+            'max_time_ms': Greatest(F('max_time_ms'), issue['max_time_ms']),
+            'location': location[:500],
+            'stack': self.format_stack(issue['stack']),
+            'last_seen': now,
+        }
+        if QueryOffender.objects.filter(**lookup).update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                QueryOffender.objects.create(
+                    **lookup,
+                    sql=issue['sql'],
+                    location=location[:500],
+                    stack=self.format_stack(issue['stack']),
+                    occurrences=1,
+                    total_queries=issue['count'],
+                    max_repeat=issue['count'],
+                    total_time_ms=issue['time_ms'],
+                    max_time_ms=issue['max_time_ms'],
+                    last_seen=now,
+                )
+        except IntegrityError:
+            # Another request created the row first.
+            QueryOffender.objects.filter(**lookup).update(**changes)
+
+query_inspector_service = QueryInspectorService()
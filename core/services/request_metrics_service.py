@@ -0,0 +1,260 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_current = threading.local()
+
+
+class RequestStats:
+    """Counters of the request being handled by the current thread."""
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self._serializer_depth = 0
+
+    def query_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_queries += 1
+            self.db_time += time.perf_counter() - started
+
+
+def get_current_stats():
+    return getattr(_current, 'stats', None)
+
+
+def install_serializer_timing():
+    """Times every top-level `serializer.data` evaluation of the current request.
+
+    Serializer.data and ListSerializer.data both end in BaseSerializer.data, so wrapping that
+    property covers every serializer without touching them; nested evaluations are not counted twice.
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    original = BaseSerializer.data.fget
+    if getattr(original, 'timed', False):
+        return
+
+    def data(self):
+        stats = get_current_stats()
+        if stats is None or stats._serializer_depth:
+            return original(self)
+        stats._serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return original(self)
+        finally:
+            stats._serializer_depth -= 1
+            stats.serializer_time += time.perf_counter() - started
+
+    data.timed = True
+    BaseSerializer.data = property(data)
+
+
+class _EndpointAggregate:
+    __slots__ = (
+        'count', 'error_count', 'duration_total', 'duration_max', 'db_queries', 'db_time',
+        'serializer_time', 'response_bytes', 'histogram',
+    )
+
+    def __init__(self, buckets):
+        self.count = 0
+        self.error_count = 0
+        self.duration_total = 0.0
+        self.duration_max = 0.0
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.response_bytes = 0
+        self.histogram = [0] * buckets
+
+
+class RequestMetricsService:
+    """Aggregates per-endpoint request timings in memory and flushes them periodically to
+    RequestMetric rows, one per endpoint and flush period of each process.
+
+    Durations are kept as fixed-bucket histograms so percentiles can be merged across periods
+    and processes when reporting.
+    """
+    # Upper bounds of the duration histogram buckets in milliseconds; the last bucket is open.
+    BUCKET_BOUNDS_MS = (5, 10, 25, 50, 75, 100, 150, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000, 30000)
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._aggregates = {}
+        self._period_start = timezone.now()
+        self._pid = os.getpid()
+        self._atexit_registered = False
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'REQUEST_METRICS_ENABLED', False)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, 'REQUEST_METRICS_FLUSH_INTERVAL', 300)
+
+    @property
+    def retention_days(self):
+        return getattr(settings, 'REQUEST_METRICS_RETENTION_DAYS', 14)
+
+    def start_request(self):
+        stats = RequestStats()
+        _current.stats = stats
+        return stats
+
+    def finish_request(self):
+        _current.stats = None
+
+    def record(self, view_name, method, status_code, stats, duration, response_bytes):
+        duration_ms = duration * 1000
+        bucket = bisect_left(self.BUCKET_BOUNDS_MS, duration_ms)
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker: drop what the parent had collected, it flushes its own copy.
+                self._aggregates = {}
+                self._period_start = timezone.now()
+                self._pid = os.getpid()
+            if not self._atexit_registered:
+                atexit.register(self.flush)
+                self._atexit_registered = True
+
+            key = (view_name, method)
+            aggregate = self._aggregates.get(key)
+            if aggregate is None:
+                aggregate = self._aggregates[key] = _EndpointAggregate(len(self.BUCKET_BOUNDS_MS) + 1)
+            aggregate.count += 1
+            if status_code >= 500:
+                aggregate.error_count += 1
+            aggregate.duration_total += duration_ms
+            aggregate.duration_max = max(aggregate.duration_max, duration_ms)
+            aggregate.db_queries += stats.db_queries
+            aggregate.db_time += stats.db_time * 1000
+            aggregate.serializer_time += stats.serializer_time * 1000
+            aggregate.response_bytes += response_bytes
+            aggregate.histogram[bucket] += 1
+
+    def maybe_flush(self):
+        if (timezone.now() - self._period_start).total_seconds() >= self.flush_interval:
+            self.flush(blocking=False)
+
+    def flush(self, blocking=True):
+        from core.models import RequestMetric
+
+        if not self._flush_lock.acquire(blocking=blocking):
+            return
+        try:
+            with self._lock:
+                aggregates, self._aggregates = self._aggregates, {}
+                period_start, self._period_start = self._period_start, timezone.now()
+            if not aggregates:
+                return
+            period_end = timezone.now()
+            RequestMetric.objects.bulk_create([
+                RequestMetric(
+                    period_start=period_start,
+                    period_end=period_end,
+                    view_name=view_name,
+                    method=method,
+                    count=aggregate.count,
+                    error_count=aggregate.error_count,
+                    duration_total_ms=round(aggregate.duration_total, 3),
+                    duration_max_ms=round(aggregate.duration_max, 3),
+                    db_queries_total=aggregate.db_queries,
+                    db_time_total_ms=round(aggregate.db_time, 3),
+                    serializer_time_total_ms=round(aggregate.serializer_time, 3),
+                    response_bytes_total=aggregate.response_bytes,
+                    duration_histogram=aggregate.histogram,
+                )
+                for (view_name, method), aggregate in aggregates.items()
+            ])
+            RequestMetric.objects.filter(period_start__lt=period_end - timedelta(days=self.retention_days)).delete()
+        except Exception:
+            logger.exception('Could not flush request metrics')
+        finally:
+            self._flush_lock.release()
+
+    def percentile(self, histogram, total, percentile, maximum):
+        """Estimates a percentile from bucket counts by interpolating inside the bucket it falls in."""
+        if not total:
+            return None
+        rank = total * percentile / 100
+        seen = 0
+        for index, count in enumerate(histogram):
+            if count and seen + count >= rank:
+                lower = self.BUCKET_BOUNDS_MS[index - 1] if index > 0 else 0
+                upper = self.BUCKET_BOUNDS_MS[index] if index < len(self.BUCKET_BOUNDS_MS) else maximum
+                upper = min(upper, maximum)
+                return round(lower + (upper - lower) * (rank - seen) / count, 2)
+            seen += count
+        return round(maximum, 2)
+
+    def get_report(self, since, view_name=None, method=None):
+        from core.models import RequestMetric
+
+        queryset = RequestMetric.objects.filter(period_start__gte=since)
+        if view_name:
+            queryset = queryset.filter(view_name=view_name)
+        if method:
+            queryset = queryset.filter(method=method.upper())
+
+        totals = {
+            (row['view_name'], row['method']): row
+            for row in queryset.values('view_name', 'method').annotate(
+                requests=Sum('count'),
+                errors=Sum('error_count'),
+                duration_total=Sum('duration_total_ms'),
+                duration_max=Max('duration_max_ms'),
+                db_queries=Sum('db_queries_total'),
+                db_time=Sum('db_time_total_ms'),
+                serializer_time=Sum('serializer_time_total_ms'),
+                response_bytes=Sum('response_bytes_total'),
+            ).order_by()
+        }
+
+        histograms = {}
+        for key_view, key_method, histogram in queryset.values_list('view_name', 'method', 'duration_histogram').iterator(chunk_size=2000):
+            merged = histograms.setdefault((key_view, key_method), [0] * (len(self.BUCKET_BOUNDS_MS) + 1))
+            for index, count in enumerate(histogram[:len(merged)]):
+                merged[index] += count
+
+        report = []
+        for key, row in totals.items():
+            requests = row['requests'] or 0
+            if not requests:
+                continue
+            histogram = histograms.get(key, [])
+            entry = {
+                'view_name': row['view_name'],
+                'method': row['method'],
+                'requests': requests,
+                'error_rate': round(row['errors'] / requests, 4),
+                'avg_ms': round(row['duration_total'] / requests, 2),
+                'max_ms': round(row['duration_max'], 2),
+                'avg_db_queries': round(row['db_queries'] / requests, 2),
+                'avg_db_time_ms': round(row['db_time'] / requests, 2),
+                'avg_serializer_time_ms': round(row['serializer_time'] / requests, 2),
+                'avg_response_bytes': round(row['response_bytes'] / requests),
+            }
+            for percentile in self.PERCENTILES:
+                entry[f'p{percentile}_ms'] = self.percentile(histogram, requests, percentile, row['duration_max'])
+            report.append(entry)
+        return report
+
+request_metrics_service = RequestMetricsService()
@@ -0,0 +1,226 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from app.academic.models import (
+    AssessmentItem, Attendance, Course, Enrollment, Grade, Participation, Period, Subject,
+    TeacherAssignment, Trimester,
+)
+from app.authentication.models import Student, Teacher, User
+
+
+class SyntheticSchoolError(Exception):
+    pass
+
+
+class SyntheticSchoolService:
+    """Builds a school of configurable size with bulk inserts, for benchmarks and load tests.
+
+    Periods are consecutive school years ending with the current one, which is the active period;
+    each is split into equal trimesters. Every student belongs to one course, is enrolled in every
+    subject of it in every period and gets one grade per assessment item. Rows are generated lazily
+    and inserted in batches, so memory stays flat however large the school is. The data is random
+    but reproducible for a given seed. Relies on bulk_create returning primary keys (PostgreSQL).
+    """
+    BATCH_SIZE = 5000
+    EMAIL_DOMAIN = 'synthetic.school'
+    PASSWORD = 'synthetic'
+    FIRST_NAMES = [
+        'Ana', 'Luis', 'Maria', 'Jose', 'Carmen', 'Jorge', 'Lucia', 'Diego', 'Sofia', 'Mateo',
+        'Valeria', 'Daniel', 'Camila', 'Pablo', 'Elena', 'Andres', 'Paula', 'Miguel', 'Laura', 'Hugo',
+    ]
+    LAST_NAMES = [
+        'Garcia', 'Rodriguez', 'Lopez', 'Martinez', 'Sanchez', 'Perez', 'Gomez', 'Flores', 'Rojas', 'Vargas',
+        'Mendoza', 'Torres', 'Castro', 'Morales', 'Rios', 'Ortiz', 'Silva', 'Romero', 'Suarez', 'Herrera',
+    ]
+    ASSESSMENT_TYPES = ['EXAM', 'TASK', 'PROJECT']
+
+    def is_empty(self):
+        return not (Student.objects.exists() or Period.objects.exists() or Course.objects.exists())
+
+    def generate(self, students=500, courses=10, subjects=8, periods=2, trimesters=3, grades_per_trimester=4,
+                 attendance_days=10, teachers=None, seed=42, log=None):
+        """Creates the school and returns the number of rows created per model and the elapsed seconds."""
+        if min(students, courses, subjects, periods, trimesters) < 1 or grades_per_trimester < 0 or attendance_days < 0:
+            raise SyntheticSchoolError('Every size must be at least 1 (grades and attendance days at least 0)')
+        if not self.is_empty():
+            raise SyntheticSchoolError('The database already has academic data; generate into an empty database')
+
+        self.random = random.Random(seed)
+        self.log = log or (lambda message: None)
+        self.password = make_password(self.PASSWORD)
+        self.counts = {}
+        teachers = teachers or max(1, courses * subjects // 4)
+        started = time.monotonic()
+
+        with transaction.atomic():
+            period_list = self._create_periods(periods)
+            trimester_map = self._create_trimesters(period_list, trimesters)
+            subject_list = self._create_subjects(subjects)
+            course_list = self._create_courses(courses, period_list[-1].start_date.year)
+            teacher_list = self._create_teachers(teachers)
+            self._create_teacher_assignments(period_list, course_list, subject_list, teacher_list)
+            student_list = self._create_students(students)
+            course_students = {course.pk: student_list[index::courses] for index, course in enumerate(course_list)}
+
+            self._bulk(Enrollment, (
+                Enrollment(student=student, course=course, subject=subject, period=period)
+                for period in period_list
+                for course in course_list
+                for student in course_students[course.pk]
+                for subject in subject_list
+            ))
+            items = self._create_assessment_items(trimester_map, course_list, subject_list, grades_per_trimester)
+            self._bulk(Grade, (
+                Grade(
+                    student=student, subject_id=item.subject_id, period_id=period_id, assessment_item=item,
+                    value=self._grade(student.pk, item.subject_id)
+                )
+                for item, period_id in items
+                for student in course_students[item.course_id]
+            ))
+            self._create_daily_records(period_list, course_list, subject_list, course_students, attendance_days)
+
+        self.log(f"Generated in {time.monotonic() - started:.1f}s")
+        return {'rows': dict(self.counts), 'seconds': round(time.monotonic() - started, 2)}
+
+    def _bulk(self, model, objects):
+        """Inserts a lazy stream of instances in batches, for rows nothing else refers to."""
+        created = 0
+        batch = []
+        for instance in objects:
+            batch.append(instance)
+            if len(batch) >= self.BATCH_SIZE:
+                model.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch)
+            created += len(batch)
+        self.counts[model._meta.label] = self.counts.get(model._meta.label, 0) + created
+        self.log(f"{model._meta.label}: {created} rows")
+
+    def _create(self, model, instances):
+        created = model.objects.bulk_create(instances, batch_size=self.BATCH_SIZE)
+        self.counts[model._meta.label] = self.counts.get(model._meta.label, 0) + len(created)
+        self.log(f"{model._meta.label}: {len(created)} rows")
+        return created
+
+    def _grade(self, student_id, subject_id):
+        # Each student has a stable level with some noise, so averages differ between students
+        # and trimesters the way real ones do and the prediction model has something to learn.
+        level = 55 + (student_id * 7919 + subject_id * 104729) % 40
+        return max(0, min(100, level + self.random.randint(-10, 10)))
+
+    def _create_periods(self, count):
+        current_year = date.today().year
+        return self._create(Period, [
+            Period(
+                name=f"Gestion {year}", start_date=date(year, 2, 1), end_date=date(year, 11, 30),
+                is_active=year == current_year
+            )
+            for year in range(current_year - count + 1, current_year + 1)
+        ])
+
+    def _create_trimesters(self, periods, count):
+        trimester_map = {}
+        instances = []
+        for period in periods:
+            length = (period.end_date - period.start_date).days // count
+            for index in range(count):
+                start = period.start_date + timedelta(days=index * length)
+                end = period.end_date if index == count - 1 else start + timedelta(days=length - 1)
+                instances.append(Trimester(name=f"Trimestre {index + 1}", period=period, start_date=start, end_date=end))
+        for trimester in self._create(Trimester, instances):
+            trimester_map.setdefault(trimester.period_id, []).append(trimester)
+        return trimester_map
+
+    def _create_subjects(self, count):
+        return self._create(Subject, [
+            Subject(name=f"Materia {index + 1}", code=f"SYN-SUB{index + 1:03d}") for index in range(count)
+        ])
+
+    def _create_courses(self, count, year):
+        return self._create(Course, [
+            Course(name=f"Curso {index + 1}", code=f"SYN-C{index + 1:03d}", year=year, capacity=60)
+            for index in range(count)
+        ])
+
+    def _create_users(self, prefix, count):
+        users = self._create(User, [
+            User(
+                email=f"{prefix}{index}@{self.EMAIL_DOMAIN}",
+                first_name=self.random.choice(self.FIRST_NAMES),
+                last_name=f"{self.random.choice(self.LAST_NAMES)} {self.random.choice(self.LAST_NAMES)}",
+                password=self.password,
+            )
+            for index in range(count)
+        ])
+        return users
+
+    def _create_teachers(self, count):
+        users = self._create_users('teacher', count)
+        return self._create(Teacher, [
+            Teacher(user=user, teacher_id=f"SYN-T{index:05d}", years_of_experience=self.random.randint(0, 30))
+            for index, user in enumerate(users)
+        ])
+
+    def _create_students(self, count):
+        users = self._create_users('student', count)
+        return self._create(Student, [
+            Student(user=user, student_id=f"SYN-S{index:06d}") for index, user in enumerate(users)
+        ])
+
+    def _create_teacher_assignments(self, periods, courses, subjects, teachers):
+        assignments = []
+        for period in periods:
+            for course_index, course in enumerate(courses):
+                for subject_index, subject in enumerate(subjects):
+                    teacher = teachers[(course_index * len(subjects) + subject_index) % len(teachers)]
+                    assignments.append(TeacherAssignment(teacher=teacher, course=course, subject=subject, period=period))
+        self._create(TeacherAssignment, assignments)
+
+    def _create_assessment_items(self, trimester_map, courses, subjects, per_trimester):
+        instances = []
+        for period_id, trimesters in trimester_map.items():
+            for trimester in trimesters:
+                span = max(1, (trimester.end_date - trimester.start_date).days)
+                for course in courses:
+                    for subject in subjects:
+                        for index in range(per_trimester):
+                            instances.append(AssessmentItem(
+                                name=f"{subject.name} evaluacion {index + 1}",
+                                assessment_type=self.ASSESSMENT_TYPES[index % len(self.ASSESSMENT_TYPES)],
+                                date=trimester.start_date + timedelta(days=span * (index + 1) // (per_trimester + 1)),
+                                subject=subject, course=course, trimester=trimester,
+                            ))
+        items = self._create(AssessmentItem, instances)
+        period_by_trimester = {
+            trimester.pk: period_id for period_id, trimesters in trimester_map.items() for trimester in trimesters
+        }
+        return [(item, period_by_trimester[item.trimester_id]) for item in items]
+
+    def _create_daily_records(self, periods, courses, subjects, course_students, days):
+        if not days:
+            return
+        statuses = ['present'] * 17 + ['absent', 'late', 'excused']
+        levels = [level for level, _ in Participation.PARTICIPATION_LEVELS]
+        for model, field, choices in ((Attendance, 'status', statuses), (Participation, 'level', levels)):
+            self._bulk(model, (
+                model(student=student, course=course, subject=subject, period=period, date=day,
+                      **{field: self.random.choice(choices)})
+                for period in periods
+                for day in self._school_days(period, days)
+                for course in courses
+                for student in course_students[course.pk]
+                for subject in subjects
+            ))
+
+    def _school_days(self, period, count):
+        span = (period.end_date - period.start_date).days
+        return [period.start_date + timedelta(days=span * index // count) for index in range(count)]
+
+synthetic_school_service = SyntheticSchoolService()
@@ -0,0 +1,212 @@
+"""Test helpers: per-endpoint query budgets and a small seeded school.
+
+A query budget is the most queries one GET of an endpoint may run. List endpoints are requested
+with two page sizes and must run the same number of queries for both, so a query issued per
+row (an N+1) fails the test even while it still fits in the budget. Failures list the offending
+queries grouped by their normalized SQL shape, most repeated first.
+"""
+import datetime
+import re
+from collections import Counter
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from core.services.query_inspector_service import query_inspector_service
+
+
+def summarize_queries(queries):
+    """Groups captured queries by SQL shape. Returns (count, fingerprint, normalized sql), most frequent first."""
+    shapes = Counter(query_inspector_service.normalize(query['sql']) for query in queries)
+    return [
+        (count, query_inspector_service.fingerprint(normalized)[:12], normalized)
+        for normalized, count in shapes.most_common()
+    ]
+
+
+SELECT_LIST_PATTERN = re.compile(r'^SELECT (DISTINCT )?.+? FROM ', re.IGNORECASE)
+
+
+def shorten_sql(normalized, width=300):
+    """The column list is dropped so the tables and conditions fit in a failure message."""
+    return SELECT_LIST_PATTERN.sub(lambda match: f"SELECT {match.group(1) or ''}... FROM ", normalized, count=1)[:width]
+
+
+def format_query_report(queries, limit=15):
+    lines = []
+    for count, fingerprint, normalized in summarize_queries(queries)[:limit]:
+        lines.append(f"  {count:>4}x [{fingerprint}] {shorten_sql(normalized)}")
+    return '\n'.join(lines)
+
+
+@override_settings(REQUEST_METRICS_ENABLED=False, QUERY_INSPECTOR_ENABLED=False, AUDIT_LOG_BUFFERED=False)
+class QueryBudgetTestCase(APITestCase):
+    """APITestCase with assertions on the number of queries an endpoint runs.
+
+    Request metrics and the query inspector are disabled so their own queries (periodic
+    flushes, offender rows) never count against an endpoint. Authentication is not counted:
+    each request gets a freshly loaded user, as a token-authenticated request would.
+    """
+    # Both page sizes must be filled by the seeded data for the comparison to mean anything.
+    LIST_PAGE_SIZES = (1, 3)
+    budget_user = None
+
+    def authenticate(self, user):
+        self.budget_user = user
+
+    def capture(self, path, params=None):
+        if self.budget_user is not None:
+            self.client.force_authenticate(type(self.budget_user).objects.get(pk=self.budget_user.pk))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path, params or {})
+        return response, context.captured_queries
+
+    def assertQueryBudget(self, budget, path, params=None, status_code=200):
+        """GETs `path` once and fails when it runs more than `budget` queries."""
+        response, queries = self.capture(path, params)
+        self.assertEqual(response.status_code, status_code, f"GET {path}: {getattr(response, 'data', response)}")
+        if len(queries) > budget:
+            self.fail(
+                f"GET {path} ran {len(queries)} queries, budget is {budget}:\n{format_query_report(queries)}"
+            )
+        return response
+
+    def assertListQueryBudget(self, budget, path, params=None, page_sizes=None):
+        """GETs a paginated list with each page size; fails when any run exceeds `budget` or the
+        number of queries changes with the page size."""
+        page_sizes = page_sizes or self.LIST_PAGE_SIZES
+        runs = []
+        for page_size in page_sizes:
+            response, queries = self.capture(path, {**(params or {}), 'page_size': page_size})
+            self.assertEqual(response.status_code, 200, f"GET {path}: {getattr(response, 'data', response)}")
+            items = response.data['items']
+            self.assertEqual(
+                len(items), page_size,
+                f"GET {path} returned {len(items)} rows for page_size={page_size}; seed more rows so the page is full"
+            )
+            runs.append((page_size, queries))
+
+        problems = []
+        for page_size, queries in runs:
+            if len(queries) > budget:
+                problems.append(
+                    f"GET {path}?page_size={page_size} ran {len(queries)} queries, budget is {budget}:\n"
+                    f"{format_query_report(queries)}"
+                )
+        (small_size, small_queries), (large_size, large_queries) = runs[0], runs[-1]
+        if len(large_queries) != len(small_queries):
+            small_shapes = {fingerprint: count for count, fingerprint, _ in summarize_queries(small_queries)}
+            growing = [
+                f"  {small_shapes.get(fingerprint, 0):>4}x -> {count}x [{fingerprint}] {shorten_sql(normalized)}"
+                for count, fingerprint, normalized in summarize_queries(large_queries)
+                if count > small_shapes.get(fingerprint, 0)
+            ]
+            problems.append(
+                f"GET {path} ran {len(small_queries)} queries for page_size={small_size} and "
+                f"{len(large_queries)} for page_size={large_size}; queries issued per row:\n" + '\n'.join(growing)
+            )
+        if problems:
+            self.fail('\n\n'.join(problems))
+
+
+def seed_school(courses=3, students_per_course=4, subjects=3, trimesters=3, assessments_per_subject=2, days=2):
+    """Creates an active period split in trimesters plus two closed periods, `courses` courses with
+    one teacher each teaching every subject, enrolled students with grades, attendance,
+    participation and a bulletin each in the first trimester, and an admin user.
+
+    Returns a dict with the created objects, keyed by name.
+    """
+    from app.academic.models import (
+        AssessmentItem, Attendance, Course, Enrollment, Grade, Participation, Period, Subject,
+        TeacherAssignment, Trimester,
+    )
+    from app.authentication.models import Student, Teacher, User
+    from app.reports.models import Bulletin
+
+    admin = User.objects.create_superuser(email='admin@school.test', password='x', first_name='Ada', last_name='Admin')
+    for year in (2023, 2024):
+        Period.objects.create(
+            name=f'Gestion {year}', start_date=datetime.date(year, 2, 1), end_date=datetime.date(year, 11, 30), is_active=False
+        )
+    period = Period.objects.create(
+        name='Gestion 2025', start_date=datetime.date(2025, 2, 1), end_date=datetime.date(2025, 11, 30), is_active=True
+    )
+    trimester_list = [
+        Trimester.objects.create(
+            name=f'Trimestre {index + 1}', period=period,
+            start_date=datetime.date(2025, 2 + index * 3, 1), end_date=datetime.date(2025, 4 + index * 3, 28)
+        )
+        for index in range(trimesters)
+    ]
+    trimester = trimester_list[0]
+    subject_list = [Subject.objects.create(name=f'Subject {index}', code=f'SUB{index}') for index in range(subjects)]
+
+    course_list = []
+    teacher_list = []
+    student_list = []
+    items = []
+    for course_index in range(courses):
+        course = Course.objects.create(name=f'{course_index + 1}A', code=f'C{course_index + 1}A', year=2025)
+        course_list.append(course)
+        teacher_user = User.objects.create_user(
+            email=f'teacher{course_index}@school.test', password='x', first_name=f'Teacher{course_index}', last_name='Test'
+        )
+        teacher = Teacher.objects.create(user=teacher_user, teacher_id=f'T{course_index:03d}')
+        teacher_list.append(teacher)
+        for subject in subject_list:
+            TeacherAssignment.objects.create(teacher=teacher, course=course, subject=subject, period=period)
+        course_items = [
+            AssessmentItem.objects.create(
+                name=f'{subject.code} exam {index}', date=datetime.date(2025, 3, index + 1),
+                subject=subject, course=course, trimester=trimester
+            )
+            for subject in subject_list
+            for index in range(assessments_per_subject)
+        ]
+        items.extend(course_items)
+
+        course_students = []
+        for index in range(students_per_course):
+            number = len(student_list) + len(course_students)
+            user = User.objects.create_user(
+                email=f'student{number}@school.test', password='x', first_name=f'Student{number:03d}', last_name='Test'
+            )
+            course_students.append(Student.objects.create(user=user, student_id=f'S{number:04d}'))
+        student_list.extend(course_students)
+
+        Enrollment.objects.bulk_create([
+            Enrollment(student=student, course=course, subject=subject, period=period)
+            for student in course_students for subject in subject_list
+        ])
+        Grade.objects.bulk_create([
+            Grade(student=student, subject=item.subject, period=period, assessment_item=item, value=60 + (index * 7) % 40)
+            for index, student in enumerate(course_students) for item in course_items
+        ])
+        dates = [datetime.date(2025, 3, day + 1) for day in range(days)]
+        Attendance.objects.bulk_create([
+            Attendance(student=student, course=course, subject=subject, period=period, date=date)
+            for student in course_students for subject in subject_list for date in dates
+        ])
+        Participation.objects.bulk_create([
+            Participation(student=student, course=course, subject=subject, period=period, date=date)
+            for student in course_students for subject in subject_list for date in dates
+        ])
+
+    Bulletin.objects.bulk_create([
+        Bulletin(student=student, trimester=trimester, status=Bulletin.StatusChoices.COMPLETED, overall_average=75)
+        for student in student_list
+    ])
+
+    return {
+        'admin': admin,
+        'period': period,
+        'trimester': trimester,
+        'trimesters': trimester_list,
+        'courses': course_list,
+        'teachers': teacher_list,
+        'subjects': subject_list,
+        'students': student_list,
+        'assessment_items': items,
+    }
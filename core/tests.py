@@ -1,3 +1,87 @@
-from django.test import TestCase
+from django.urls import path
+from django.test import override_settings
+from rest_framework import generics
 
-# Create your tests here.
+from core.models import DatabaseJob, LoggerService
+from core.pagination import CustomPagination
+from core.serializers.logger_service_serializer import LoggerServiceSerializer
+from core.testing import QueryBudgetTestCase, seed_school, summarize_queries
+
+
+class UnoptimizedLogList(generics.ListAPIView):
+    # No select_related('user'): every row loads its user on its own.
+    queryset = LoggerService.objects.order_by('-created_at', '-id')
+    serializer_class = LoggerServiceSerializer
+    pagination_class = CustomPagination
+
+
+urlpatterns = [
+    path('unoptimized-logs/', UnoptimizedLogList.as_view()),
+]
+
+
+def create_logs(users):
+    LoggerService.objects.bulk_create([
+        LoggerService(user=user, action='UPDATE', table_name='academic_grade', description=f'Grade changed by {user.email}')
+        for user in users
+    ])
+
+
+class QueryBudgetAssertionTests(QueryBudgetTestCase):
+    """The budget assertions themselves: an N+1 fails even within budget and is reported by SQL shape."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = seed_school(courses=1, students_per_course=4)
+        create_logs([student.user for student in cls.school['students']])
+
+    def setUp(self):
+        self.authenticate(self.school['admin'])
+
+    @override_settings(ROOT_URLCONF='core.tests')
+    def test_per_row_queries_fail_with_their_fingerprint(self):
+        with self.assertRaises(AssertionError) as raised:
+            self.assertListQueryBudget(100, '/unoptimized-logs/')
+        message = str(raised.exception)
+        self.assertIn('ran 3 queries for page_size=1 and 5 for page_size=3', message)
+        self.assertIn('1x -> 3x', message)
+        self.assertIn('FROM "authentication_user"', message)
+
+    @override_settings(ROOT_URLCONF='core.tests')
+    def test_budget_exceeded_lists_queries(self):
+        with self.assertRaises(AssertionError) as raised:
+            self.assertQueryBudget(2, '/unoptimized-logs/', {'page_size': 3})
+        self.assertIn('ran 5 queries, budget is 2', str(raised.exception))
+
+    def test_summarize_groups_by_shape(self):
+        queries = [
+            {'sql': 'SELECT * FROM "authentication_user" WHERE "id" = 1'},
+            {'sql': 'SELECT * FROM "authentication_user" WHERE "id" = 2'},
+            {'sql': "SELECT * FROM \"core_loggerservice\" WHERE \"action\" = 'UPDATE'"},
+        ]
+        summary = summarize_queries(queries)
+        self.assertEqual([count for count, _, _ in summary], [2, 1])
+        self.assertEqual(summary[0][2], 'SELECT * FROM "authentication_user" WHERE "id" = ?')
+
+
+class CoreQueryBudgetTests(QueryBudgetTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = seed_school(courses=1, students_per_course=4)
+        create_logs([student.user for student in cls.school['students']])
+        DatabaseJob.objects.bulk_create([
+            DatabaseJob(job_type=DatabaseJob.JobTypeChoices.BACKUP, created_by=cls.school['admin'])
+            for _ in range(4)
+        ])
+
+    def setUp(self):
+        self.authenticate(self.school['admin'])
+
+    def test_logs(self):
+        self.assertListQueryBudget(2, '/api/core/logs/')
+        self.assertListQueryBudget(1, '/api/core/logs/', {'pagination': 'cursor'})
+        self.assertQueryBudget(1, f'/api/core/logs/{LoggerService.objects.first().pk}/')
+
+    def test_database_jobs(self):
+        self.assertListQueryBudget(2, '/api/core/database/jobs/')
+        self.assertQueryBudget(1, f'/api/core/database/jobs/{DatabaseJob.objects.first().pk}/')
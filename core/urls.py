@@ -1,18 +1,28 @@
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
-from .viewsets import LoggerServiceViewSet
+from .viewsets import LoggerServiceViewSet, DatabaseJobViewSet
+from .views import signed_download, metrics
 from .viewsets import (
     DatabaseBackupDownloadView,
+    DatabaseBackupDownloadLinkView,
     DatabaseBackupRestoreView,
-    DatabaseRestoreView
+    DatabaseRestoreView,
+    RequestMetricsView,
+    QueryOffenderView
 )
 
 router = DefaultRouter()
 router.register(r'logs', LoggerServiceViewSet, basename='log')
+router.register(r'database/jobs', DatabaseJobViewSet, basename='database-job')
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('downloads/<str:token>/', signed_download, name='signed-download'),
     path('database/backup-restore/', DatabaseBackupRestoreView.as_view(), name='database-backup-restore'),
     path('database/backup-download/<str:filename>/', DatabaseBackupDownloadView.as_view(), name='database-backup-download'),
+    path('database/backup-download-link/<str:filename>/', DatabaseBackupDownloadLinkView.as_view(), name='database-backup-download-link'),
     path('database/restore/', DatabaseRestoreView.as_view(), name='database-restore'),
+    path('performance/requests/', RequestMetricsView.as_view(), name='performance-requests'),
+    path('performance/queries/', QueryOffenderView.as_view(), name='performance-queries'),
+    re_path(r'^metrics/?$', metrics, name='metrics'),
 ]
\ No newline at end of file
@@ -0,0 +1,66 @@
+from django.http import HttpResponse, StreamingHttpResponse
+
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def parse_range_header(range_header, size):
+    """Parses a single-range 'bytes=' header. Returns (start, end), None when absent or
+    unsupported (serve the whole file), or False when the range cannot be satisfied."""
+    if not range_header or not range_header.startswith('bytes=') or ',' in range_header:
+        return None
+    start_value, _, end_value = range_header[len('bytes='):].strip().partition('-')
+    try:
+        if start_value:
+            start = int(start_value)
+            if end_value and int(end_value) < start:
+                return None
+            end = min(int(end_value), size - 1) if end_value else size - 1
+        else:
+            suffix_length = int(end_value)
+            if suffix_length <= 0:
+                return False
+            start = max(size - suffix_length, 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        return False
+    return start, end
+
+
+def iter_file_range(source, length):
+    try:
+        remaining = length
+        while remaining > 0:
+            chunk = source.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        source.close()
+
+
+def range_not_satisfiable_response(size):
+    response = HttpResponse(status=416)
+    response['Content-Range'] = f'bytes */{size}'
+    return response
+
+
+def ranged_file_response(storage, filename, size, byte_range, content_type):
+    """Streams a file from a backup storage backend in chunks, either whole or the (start, end)
+    range returned by parse_range_header, as an attachment."""
+    start, end = byte_range or (0, size - 1)
+    source = storage.open_read(filename, start=start, end=end) if byte_range else storage.open_read(filename)
+    response = StreamingHttpResponse(
+        iter_file_range(source, end - start + 1),
+        status=206 if byte_range else 200,
+        content_type=content_type
+    )
+    response['Content-Length'] = str(end - start + 1)
+    response['Accept-Ranges'] = 'bytes'
+    if byte_range:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,39 @@
+import hmac
+
+from django.conf import settings
+from django.core import signing
+from django.http import FileResponse, Http404, HttpResponse
+
+from base.storage import load_signed_download
+
+
+def signed_download(request, token):
+    try:
+        storage, name, filename = load_signed_download(token)
+    except signing.BadSignature:
+        raise Http404('Download link is invalid or has expired.')
+
+    if not storage.exists(name):
+        raise Http404('File not found.')
+
+    return FileResponse(
+        storage.open(name, 'rb'),
+        as_attachment=bool(filename),
+        filename=filename or name.split('/')[-1],
+    )
+
+
+def metrics(request):
+    """Prometheus text exposition. Authorized with `Authorization: Bearer <METRICS_AUTH_TOKEN>`
+    or a staff session."""
+    token = settings.METRICS_AUTH_TOKEN
+    authorization = request.META.get('HTTP_AUTHORIZATION', '')
+    token_ok = bool(token) and hmac.compare_digest(authorization.encode(), f'Bearer {token}'.encode())
+    if not token_ok and not (request.user.is_authenticated and request.user.is_staff):
+        return HttpResponse('Forbidden', status=403, content_type='text/plain')
+    if not settings.PROMETHEUS_METRICS_ENABLED:
+        raise Http404('Metrics are disabled.')
+
+    from core.metrics import render_metrics
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
@@ -1,2 +1,5 @@
 from core.viewsets.logger_service_viewset import LoggerServiceViewSet
-from core.viewsets.database_viewset import DatabaseBackupDownloadView, DatabaseBackupRestoreView, DatabaseRestoreView
\ No newline at end of file
+from core.viewsets.database_job_viewset import DatabaseJobViewSet
+from core.viewsets.database_viewset import DatabaseBackupDownloadView, DatabaseBackupDownloadLinkView, DatabaseBackupRestoreView, DatabaseRestoreView
+from core.viewsets.request_metrics_viewset import RequestMetricsView
+from core.viewsets.query_offender_viewset import QueryOffenderView
\ No newline at end of file
@@ -0,0 +1,20 @@
+from rest_framework import viewsets, permissions
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from ..models import DatabaseJob
+from ..serializers import DatabaseJobSerializer
+from core.pagination import CustomPagination
+
+@extend_schema(
+    tags=['Database'],
+    description='Status of background backup and restore jobs. Poll a job by id until it is completed or failed.',
+    parameters=[
+        OpenApiParameter(name='status', description='Filter by status (pending, running, completed, failed)', required=False, type=str),
+        OpenApiParameter(name='job_type', description='Filter by job type (backup, restore)', required=False, type=str),
+    ]
+)
+class DatabaseJobViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = DatabaseJob.objects.select_related('created_by')
+    serializer_class = DatabaseJobSerializer
+    permission_classes = [permissions.IsAdminUser]
+    pagination_class = CustomPagination
+    filterset_fields = ['status', 'job_type']
@@ -1,14 +1,4 @@
-import os
-import uuid
-import subprocess
-import tempfile
-import boto3
-import platform
-import shutil
-from datetime import datetime
-
 from django.conf import settings
-from django.http import HttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -16,66 +6,80 @@ from rest_framework.permissions import IsAdminUser
 from drf_spectacular.utils import extend_schema, OpenApiExample
 
 from core.models import LoggerService
+from core.services import database_backup_service, database_job_service
+from core.utils import parse_range_header, range_not_satisfiable_response, ranged_file_response
+
+
+def _backup_download_url(filename):
+    return f"/api/core/database/backup-download/{filename}"
+
+
+def _job_accepted_response(job, detail, **extra):
+    return Response(
+        {
+            'detail': detail,
+            'job_id': job.pk,
+            'status': job.status,
+            'status_url': f"/api/core/database/jobs/{job.pk}/",
+            **extra
+        },
+        status=status.HTTP_202_ACCEPTED
+    )
+
+
+def _get_jobs_param(request):
+    jobs = request.data.get('jobs')
+    if jobs in (None, ''):
+        return None, None
+    try:
+        jobs = int(jobs)
+    except (TypeError, ValueError):
+        jobs = 0
+    if jobs < 1:
+        return None, Response({'error': 'jobs must be a positive integer'}, status=status.HTTP_400_BAD_REQUEST)
+    return jobs, None
 
 
 class DatabaseBackupRestoreView(APIView):
     permission_classes = [IsAdminUser]
-    backup_prefix = 'database_backups/'
-    
-    def _get_s3_client(self):
-        return boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_S3_REGION_NAME
-        )
-    
-    def _get_db_settings(self):
-        db_settings = settings.DATABASES['default']
-        return {
-            'name': db_settings['NAME'],
-            'user': db_settings['USER'],
-            'password': db_settings['PASSWORD'],
-            'host': db_settings['HOST'],
-            'port': db_settings['PORT'],
-        }
-    
-    def _find_pg_binary(self, binary_name):
-        pg_binary = shutil.which(binary_name)
-        if pg_binary:
-            return pg_binary
-
-        if platform.system() == 'Windows':
-            possible_paths = []
-            for version in range(10, 21):
-                possible_paths.append(f"C:\\Program Files\\PostgreSQL\\{version}\\bin\\{binary_name}.exe")
-            for major in range(10, 21):
-                for minor in range(0, 11):
-                    possible_paths.append(f"C:\\Program Files\\PostgreSQL\\{major}.{minor}\\bin\\{binary_name}.exe")
-            possible_paths.extend([
-                f"C:\\Program Files\\PostgreSQL\\bin\\{binary_name}.exe",
-                f"C:\\PostgreSQL\\bin\\{binary_name}.exe",
-                f"C:\\Program Files (x86)\\PostgreSQL\\bin\\{binary_name}.exe",
-                f"C:\\Program Files\\EnterpriseDB\\PostgreSQL\\bin\\{binary_name}.exe"
-            ])
-            for path in possible_paths:
-                if os.path.isfile(path):
-                    return path
-            return None
-        else:
-            return None
-    
+
     @extend_schema(
         tags=['Database'],
         summary="Create database backup",
-        description="Creates a SQL backup file of the current database state in S3",
+        description=(
+            "Queues a backup of the current database state and returns the job id immediately. "
+            "The run_database_jobs worker compresses pg_dump output on the fly (gzip or zstd) and streams it "
+            "into a multipart upload. Poll /api/core/database/jobs/{id}/ for status and progress."
+        ),
+        request={
+            'application/json': {
+                'type': 'object',
+                'properties': {
+                    'compression': {
+                        'type': 'string',
+                        'enum': list(database_backup_service.COMPRESSION_EXTENSIONS),
+                        'description': 'Compression codec for plain backups, defaults to BACKUP_COMPRESSION'
+                    },
+                    'backup_format': {
+                        'type': 'string',
+                        'enum': list(database_backup_service.FORMAT_EXTENSIONS),
+                        'description': 'plain (psql restore), custom or directory (parallel pg_restore). Defaults to plain'
+                    },
+                    'jobs': {
+                        'type': 'integer',
+                        'description': 'Parallel pg_dump jobs for directory backups, defaults to BACKUP_PARALLEL_JOBS'
+                    }
+                }
+            }
+        },
         responses={
-            200: OpenApiExample(
-                'Backup Created',
+            202: OpenApiExample(
+                'Backup Queued',
                 value={
-                    'detail': 'Database backup created successfully',
-                    'filename': 'backup_20250517_123045.sql',
-                    'download_url': '/api/core/database/backup-download/backup_20250517_123045.sql'
+                    'detail': 'Database backup job queued',
+                    'job_id': 42,
+                    'status': 'pending',
+                    'status_url': '/api/core/database/jobs/42/'
                 },
                 response_only=True,
             ),
@@ -87,109 +91,44 @@ class DatabaseBackupRestoreView(APIView):
         }
     )
     def post(self, request):
-        try:
-            db_settings = self._get_db_settings()
-            
-            pg_dump_path = self._find_pg_binary('pg_dump')
-            if not pg_dump_path:
-                return Response(
-                    {
-                        'error': 'PostgreSQL pg_dump utility not found',
-                        'details': 'Asegúrate de que pg_dump esté instalado y en el PATH del sistema en el servidor. Para Railway, revisa tu configuración de Nixpacks o Dockerfile para incluir las utilidades cliente de PostgreSQL.'
-                    },
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_filename = f"backup_{timestamp}.sql"
-            s3_path = f"{self.backup_prefix}{backup_filename}"
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.sql') as temp_file:
-                temp_path = temp_file.name
-            
-            try:
-                env = os.environ.copy()
-                if db_settings['password']:
-                    env['PGPASSWORD'] = db_settings['password']
-                
-                connection_string = f"postgresql://{db_settings['user']}:{db_settings['password']}@{db_settings['host']}:{db_settings['port']}/{db_settings['name']}?sslmode=require"
-                
-                cmd = [
-                    pg_dump_path,
-                    '-d', connection_string,
-                    '--format=plain',
-                    '--no-owner',
-                    '--no-acl',
-                    '--file', temp_path
-                ]
-                
-                process = subprocess.run(
-                    cmd,
-                    env=env,
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                
-                if process.returncode != 0:
-                    raise Exception(f"pg_dump failed: {process.stderr}")
-                
-                s3_client = self._get_s3_client()
-                with open(temp_path, 'rb') as f:
-                    s3_client.upload_fileobj(
-                        f, 
-                        settings.AWS_STORAGE_BUCKET_NAME, 
-                        s3_path
-                    )
-                
-                LoggerService.objects.create(
-                    user=request.user,
-                    action='BACKUP',
-                    table_name='Database',
-                    description=f'Created database backup in S3: {backup_filename}'
-                )
-                
-                download_url = f"/api/core/database/backup-download/{backup_filename}"
-                return Response({
-                    'detail': 'Database backup created successfully',
-                    'filename': backup_filename,
-                    'download_url': download_url
-                })
-                
-            finally:
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
-                    
-        except Exception as e:
-            try:
-                LoggerService.objects.create(
-                    user=request.user,
-                    action='ERROR',
-                    table_name='Database',
-                    description=f'Backup error: {str(e)}'
-                )
-            except Exception:
-                pass
-                
+        compression = request.data.get('compression') or None
+        if compression and compression not in database_backup_service.COMPRESSION_EXTENSIONS:
             return Response(
-                {'error': 'Failed to create database backup', 'details': str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {'error': f"Invalid compression. Use one of: {', '.join(database_backup_service.COMPRESSION_EXTENSIONS)}"},
+                status=status.HTTP_400_BAD_REQUEST
             )
-    
+
+        backup_format = request.data.get('backup_format') or 'plain'
+        if backup_format not in database_backup_service.FORMAT_EXTENSIONS:
+            return Response(
+                {'error': f"Invalid backup format. Use one of: {', '.join(database_backup_service.FORMAT_EXTENSIONS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        jobs, error_response = _get_jobs_param(request)
+        if error_response:
+            return error_response
+
+        job = database_job_service.enqueue_backup(
+            request.user, compression=compression, backup_format=backup_format, jobs=jobs
+        )
+        return _job_accepted_response(job, 'Database backup job queued')
+
     @extend_schema(
         tags=['Database'],
         summary="List available backups",
-        description="Returns a list of available database backup files in S3",
+        description="Returns a list of available database backup files in the backup storage",
         responses={
             200: OpenApiExample(
                 'Backup List',
                 value={
                     'backups': [
                         {
-                            'filename': 'backup_20250517_123045.sql',
-                            'size_mb': 15.4,
+                            'filename': 'backup_20250517_123045.sql.gz',
+                            'size_mb': 3.0,
                             'created_at': '2025-05-17T12:30:45',
-                            'download_url': '/api/core/database/backup-download/backup_20250517_123045.sql'
+                            'download_url': '/api/core/database/backup-download/backup_20250517_123045.sql.gz',
+                            'download_link_url': '/api/core/database/backup-download-link/backup_20250517_123045.sql.gz'
                         }
                     ]
                 },
@@ -204,47 +143,29 @@ class DatabaseBackupRestoreView(APIView):
     )
     def get(self, request):
         try:
-            s3_client = self._get_s3_client()
-            
-            response = s3_client.list_objects_v2(
-                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-                Prefix=self.backup_prefix
-            )
-            
-            backups = []
-            if 'Contents' in response:
-                for obj in response['Contents']:
-                    if obj['Key'] == self.backup_prefix:
-                        continue
-                    
-                    filename = obj['Key'].replace(self.backup_prefix, '')
-                    
-                    if not filename or not filename.endswith('.sql'):
-                        continue
-                        
-                    size_mb = round(obj['Size'] / (1024 * 1024), 2)
-                    
-                    backups.append({
-                        'filename': filename,
-                        'size_mb': size_mb,
-                        'created_at': obj['LastModified'].isoformat(),
-                        'download_url': f"/api/core/database/backup-download/{filename}"
-                    })
-            
-            backups = sorted(backups, key=lambda x: x['created_at'], reverse=True)
-            
+            backups = [
+                {
+                    'filename': backup['filename'],
+                    'size_mb': round(backup['size'] / (1024 * 1024), 2),
+                    'created_at': backup['last_modified'].isoformat(),
+                    'download_url': _backup_download_url(backup['filename']),
+                    'download_link_url': f"/api/core/database/backup-download-link/{backup['filename']}"
+                }
+                for backup in database_backup_service.list_backups()
+            ]
+
             return Response({'backups': backups})
-            
+
         except Exception as e:
             return Response(
-                {'error': 'Failed to retrieve backup list from S3', 'details': str(e)},
+                {'error': 'Failed to retrieve backup list', 'details': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
     @extend_schema(
         tags=['Database'],
         summary="Delete backup file",
-        description="Deletes a specific database backup from S3",
+        description="Deletes a specific database backup from the backup storage",
         request={
             'application/json': {
                 'type': 'object',
@@ -283,42 +204,32 @@ class DatabaseBackupRestoreView(APIView):
     def delete(self, request):
         try:
             data = request.data
-            
+
             if 'filename' not in data:
                 return Response(
                     {'error': 'No filename provided'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
+
             filename = data['filename']
-            s3_path = f"{self.backup_prefix}{filename}"
-            
-            s3_client = self._get_s3_client()
-            try:
-                s3_client.head_object(
-                    Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-                    Key=s3_path
-                )
-            except Exception:
+            storage = database_backup_service.storage
+            if not database_backup_service.is_backup_filename(filename) or not storage.exists(filename):
                 return Response(
-                    {'error': 'Backup file not found in S3'},
+                    {'error': 'Backup file not found'},
                     status=status.HTTP_404_NOT_FOUND
                 )
-            
-            s3_client.delete_object(
-                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-                Key=s3_path
-            )
-            
+
+            storage.delete(filename)
+
             LoggerService.objects.create(
                 user=request.user,
                 action='DELETE',
                 table_name='Database',
-                description=f'Deleted database backup from S3: {filename}'
+                description=f'Deleted database backup: {filename}'
             )
-            
+
             return Response({'detail': 'Backup file deleted successfully'})
-            
+
         except Exception as e:
             try:
                 LoggerService.objects.create(
@@ -329,7 +240,7 @@ class DatabaseBackupRestoreView(APIView):
                 )
             except Exception:
                 pass
-                
+
             return Response(
                 {'error': 'Failed to delete backup file', 'details': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -338,20 +249,14 @@ class DatabaseBackupRestoreView(APIView):
 
 class DatabaseBackupDownloadView(APIView):
     permission_classes = [IsAdminUser]
-    backup_prefix = 'database_backups/'
-    
-    def _get_s3_client(self):
-        return boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_S3_REGION_NAME
-        )
-    
+
     @extend_schema(
         tags=['Database'],
         summary="Download backup file",
-        description="Downloads a specific database backup SQL file from S3",
+        description=(
+            "Streams a specific database backup file from the backup storage in fixed-size chunks. "
+            "Supports single HTTP Range requests (206 Partial Content) so interrupted downloads can resume."
+        ),
         parameters=[
             {
                 'name': 'filename',
@@ -367,6 +272,11 @@ class DatabaseBackupDownloadView(APIView):
                 value="SQL file download",
                 response_only=True,
             ),
+            206: OpenApiExample(
+                'Partial Download',
+                value="Requested byte range of the backup file",
+                response_only=True,
+            ),
             400: OpenApiExample(
                 'Bad Request',
                 value={'error': 'Filename parameter is required'},
@@ -377,6 +287,11 @@ class DatabaseBackupDownloadView(APIView):
                 value={'error': 'Backup file not found'},
                 response_only=True,
             ),
+            416: OpenApiExample(
+                'Range Not Satisfiable',
+                value="",
+                response_only=True,
+            ),
         }
     )
     def get(self, request, filename=None):
@@ -386,116 +301,151 @@ class DatabaseBackupDownloadView(APIView):
                     {'error': 'Filename parameter is required', 'usage': '/api/core/database/backup-download/{filename}'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-                
-            s3_path = f"{self.backup_prefix}{filename}"
-            s3_client = self._get_s3_client()
-            
-            try:
-                s3_client.head_object(
-                    Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-                    Key=s3_path
+
+            storage = database_backup_service.storage
+            if not database_backup_service.is_backup_filename(filename):
+                return Response(
+                    {'error': 'Backup file not found'},
+                    status=status.HTTP_404_NOT_FOUND
                 )
+            try:
+                size = storage.size(filename)
             except Exception:
                 return Response(
-                    {'error': 'Backup file not found in S3'},
+                    {'error': 'Backup file not found'},
                     status=status.HTTP_404_NOT_FOUND
                 )
-            
+
+            byte_range = parse_range_header(request.META.get('HTTP_RANGE'), size)
+            if byte_range is False:
+                return range_not_satisfiable_response(size)
+
+            if not byte_range:
+                try:
+                    LoggerService.objects.create(
+                        user=request.user,
+                        action='DOWNLOAD',
+                        table_name='Database',
+                        description=f'Downloaded backup file: {filename}'
+                    )
+                except Exception:
+                    pass
+
+            content_type = 'application/sql' if filename.endswith('.sql') else 'application/octet-stream'
+            return ranged_file_response(storage, filename, size, byte_range, content_type)
+
+        except Exception as e:
+            return Response(
+                {'error': 'Failed to download backup file', 'details': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class DatabaseBackupDownloadLinkView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        tags=['Database'],
+        summary="Get a pre-signed download link for a backup",
+        description=(
+            "Returns a short-lived pre-signed URL for the backup file so the client downloads it "
+            "directly from storage instead of through the API server."
+        ),
+        parameters=[
+            {
+                'name': 'filename',
+                'in': 'path',
+                'required': True,
+                'description': 'Name of the backup file to download',
+                'schema': {'type': 'string'}
+            }
+        ],
+        responses={
+            200: OpenApiExample(
+                'Download Link',
+                value={
+                    'filename': 'backup_20250517_123045.sql.gz',
+                    'url': 'https://bucket.s3.amazonaws.com/database_backups/backup_20250517_123045.sql.gz?X-Amz-Signature=...',
+                    'expires_in': 300
+                },
+                response_only=True,
+            ),
+            404: OpenApiExample(
+                'Not Found',
+                value={'error': 'Backup file not found'},
+                response_only=True,
+            ),
+        }
+    )
+    def get(self, request, filename=None):
+        try:
+            storage = database_backup_service.storage
+            if not database_backup_service.is_backup_filename(filename) or not storage.exists(filename):
+                return Response(
+                    {'error': 'Backup file not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
+            expires_in = settings.SIGNED_URL_EXPIRE_SECONDS
+            url = request.build_absolute_uri(storage.download_url(filename, expire=expires_in))
+
             try:
                 LoggerService.objects.create(
                     user=request.user,
                     action='DOWNLOAD',
                     table_name='Database',
-                    description=f'Downloaded backup file from S3: {filename}'
+                    description=f'Issued download link for backup file: {filename}'
                 )
             except Exception:
                 pass
-                
-            file_obj = s3_client.get_object(
-                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-                Key=s3_path
-            )
-            file_content = file_obj['Body'].read()
-            
-            response = HttpResponse(file_content, content_type='application/sql')
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            return response
-            
+
+            return Response({'filename': filename, 'url': url, 'expires_in': expires_in})
+
         except Exception as e:
             return Response(
-                {'error': 'Failed to download backup file from S3', 'details': str(e)},
+                {'error': 'Failed to create download link for backup file', 'details': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
 
 class DatabaseRestoreView(APIView):
     permission_classes = [IsAdminUser]
-    backup_prefix = 'database_backups/'
-    
-    def _get_s3_client(self):
-        return boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_S3_REGION_NAME
-        )
-    
-    def _get_db_settings(self):
-        db_settings = settings.DATABASES['default']
-        return {
-            'name': db_settings['NAME'],
-            'user': db_settings['USER'],
-            'password': db_settings['PASSWORD'],
-            'host': db_settings['HOST'],
-            'port': db_settings['PORT'],
-        }
-    
-    def _find_pg_binary(self, binary_name):
-        pg_binary = shutil.which(binary_name)
-        if pg_binary:
-            return pg_binary
-
-        if platform.system() == 'Windows':
-            possible_paths = []
-            for version in range(10, 21):
-                possible_paths.append(f"C:\\Program Files\\PostgreSQL\\{version}\\bin\\{binary_name}.exe")
-            for major in range(10, 21):
-                for minor in range(0, 11):
-                    possible_paths.append(f"C:\\Program Files\\PostgreSQL\\{major}.{minor}\\bin\\{binary_name}.exe")
-            possible_paths.extend([
-                f"C:\\Program Files\\PostgreSQL\\bin\\{binary_name}.exe",
-                f"C:\\PostgreSQL\\bin\\{binary_name}.exe",
-                f"C:\\Program Files (x86)\\PostgreSQL\\bin\\{binary_name}.exe",
-                f"C:\\Program Files\\EnterpriseDB\\PostgreSQL\\bin\\{binary_name}.exe"
-            ])
-            for path in possible_paths:
-                if os.path.isfile(path):
-                    return path
-            return None
-        else:
-            return None
-    
+
     @extend_schema(
         tags=['Database'],
         summary="Restore database from backup",
-        description="Restores the database from an uploaded backup file",
+        description=(
+            "Stores the uploaded backup file in the backup storage and queues a restore job from it. "
+            "Plain dumps (.sql, .sql.gz, .sql.zst) are streamed into psql; custom (.dump) and directory (.tar) "
+            "archives are restored with pg_restore --jobs. Poll /api/core/database/jobs/{id}/ for status."
+        ),
         request={
             'multipart/form-data': {
                 'type': 'object',
                 'properties': {
                     'backup_file': {
-                        'type': 'string', 
+                        'type': 'string',
                         'format': 'binary',
-                        'description': 'SQL backup file to restore from'
+                        'description': 'Backup file to restore from (.sql, .sql.gz, .sql.zst, .dump or .tar)'
+                    },
+                    'jobs': {
+                        'type': 'integer',
+                        'description': 'Parallel pg_restore jobs for .dump/.tar uploads'
                     }
                 },
                 'required': ['backup_file']
             }
         },
         responses={
-            200: OpenApiExample(
-                'Restore Success',
-                value={'detail': 'Database restored successfully'},
+            202: OpenApiExample(
+                'Restore Queued',
+                value={
+                    'detail': 'Database restore job queued',
+                    'job_id': 43,
+                    'status': 'pending',
+                    'status_url': '/api/core/database/jobs/43/',
+                    'filename': 'backup_20250517_123045.sql.gz'
+                },
                 response_only=True,
             ),
             400: OpenApiExample(
@@ -511,108 +461,42 @@ class DatabaseRestoreView(APIView):
         }
     )
     def post(self, request):
+        if 'backup_file' not in request.FILES:
+            return Response(
+                {'error': 'No backup file provided'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        backup_file = request.FILES['backup_file']
+
+        jobs, error_response = _get_jobs_param(request)
+        if error_response:
+            return error_response
+
+        if not database_backup_service.is_backup_filename(backup_file.name):
+            return Response(
+                {'error': f"Invalid backup file format. Must be one of: {', '.join(database_backup_service.BACKUP_EXTENSIONS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
-            psql_path = self._find_pg_binary('psql')
-            if not psql_path:
-                return Response(
-                    {
-                        'error': 'PostgreSQL psql utility not found',
-                        'details': 'Asegúrate de que psql esté instalado y en el PATH del sistema en el servidor. Para Railway, revisa tu configuración de Nixpacks o Dockerfile para incluir las utilidades cliente de PostgreSQL.'
-                    },
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-            
-            if 'backup_file' not in request.FILES:
-                return Response(
-                    {'error': 'No backup file provided'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            backup_file = request.FILES['backup_file']
-            
-            if not backup_file.name.endswith('.sql'):
-                return Response(
-                    {'error': 'Invalid backup file format. Must be a .sql file'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.sql') as temp_file:
-                for chunk in backup_file.chunks():
-                    temp_file.write(chunk)
-                temp_path = temp_file.name
-            
-            try:
-                db_settings = self._get_db_settings()
-                
-                env = os.environ.copy()
-                if db_settings['password']:
-                    env['PGPASSWORD'] = db_settings['password']
-                
-                connection_string = f"postgresql://{db_settings['user']}:{db_settings['password']}@{db_settings['host']}:{db_settings['port']}/{db_settings['name']}?sslmode=require"
-                
-                cmd = [
-                    psql_path,
-                    '-d', connection_string,
-                    '-f', temp_path,
-                    '--single-transaction'
-                ]
-                
-                process = subprocess.run(
-                    cmd,
-                    env=env,
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                
-                if process.returncode != 0:
-                    raise Exception(f"psql restore failed: {process.stderr}")
-                
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                s3_filename = f"backup_{timestamp}.sql"
-                s3_path = f"{self.backup_prefix}{s3_filename}"
-                
-                s3_client = self._get_s3_client()
-                with open(temp_path, 'rb') as f:
-                    s3_client.upload_fileobj(
-                        f, 
-                        settings.AWS_STORAGE_BUCKET_NAME, 
-                        s3_path
-                    )
-                
-                LoggerService.objects.create(
-                    user=request.user,
-                    action='RESTORE',
-                    table_name='Database',
-                    description=f'Restored database from uploaded file and saved to S3: {s3_filename}'
-                )
-                
-                return Response({'detail': 'Database restored successfully'})
-                
-            finally:
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
-                
+            filename = database_backup_service.store_uploaded_backup(backup_file)
         except Exception as e:
-            try:
-                LoggerService.objects.create(
-                    user=request.user,
-                    action='ERROR',
-                    table_name='Database',
-                    description=f'Restore error: {str(e)}'
-                )
-            except Exception:
-                pass
-                
             return Response(
-                {'error': 'Failed to restore database', 'details': str(e)},
+                {'error': 'Failed to store uploaded backup file', 'details': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-    
+
+        job = database_job_service.enqueue_restore(request.user, filename, jobs=jobs)
+        return _job_accepted_response(job, 'Database restore job queued', filename=filename)
+
     @extend_schema(
         tags=['Database'],
         summary="Restore from existing backup file",
-        description="Restores database from an existing backup file in S3",
+        description=(
+            "Queues a restore from an existing backup file in the backup storage. The worker uses psql or "
+            "pg_restore --jobs depending on the format recorded in the backup metadata."
+        ),
         request={
             'application/json': {
                 'type': 'object',
@@ -620,15 +504,25 @@ class DatabaseRestoreView(APIView):
                     'filename': {
                         'type': 'string',
                         'description': 'Name of the backup file to restore from'
+                    },
+                    'jobs': {
+                        'type': 'integer',
+                        'description': 'Parallel pg_restore jobs for custom/directory backups, defaults to BACKUP_PARALLEL_JOBS'
                     }
                 },
                 'required': ['filename']
             }
         },
         responses={
-            200: OpenApiExample(
-                'Restore Success',
-                value={'detail': 'Database restored successfully from existing backup'},
+            202: OpenApiExample(
+                'Restore Queued',
+                value={
+                    'detail': 'Database restore job queued',
+                    'job_id': 44,
+                    'status': 'pending',
+                    'status_url': '/api/core/database/jobs/44/',
+                    'filename': 'backup_20250517_123045.sql.gz'
+                },
                 response_only=True,
             ),
             400: OpenApiExample(
@@ -649,101 +543,24 @@ class DatabaseRestoreView(APIView):
         }
     )
     def put(self, request):
-        try:
-            psql_path = self._find_pg_binary('psql')
-            if not psql_path:
-                return Response(
-                    {
-                        'error': 'PostgreSQL psql utility not found',
-                        'details': 'Asegúrate de que psql esté instalado y en el PATH del sistema en el servidor. Para Railway, revisa tu configuración de Nixpacks o Dockerfile para incluir las utilidades cliente de PostgreSQL.'
-                    },
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-            
-            data = request.data
-            
-            if 'filename' not in data:
-                return Response(
-                    {'error': 'No filename provided'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            filename = data['filename']
-            s3_path = f"{self.backup_prefix}{filename}"
-            
-            s3_client = self._get_s3_client()
-            try:
-                s3_client.head_object(
-                    Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-                    Key=s3_path
-                )
-            except Exception:
-                return Response(
-                    {'error': 'Backup file not found in S3'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.sql') as temp_file:
-                temp_path = temp_file.name
-                
-                s3_client.download_fileobj(
-                    settings.AWS_STORAGE_BUCKET_NAME,
-                    s3_path,
-                    temp_file
-                )
-            
-            try:
-                db_settings = self._get_db_settings()
-                
-                env = os.environ.copy()
-                if db_settings['password']:
-                    env['PGPASSWORD'] = db_settings['password']
-                
-                connection_string = f"postgresql://{db_settings['user']}:{db_settings['password']}@{db_settings['host']}:{db_settings['port']}/{db_settings['name']}?sslmode=require"
-                
-                cmd = [
-                    psql_path,
-                    '-d', connection_string,
-                    '-f', temp_path,
-                    '--single-transaction'
-                ]
-                
-                process = subprocess.run(
-                    cmd,
-                    env=env,
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                
-                if process.returncode != 0:
-                    raise Exception(f"psql restore failed: {process.stderr}")
-                
-                LoggerService.objects.create(
-                    user=request.user,
-                    action='RESTORE',
-                    table_name='Database',
-                    description=f'Restored database from S3 backup: {filename}'
-                )
-                
-                return Response({'detail': 'Database restored successfully from existing S3 backup'})
-                
-            finally:
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
-            
-        except Exception as e:
-            try:
-                LoggerService.objects.create(
-                    user=request.user,
-                    action='ERROR',
-                    table_name='Database',
-                    description=f'Restore error: {str(e)}'
-                )
-            except Exception:
-                pass
-                
+        data = request.data
+
+        if 'filename' not in data:
             return Response(
-                {'error': 'Failed to restore database', 'details': str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+                {'error': 'No filename provided'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        filename = data['filename']
+        if not database_backup_service.is_backup_filename(filename) or not database_backup_service.storage.exists(filename):
+            return Response(
+                {'error': 'Backup file not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        jobs, error_response = _get_jobs_param(request)
+        if error_response:
+            return error_response
+
+        job = database_job_service.enqueue_restore(request.user, filename, jobs=jobs)
+        return _job_accepted_response(job, 'Database restore job queued', filename=filename)
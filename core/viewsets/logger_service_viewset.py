@@ -1,23 +1,58 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from django.db import models
+from rest_framework.exceptions import NotFound
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time, timedelta
 from ..models import LoggerService
 from ..serializers import LoggerServiceSerializer
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample, OpenApiResponse
 from drf_spectacular.types import OpenApiTypes
-from core.pagination import CustomPagination
+from core.pagination import CustomPagination, KeysetPagination
+from core.services.log_rollup_service import log_rollup_service
+from core.services.log_archive_service import log_archive_service
+from core.services.log_search_service import log_search_service
+from core.utils import parse_range_header, range_not_satisfiable_response, ranged_file_response
 
 @extend_schema(
     tags=['Logger Service'],
     description='API endpoints for system activity logs. Only available to admin users.'
 )
 class LoggerServiceViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = LoggerService.objects.all()
+    queryset = LoggerService.objects.select_related('user')
     serializer_class = LoggerServiceSerializer
     permission_classes = [permissions.IsAdminUser]
     pagination_class = CustomPagination
 
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params if self.request else {}
+            if params.get('cursor') or params.get('pagination') == 'cursor':
+                self._paginator = KeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def _parse_bound(self, value, end=False):
+        """Turns a date or datetime query value into an aware datetime so the filter compares
+        created_at directly and can use the index. A plain end date covers that whole day."""
+        try:
+            day = parse_date(value)
+            parsed = None if day else parse_datetime(value)
+        except ValueError:
+            day = parsed = None
+        if day is None and parsed is None:
+            raise ValueError(f"Invalid date '{value}'. Use YYYY-MM-DD or an ISO 8601 datetime")
+        end_exclusive = False
+        if day is not None:
+            parsed = datetime.combine(day + timedelta(days=1) if end else day, time.min)
+            end_exclusive = end
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed, end_exclusive
+
     def get_client_ip(self, request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
@@ -28,7 +63,11 @@ class LoggerServiceViewSet(viewsets.ReadOnlyModelViewSet):
 
     @extend_schema(
         summary='List all logs',
-        description='Retrieves a paginated list of all system activity logs. Supports filtering by user, action, table, and level.',
+        description=(
+            'Retrieves a paginated list of all system activity logs. Supports filtering by user, action, table, level '
+            'and creation date range. Pass pagination=cursor (then the returned next_cursor as cursor) for keyset '
+            'pagination, which skips the total count and stays fast on deep pages.'
+        ),
         responses={
             200: LoggerServiceSerializer(many=True),
             403: OpenApiResponse(description='Permission denied'),
@@ -47,6 +86,18 @@ class LoggerServiceViewSet(viewsets.ReadOnlyModelViewSet):
                 required=False, 
                 type=int
             ),
+            OpenApiParameter(
+                name='pagination',
+                description='Set to "cursor" for keyset pagination on (created_at, id), newest first',
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(
+                name='cursor',
+                description='Opaque cursor from next_cursor of the previous page; implies cursor pagination',
+                required=False,
+                type=str
+            ),
             OpenApiParameter(
                 name='user', 
                 description='Filter logs by user ID',
@@ -71,17 +122,27 @@ class LoggerServiceViewSet(viewsets.ReadOnlyModelViewSet):
                 required=False, 
                 type=str
             ),
+            OpenApiParameter(
+                name='search',
+                description=(
+                    'Full-text search over description, action and table name. Words match as prefixes and results '
+                    'are ordered by relevance; falls back to trigram similarity on the description for fragments. '
+                    'With cursor pagination matches are returned newest first'
+                ),
+                required=False,
+                type=str
+            ),
             OpenApiParameter(
                 name='start_date', 
-                description='Filter logs created on or after this date (YYYY-MM-DD)',
+                description='Filter logs created on or after this date (YYYY-MM-DD) or datetime (ISO 8601)',
                 required=False, 
-                type=OpenApiTypes.DATE
+                type=OpenApiTypes.STR
             ),
             OpenApiParameter(
                 name='end_date', 
-                description='Filter logs created on or before this date (YYYY-MM-DD)',
+                description='Filter logs created on or before this date (YYYY-MM-DD) or datetime (ISO 8601)',
                 required=False, 
-                type=OpenApiTypes.DATE
+                type=OpenApiTypes.STR
             ),
         ]
     )
@@ -105,18 +166,29 @@ class LoggerServiceViewSet(viewsets.ReadOnlyModelViewSet):
             if level:
                 queryset = queryset.filter(level=level)
                 
-            start_date = request.query_params.get('start_date')
-            if start_date:
-                queryset = queryset.filter(created_at__date__gte=start_date)
-                
-            end_date = request.query_params.get('end_date')
-            if end_date:
-                queryset = queryset.filter(created_at__date__lte=end_date)
-            
+            try:
+                start_date = request.query_params.get('start_date')
+                if start_date:
+                    start, _ = self._parse_bound(start_date)
+                    queryset = queryset.filter(created_at__gte=start)
+
+                end_date = request.query_params.get('end_date')
+                if end_date:
+                    end, exclusive = self._parse_bound(end_date, end=True)
+                    queryset = queryset.filter(created_at__lt=end) if exclusive else queryset.filter(created_at__lte=end)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            search = request.query_params.get('search')
+            if search:
+                queryset = log_search_service.search(queryset, search)
+
             page = self.paginate_queryset(queryset)
             serializer = self.get_serializer(page, many=True)
 
             return self.get_paginated_response(serializer.data)
+        except NotFound as e:
+            return Response({"error": str(e.detail)}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             LoggerService.objects.create(
                 user=request.user if request.user.is_authenticated else None,
@@ -155,9 +227,23 @@ class LoggerServiceViewSet(viewsets.ReadOnlyModelViewSet):
             
     @extend_schema(
         summary='Get log statistics',
-        description='Retrieves statistics about system logs, including counts by action type, table, and level.',
+        description=(
+            'Retrieves statistics about system logs, including counts by action type, table, and level. '
+            'Counts come from hourly rollups, so start_date/end_date are applied at hour granularity. '
+            'Pass histogram=hour or histogram=day to also get counts per time bucket for the range '
+            '(default: the last 7 days), optionally narrowed by action, table_name and level.'
+        ),
+        parameters=[
+            OpenApiParameter(name='start_date', description='Count logs from this date (YYYY-MM-DD) or datetime (ISO 8601)', required=False, type=OpenApiTypes.STR),
+            OpenApiParameter(name='end_date', description='Count logs up to this date (YYYY-MM-DD) or datetime (ISO 8601)', required=False, type=OpenApiTypes.STR),
+            OpenApiParameter(name='histogram', description='Histogram bucket size: hour or day', required=False, type=str),
+            OpenApiParameter(name='action', description='Histogram only: filter by action', required=False, type=str),
+            OpenApiParameter(name='table_name', description='Histogram only: filter by table name', required=False, type=str),
+            OpenApiParameter(name='level', description='Histogram only: filter by level', required=False, type=str),
+        ],
         responses={
             200: OpenApiTypes.OBJECT,
+            400: OpenApiResponse(description='Invalid date or histogram interval'),
             403: OpenApiResponse(description='Permission denied'),
             500: OpenApiResponse(description='Server error'),
         }
@@ -165,26 +251,40 @@ class LoggerServiceViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         try:
-            total_count = LoggerService.objects.count()
-            
-            action_counts = LoggerService.objects.values('action').annotate(count=models.Count('id'))
-            
-            table_counts = LoggerService.objects.values('table_name').annotate(count=models.Count('id'))
-            
-            level_counts = LoggerService.objects.values('level').annotate(count=models.Count('id'))
-            
-            from django.utils import timezone
-            recent_count = LoggerService.objects.filter(
-                created_at__gte=timezone.now() - timezone.timedelta(hours=24)
-            ).count()
-            
-            return Response({
-                'total_logs': total_count,
-                'recent_logs': recent_count,
-                'by_action': action_counts,
-                'by_table': table_counts,
-                'by_level': level_counts,
-            })
+            try:
+                start = end = None
+                start_date = request.query_params.get('start_date')
+                if start_date:
+                    start, _ = self._parse_bound(start_date)
+                end_date = request.query_params.get('end_date')
+                if end_date:
+                    end, exclusive = self._parse_bound(end_date, end=True)
+                    if not exclusive:
+                        end += timedelta(microseconds=1)
+
+                data = log_rollup_service.get_statistics(start=start, end=end)
+
+                interval = request.query_params.get('histogram')
+                if interval:
+                    histogram_end = end or timezone.now()
+                    histogram_start = start or histogram_end - timedelta(days=7)
+                    data['histogram'] = {
+                        'interval': interval,
+                        'start': histogram_start,
+                        'end': histogram_end,
+                        'buckets': log_rollup_service.get_histogram(
+                            histogram_start,
+                            histogram_end,
+                            interval=interval,
+                            action=request.query_params.get('action'),
+                            table_name=request.query_params.get('table_name'),
+                            level=request.query_params.get('level'),
+                        ),
+                    }
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            return Response(data)
         except Exception as e:
             LoggerService.objects.create(
                 user=request.user if request.user.is_authenticated else None,
@@ -193,4 +293,73 @@ class LoggerServiceViewSet(viewsets.ReadOnlyModelViewSet):
                 description=f'Error on log statistics: {str(e)}',
                 ip_address=self.get_client_ip(request)
             )
-            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @extend_schema(
+        summary='List log archives',
+        description=(
+            'Lists the monthly archives of logs older than the retention period (LOG_RETENTION_DAYS). '
+            'Each archive is a gzip-compressed NDJSON file with one log row per line.'
+        ),
+        responses={
+            200: OpenApiExample(
+                'Archives',
+                value={'archives': [{
+                    'filename': 'logs_2025-01.ndjson.gz',
+                    'size_bytes': 48213,
+                    'created_at': '2025-07-01T03:00:12+00:00',
+                    'download_url': '/api/core/logs/archives/logs_2025-01.ndjson.gz/'
+                }]},
+                response_only=True,
+            ),
+            403: OpenApiResponse(description='Permission denied'),
+            500: OpenApiResponse(description='Server error'),
+        }
+    )
+    @action(detail=False, methods=['get'], url_path='archives')
+    def archives(self, request):
+        try:
+            archives = [
+                {
+                    'filename': archive['filename'],
+                    'size_bytes': archive['size'],
+                    'created_at': archive['last_modified'].isoformat(),
+                    'download_url': f"/api/core/logs/archives/{archive['filename']}/",
+                }
+                for archive in log_archive_service.list_archives()
+            ]
+            return Response({'archives': archives})
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @extend_schema(
+        summary='Download log archive',
+        description=(
+            'Streams a log archive (gzip-compressed NDJSON) in chunks. '
+            'Supports single HTTP Range requests (206 Partial Content) so interrupted downloads can resume.'
+        ),
+        responses={
+            200: OpenApiResponse(description='Archive file'),
+            206: OpenApiResponse(description='Requested byte range of the archive'),
+            403: OpenApiResponse(description='Permission denied'),
+            404: OpenApiResponse(description='Archive not found'),
+            416: OpenApiResponse(description='Range not satisfiable'),
+        }
+    )
+    @action(detail=False, methods=['get'], url_path=r'archives/(?P<filename>[^/]+)')
+    def download_archive(self, request, filename=None):
+        try:
+            storage = log_archive_service.storage
+            if not log_archive_service.is_archive_filename(filename):
+                return Response({"error": "Archive not found"}, status=status.HTTP_404_NOT_FOUND)
+            try:
+                size = storage.size(filename)
+            except Exception:
+                return Response({"error": "Archive not found"}, status=status.HTTP_404_NOT_FOUND)
+
+            byte_range = parse_range_header(request.META.get('HTTP_RANGE'), size)
+            if byte_range is False:
+                return range_not_satisfiable_response(size)
+            return ranged_file_response(storage, filename, size, byte_range, 'application/gzip')
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
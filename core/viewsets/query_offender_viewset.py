@@ -0,0 +1,89 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiParameter
+
+from core.models import QueryOffender
+
+
+class QueryOffenderView(APIView):
+    permission_classes = [IsAdminUser]
+    ORDERING_FIELDS = ('occurrences', 'total_queries', 'max_repeat', 'total_time_ms', 'max_time_ms', 'last_seen')
+
+    @extend_schema(
+        tags=['Performance'],
+        summary="Top query offenders",
+        description=(
+            "Lists the query shapes the query inspector flagged, per view: queries repeated at least "
+            "QUERY_INSPECTOR_REPEAT_THRESHOLD times in one request (N+1) and queries slower than "
+            "QUERY_INSPECTOR_SLOW_MS, with the code location and stack that issued them. "
+            "The inspector runs when QUERY_INSPECTOR_ENABLED is set, or per request with the "
+            "'X-Inspect-Queries: 1' header when QUERY_INSPECTOR_ALLOW_HEADER is set."
+        ),
+        parameters=[
+            OpenApiParameter(name='kind', description='n_plus_one or slow', required=False, type=str),
+            OpenApiParameter(name='view_name', description='Only this view name, e.g. course-list', required=False, type=str),
+            OpenApiParameter(
+                name='ordering',
+                description=f"Sort descending by one of: {', '.join(ORDERING_FIELDS)} (default total_time_ms)",
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(name='limit', description='Maximum number of offenders (default 50, max 500)', required=False, type=int),
+        ],
+        responses={
+            200: OpenApiExample(
+                'Offenders',
+                value={'offenders': [{
+                    'kind': 'n_plus_one',
+                    'view_name': 'course-list',
+                    'location': 'app/academic/serializers/course_serializer.py:21 in get_student_count',
+                    'stack': 'app/academic/serializers/course_serializer.py:21 in get_student_count',
+                    'sql': 'SELECT COUNT(*) AS "__count" FROM "academic_enrollment" WHERE ...',
+                    'occurrences': 37,
+                    'total_queries': 7400,
+                    'max_repeat': 200,
+                    'total_time_ms': 5120.4,
+                    'max_time_ms': 9.8,
+                    'first_seen': '2025-05-16T08:12:00Z',
+                    'last_seen': '2025-05-17T10:40:21Z'
+                }]},
+                response_only=True,
+            ),
+            400: OpenApiExample('Bad Request', value={'error': 'kind must be n_plus_one or slow'}, response_only=True),
+        }
+    )
+    def get(self, request):
+        queryset = QueryOffender.objects.all()
+
+        kind = request.query_params.get('kind')
+        if kind:
+            if kind not in QueryOffender.KindChoices.values:
+                return Response(
+                    {'error': f"kind must be one of: {', '.join(QueryOffender.KindChoices.values)}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            queryset = queryset.filter(kind=kind)
+
+        view_name = request.query_params.get('view_name')
+        if view_name:
+            queryset = queryset.filter(view_name=view_name)
+
+        ordering = request.query_params.get('ordering', 'total_time_ms')
+        if ordering not in self.ORDERING_FIELDS:
+            return Response(
+                {'error': f"ordering must be one of: {', '.join(self.ORDERING_FIELDS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', 50)), 1), 500)
+        except (TypeError, ValueError):
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        offenders = queryset.order_by(f'-{ordering}').values(
+            'kind', 'view_name', 'location', 'stack', 'sql', 'occurrences', 'total_queries', 'max_repeat',
+            'total_time_ms', 'max_time_ms', 'first_seen', 'last_seen'
+        )[:limit]
+        return Response({'offenders': list(offenders)})
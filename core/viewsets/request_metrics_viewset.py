@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiParameter
+
+from core.services.request_metrics_service import request_metrics_service
+
+
+class RequestMetricsView(APIView):
+    permission_classes = [IsAdminUser]
+    ORDERING_FIELDS = ('p50_ms', 'p95_ms', 'p99_ms', 'avg_ms', 'max_ms', 'requests', 'avg_db_queries', 'avg_db_time_ms')
+
+    @extend_schema(
+        tags=['Performance'],
+        summary="Request latency per endpoint",
+        description=(
+            "Returns request count, error rate, p50/p95/p99 and average latency, database queries, serializer time "
+            "and response size per endpoint (view name and method), recorded by RequestMetricsMiddleware. "
+            "Metrics are flushed from each process every REQUEST_METRICS_FLUSH_INTERVAL seconds, so the newest "
+            "requests may not be included yet."
+        ),
+        parameters=[
+            OpenApiParameter(name='hours', description='Look back this many hours (default 24)', required=False, type=int),
+            OpenApiParameter(name='view_name', description='Only this view name, e.g. log-list', required=False, type=str),
+            OpenApiParameter(name='method', description='Only this HTTP method', required=False, type=str),
+            OpenApiParameter(
+                name='ordering',
+                description=f"Sort descending by one of: {', '.join(ORDERING_FIELDS)} (default p95_ms)",
+                required=False,
+                type=str
+            ),
+        ],
+        responses={
+            200: OpenApiExample(
+                'Endpoint Latency',
+                value={
+                    'since': '2025-05-16T12:00:00Z',
+                    'endpoints': [{
+                        'view_name': 'grade-list',
+                        'method': 'GET',
+                        'requests': 1520,
+                        'error_rate': 0.0007,
+                        'avg_ms': 84.2,
+                        'max_ms': 2210.5,
+                        'p50_ms': 61.3,
+                        'p95_ms': 240.8,
+                        'p99_ms': 712.0,
+                        'avg_db_queries': 6.1,
+                        'avg_db_time_ms': 31.7,
+                        'avg_serializer_time_ms': 18.4,
+                        'avg_response_bytes': 48211
+                    }]
+                },
+                response_only=True,
+            ),
+            400: OpenApiExample('Bad Request', value={'error': 'hours must be a positive integer'}, response_only=True),
+        }
+    )
+    def get(self, request):
+        try:
+            hours = int(request.query_params.get('hours', 24))
+        except (TypeError, ValueError):
+            hours = 0
+        if hours < 1:
+            return Response({'error': 'hours must be a positive integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        ordering = request.query_params.get('ordering', 'p95_ms')
+        if ordering not in self.ORDERING_FIELDS:
+            return Response(
+                {'error': f"ordering must be one of: {', '.join(self.ORDERING_FIELDS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            since = timezone.now() - timedelta(hours=hours)
+            endpoints = request_metrics_service.get_report(
+                since,
+                view_name=request.query_params.get('view_name'),
+                method=request.query_params.get('method'),
+            )
+            endpoints.sort(key=lambda entry: entry[ordering] or 0, reverse=True)
+            return Response({'since': since, 'endpoints': endpoints})
+        except Exception as e:
+            return Response(
+                {'error': 'Failed to build request metrics report', 'details': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )